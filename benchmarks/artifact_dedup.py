@@ -0,0 +1,92 @@
+"""
+Copyright 2022-2025 Ilia Moiseev
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Compares saving models with and without deduplication of artifacts.
+Every model has the same file added with ``add_file`` and the same
+artifact like a frozen backbone. The time of saves and the space that
+the line takes on disk are measured.
+
+Usage:
+    python benchmarks/artifact_dedup.py --models 100 --size-mb 10
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cascade.lines import ModelLine
+from cascade.models import BasicModel
+
+
+class FrozenModel(BasicModel):
+    backbone = b""
+
+    def save_artifact(self, path: str) -> None:
+        with open(os.path.join(path, "backbone.bin"), "wb") as f:
+            f.write(self.backbone)
+
+
+def disk_usage(path: str) -> int:
+    # Hardlinks are counted once
+    seen = set()
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            st = os.stat(os.path.join(root, name))
+            if st.st_ino not in seen:
+                seen.add(st.st_ino)
+                total += st.st_blocks * 512
+    return total
+
+
+def run(dedup: bool, n: int, size: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        config = os.path.join(tmp, "config.bin")
+        with open(config, "wb") as f:
+            f.write(os.urandom(size))
+        FrozenModel.backbone = os.urandom(size)
+
+        line = ModelLine(os.path.join(tmp, "line"), model_cls=FrozenModel, dedup=dedup)
+        start = time.perf_counter()
+        for _ in range(n):
+            model = FrozenModel()
+            model.add_file(config)
+            line.save(model)
+        elapsed = time.perf_counter() - start
+        return {"save": elapsed / n, "disk": disk_usage(line.get_root())}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--models", type=int, default=100)
+    parser.add_argument("--size-mb", type=float, default=10, help="Size of each shared file")
+    args = parser.parse_args()
+
+    size = int(args.size_mb * 2**20)
+    print(f"{'dedup':>6} {'models':>7} {'save, ms':>9} {'disk, MB':>9}")
+    for dedup in (False, True):
+        r = run(dedup, args.models, size)
+        print(
+            f"{str(dedup):>6} {args.models:>7} {r['save'] * 1000:>9.1f}"
+            f" {r['disk'] / 2**20:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Copyright 2022-2025 Ilia Moiseev
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Stress benchmark of concurrent saves into one ModelLine.
+N processes save M models each into the same line, then the line
+is checked for lost or duplicated models.
+
+Usage:
+    python benchmarks/concurrent_saves.py --procs 1 2 4 8 --models 100
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cascade.lines import ModelLine
+from cascade.models import BasicModel
+
+
+def save_models(root: str, n: int) -> None:
+    line = ModelLine(root)
+    for _ in range(n):
+        line.save(BasicModel(), only_meta=True)
+
+
+def run(n_procs: int, n_models: int) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, "line")
+        ModelLine(root)
+
+        procs = [
+            multiprocessing.Process(target=save_models, args=(root, n_models))
+            for _ in range(n_procs)
+        ]
+        start = time.perf_counter()
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+        elapsed = time.perf_counter() - start
+
+        total = n_procs * n_models
+        line = ModelLine(root)
+        line.reload()
+        slugs = {line.load_model_meta(i)[0]["slug"] for i in range(len(line))}
+
+        failed = sum(p.exitcode != 0 for p in procs)
+        if failed or len(line) != total or len(slugs) != total:
+            raise RuntimeError(
+                f"Expected {total} models, got {len(line)} folders and {len(slugs)} slugs,"
+                f" {failed} processes failed"
+            )
+        if line.load_meta()[0]["len"] != total:
+            raise RuntimeError("Length of the line in meta is not up to date")
+        return total / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--procs", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--models", type=int, default=100, help="Models per process")
+    args = parser.parse_args()
+
+    print(f"{'procs':>6} {'models':>8} {'saves/s':>10}")
+    for n_procs in args.procs:
+        throughput = run(n_procs, args.models)
+        print(f"{n_procs:>6} {n_procs * args.models:>8} {throughput:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Copyright 2022-2025 Ilia Moiseev
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Counts file system calls made to read meta of items in a directory.
+Compares searching the directory with glob on every read, which is how
+meta was read before, with the cached search and with opening the
+file directly when the format is known.
+
+Calls are counted by wrapping functions of the os module, so only
+the calls made from Python are counted. For the full picture
+run the script under ``strace -c -f``.
+
+Usage:
+    python benchmarks/meta_read_syscalls.py --items 1000
+"""
+
+import argparse
+import builtins
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cascade.base import MetaHandler
+
+COUNTED = ("stat", "lstat", "scandir", "listdir")
+
+
+@contextmanager
+def count_calls() -> Iterator[Counter]:
+    counter = Counter()
+    originals = {name: getattr(os, name) for name in COUNTED}
+    originals["open"] = builtins.open
+
+    def wrap(name: str, func: Callable) -> Callable:
+        def wrapper(*args, **kwargs):
+            counter[name] += 1
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    for name in COUNTED:
+        setattr(os, name, wrap(name, originals[name]))
+    builtins.open = wrap("open", originals["open"])
+    try:
+        yield counter
+    finally:
+        for name in COUNTED:
+            setattr(os, name, originals[name])
+        builtins.open = originals["open"]
+
+
+def read_glob(path: str) -> None:
+    MetaHandler.read(MetaHandler._glob_meta_path(path, "meta.*"))
+
+
+def read_cached(path: str) -> None:
+    MetaHandler.read_dir(path)
+
+
+def read_known_fmt(path: str) -> None:
+    MetaHandler.read_dir(path, meta_fmt=".json")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--files", type=int, default=5, help="Other files in each item folder")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(args.items):
+            path = os.path.join(tmp, f"{i:0>8d}")
+            os.mkdir(path)
+            MetaHandler.write(os.path.join(path, "meta.json"), [{"type": "model", "num": i}])
+            for j in range(args.files):
+                with open(os.path.join(path, f"file_{j}"), "w") as f:
+                    f.write("")
+            paths.append(path)
+
+        # The first pass fills the cache of meta paths
+        for path in paths:
+            read_cached(path)
+
+        print(f"{'method':>12} {'calls/read':>11} {'us/read':>9}  calls")
+        for name, read in (
+            ("glob", read_glob),
+            ("cached", read_cached),
+            ("known fmt", read_known_fmt),
+        ):
+            with count_calls() as counter:
+                start = time.perf_counter()
+                for path in paths:
+                    read(path)
+                elapsed = time.perf_counter() - start
+
+            calls = sum(counter.values()) / args.items
+            detail = ", ".join(f"{k}={v / args.items:.1f}" for k, v in sorted(counter.items()))
+            print(f"{name:>12} {calls:>11.1f} {elapsed / args.items * 1e6:>9.1f}  {detail}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Copyright 2022-2025 Ilia Moiseev
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Compares flat and sharded layouts of ModelLine.
+For each size a line is filled with empty model folders and then
+the time of full listing (reload), of opening the line and of
+saving new models is measured.
+
+Usage:
+    python benchmarks/sharded_layout.py --sizes 10000 100000 1000000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cascade.lines import ModelLine
+from cascade.models import BasicModel
+
+
+def fill(line: ModelLine, n: int) -> None:
+    # Creating folders directly is much faster than saving models
+    for num in range(n):
+        path = os.path.join(line.get_root(), line._item_name_by_num(num))
+        os.makedirs(path)
+        with open(os.path.join(path, "SLUG"), "w") as f:
+            f.write(f"model_{num}")
+
+
+def run(layout: str, n: int, n_saves: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, "line")
+        line = ModelLine(root, layout=layout)
+        fill(line, n)
+
+        start = time.perf_counter()
+        line.reload()
+        scan = time.perf_counter() - start
+
+        # The first save creates the manifest, which is not measured
+        line.save(BasicModel(), only_meta=True)
+
+        start = time.perf_counter()
+        line = ModelLine(root)
+        opening = time.perf_counter() - start
+        assert len(line) == n + 1
+
+        start = time.perf_counter()
+        for _ in range(n_saves):
+            line.save(BasicModel(), only_meta=True)
+        save = (time.perf_counter() - start) / n_saves
+
+        return {"scan": scan, "open": opening, "save": save}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--saves", type=int, default=20, help="Saves to measure per size")
+    args = parser.parse_args()
+
+    print(f"{'layout':>8} {'models':>9} {'reload, s':>10} {'open, s':>10} {'save, ms':>10}")
+    for n in args.sizes:
+        for layout in ("flat", "sharded"):
+            r = run(layout, n, args.saves)
+            print(
+                f"{layout:>8} {n:>9} {r['scan']:>10.3f} {r['open']:>10.3f}"
+                f" {r['save'] * 1000:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
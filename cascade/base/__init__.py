@@ -45,6 +45,10 @@ class MultipleMetaError(MetaIOError):
     pass
 
 
+class ReadOnlyError(RuntimeError):
+    pass
+
+
 def raise_not_implemented(class_name: str, name: str) -> NoReturn:
     raise NotImplementedError(
         f"Default {class_name} class '{name}()' "
@@ -53,10 +57,14 @@ def raise_not_implemented(class_name: str, name: str) -> NoReturn:
     )
 
 
+from .blob_store import BlobStore
 from .cache import Cache
 from .config import Config
 from .meta_handler import CustomEncoder as JSONEncoder
 from .meta_handler import (MetaHandler, default_meta_format,
+                           get_json_backend, set_json_backend,
                            supported_meta_formats)
+from .meta_index import MetaIndex
 from .serialization import ObjectHandler
+from .slug_index import SlugIndex
 from .traceable import Traceable, TraceableOnDisk
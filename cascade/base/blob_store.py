@@ -0,0 +1,372 @@
+"""
+Copyright 2022-2025 Ilia Moiseev
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import hashlib
+import os
+import shutil
+import stat
+import sys
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional, Tuple
+
+BLOB_STORE_FOLDER = ".blobs"
+# Folder of the store with hardlinks to the files that are clones of blobs
+_REFS_FOLDER = ".refs"
+
+_HASH_CHUNK_SIZE = 1 << 20
+
+# ioctl that makes a copy-on-write clone of a file on Linux
+_FICLONE = 0x40049409 if sys.platform.startswith("linux") else None
+
+# The store that Model.save uses to copy files into the model folder
+_current_store: ContextVar = ContextVar("blob_store", default=None)
+
+
+def _tmp_path(path: str) -> str:
+    folder, name = os.path.split(path)
+    return os.path.join(folder, f".{name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+
+
+def _file_digest(path: str) -> Tuple[str, int]:
+    h = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(_HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            h.update(chunk)
+            size += len(chunk)
+    return h.hexdigest(), size
+
+
+def _clone(src: str, dst: str) -> bool:
+    # Copy-on-write copy that shares the data on disk with the source
+    # until one of them is changed, supported by btrfs, xfs and others
+    if _FICLONE is None:
+        return False
+    import fcntl
+
+    try:
+        with open(src, "rb") as s, open(dst, "wb") as d:
+            fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+    except OSError:
+        try:
+            os.remove(dst)
+        except OSError:
+            pass
+        return False
+    return True
+
+
+class BlobStore:
+    """
+    Content-addressed storage of files. Every unique content is stored
+    once as a blob named by its sha256 and files in model folders
+    share its data, so the same config, log or frozen backbone
+    saved with thousands of models takes space only once.
+
+    Where the file system supports copy-on-write clones (reflinks), files
+    are clones of blobs. They are independent files with their own permissions
+    that only share the data on disk, so they can be changed in place.
+
+    Otherwise files are hardlinks to blobs. Blobs are read-only then, since
+    changing a linked file in place would change it in every model that shares
+    it. To change such a file, write a new one and replace the old one with
+    ``os.replace`` or make it independent with ``detach``. The files that are
+    put into the store are replaced by links, the store never changes the
+    files themselves.
+
+    The reference count of a blob is the number of its hardlinks and clones.
+    Clones are counted by hardlinks to them in the ``.refs`` folder of the store,
+    which are made when a clone is created. Blobs that are not used by any
+    file are removed by ``gc``.
+
+    If neither is possible, for example the store and the model
+    are on different file systems, files are copied as usual.
+
+    Examples
+    --------
+    >>> from cascade.base import BlobStore
+    >>> store = BlobStore("repo/.blobs")
+    >>> store.copy("config.yml", "repo/line/00000/files/config.yml")
+    >>> store.put_tree("repo/line/00000/artifacts")
+    >>> store.gc()
+    """
+
+    def __init__(self, root: str) -> None:
+        """
+        Parameters
+        ----------
+        root : str
+            Path to the folder of the store, created on the first write
+        """
+        self._root = os.path.abspath(root)
+
+    def get_root(self) -> str:
+        return self._root
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self._root, digest[:2], digest)
+
+    def _add_blob(self, src: str, blob: str) -> None:
+        os.makedirs(os.path.dirname(blob), exist_ok=True)
+        tmp = _tmp_path(blob)
+        # Blob is always a new file, so the permissions
+        # of the source are not changed
+        if not _clone(src, tmp):
+            shutil.copyfile(src, tmp)
+        try:
+            mode = os.stat(tmp).st_mode
+            os.chmod(tmp, mode & ~(stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH))
+            # Does not replace the blob written by someone else in the meantime
+            os.link(tmp, blob)
+        except FileExistsError:
+            pass
+        finally:
+            os.remove(tmp)
+
+    def _refs_path(self, digest: str) -> str:
+        return os.path.join(self._root, _REFS_FOLDER, digest)
+
+    def _link(self, blob: str, path: str, mode_src: str) -> bool:
+        tmp = _tmp_path(path)
+        if _clone(blob, tmp):
+            shutil.copymode(mode_src, tmp)
+            # Clone does not change the number of links of the blob,
+            # so it is referenced by its own link in the store
+            refs = self._refs_path(os.path.basename(blob))
+            try:
+                os.makedirs(refs, exist_ok=True)
+                os.link(tmp, os.path.join(refs, uuid.uuid4().hex))
+            except OSError:
+                os.remove(tmp)
+                return False
+        else:
+            try:
+                os.link(blob, tmp)
+            except OSError:
+                # Different file system, no hardlinks support
+                # or too many links to one file
+                return False
+        os.replace(tmp, path)
+        return True
+
+    def _count_refs(self, digest: str, remove_unused: bool = False) -> int:
+        # The number of clones of the blob that still exist
+        # outside of the store, optionally removes the rest
+        refs = self._refs_path(digest)
+        try:
+            entries = list(os.scandir(refs))
+        except OSError:
+            return 0
+
+        count = 0
+        for entry in entries:
+            if entry.stat().st_nlink > 1:
+                count += 1
+            elif remove_unused:
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+        if remove_unused and count == 0:
+            try:
+                os.rmdir(refs)
+            except OSError:
+                pass
+        return count
+
+    def put(self, path: str) -> int:
+        """
+        Puts the contents of the file into the store and replaces
+        the file with a clone of or a link to the blob
+
+        Parameters
+        ----------
+        path : str
+            Path to the file
+
+        Returns
+        -------
+        int
+            The number of bytes saved, that is the size of the
+            file if the same content was already in the store
+        """
+        digest, size = _file_digest(path)
+        blob = self._blob_path(digest)
+        existed = os.path.exists(blob)
+        if not existed:
+            try:
+                self._add_blob(path, blob)
+            except OSError:
+                return 0
+
+        if os.path.samefile(path, blob):
+            return 0
+        if self._link(blob, path, path):
+            return size if existed else 0
+        return 0
+
+    def detach(self, path: str) -> None:
+        """
+        Replaces the file linked to a blob with its own writable copy,
+        so that it can be changed without changing other files.
+        Does nothing if the file is not linked
+
+        Parameters
+        ----------
+        path : str
+            Path to the file
+        """
+        st = os.stat(path)
+        if st.st_nlink < 2:
+            return
+        tmp = _tmp_path(path)
+        shutil.copyfile(path, tmp)
+        os.chmod(tmp, stat.S_IMODE(st.st_mode) | stat.S_IWUSR)
+        os.replace(tmp, path)
+
+    def put_tree(self, path: str) -> int:
+        """
+        Puts every file in the folder and its subfolders into the store
+
+        Returns
+        -------
+        int
+            The number of bytes saved
+        """
+        saved = 0
+        for root, _, files in os.walk(path):
+            for name in files:
+                file_path = os.path.join(root, name)
+                if os.path.isfile(file_path) and not os.path.islink(file_path):
+                    saved += self.put(file_path)
+        return saved
+
+    def copy(self, src: str, dst: str) -> int:
+        """
+        Copies the file through the store. If the store already has
+        the content, the destination is linked to it without writing
+        anything. The source file stays independent from the store.
+
+        Parameters
+        ----------
+        src : str
+            Path to the file to copy
+        dst : str
+            Path to the copy
+
+        Returns
+        -------
+        int
+            The number of bytes saved
+        """
+        digest, size = _file_digest(src)
+        blob = self._blob_path(digest)
+        existed = os.path.exists(blob)
+        if not existed:
+            try:
+                self._add_blob(src, blob)
+            except OSError:
+                shutil.copyfile(src, dst)
+                return 0
+
+        if self._link(blob, dst, src):
+            return size if existed else 0
+        shutil.copyfile(src, dst)
+        return 0
+
+    def _iter_blobs(self) -> Iterator[Tuple[str, os.stat_result]]:
+        try:
+            folders = list(os.scandir(self._root))
+        except OSError:
+            return
+        for folder in folders:
+            if not folder.is_dir() or folder.name.startswith("."):
+                continue
+            for entry in os.scandir(folder.path):
+                if entry.name.startswith("."):
+                    continue
+                yield entry.path, entry.stat()
+
+    def gc(self) -> Tuple[int, int]:
+        """
+        Removes blobs that are not linked from or cloned to any file
+
+        Returns
+        -------
+        Tuple[int, int]
+            The number of removed blobs and bytes freed
+        """
+        removed = 0
+        freed = 0
+        for path, st in self._iter_blobs():
+            refs = self._count_refs(os.path.basename(path), remove_unused=True)
+            if st.st_nlink > 1 or refs > 0:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            removed += 1
+            freed += st.st_size
+        return removed, freed
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns
+        -------
+        Dict[str, int]
+            ``blobs`` - the number of blobs,
+            ``size`` - bytes taken by blobs,
+            ``links`` - the number of files linked to or cloned from blobs,
+            ``saved`` - bytes that the files would take additionally without the store,
+            ``garbage`` - bytes of blobs that are not used and can be removed by ``gc``
+        """
+        result = {"blobs": 0, "size": 0, "links": 0, "saved": 0, "garbage": 0}
+        for path, st in self._iter_blobs():
+            links = st.st_nlink - 1 + self._count_refs(os.path.basename(path))
+            result["blobs"] += 1
+            result["size"] += st.st_size
+            result["links"] += links
+            if links == 0:
+                result["garbage"] += st.st_size
+            else:
+                result["saved"] += (links - 1) * st.st_size
+        return result
+
+
+def current_blob_store() -> Optional[BlobStore]:
+    """
+    Returns the store set by ``use_blob_store`` or None
+    """
+    return _current_store.get()
+
+
+@contextmanager
+def use_blob_store(store: Optional[BlobStore]) -> Iterator[None]:
+    """
+    Makes ``Model.save`` copy the files added by ``add_file``
+    through the store inside the block
+    """
+    token = _current_store.set(store)
+    try:
+        yield
+    finally:
+        _current_store.reset(token)
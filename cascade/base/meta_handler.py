@@ -18,19 +18,38 @@ import datetime
 import glob
 import json
 import os
+import uuid
+from contextlib import contextmanager
 from dataclasses import asdict, is_dataclass
 from json import JSONEncoder
-from typing import Any, Dict, NoReturn, Optional
+from typing import Any, Callable, Dict, Iterator, NoReturn, Optional, Tuple, Union
 
 import deepdiff
 import numpy as np
 import yaml
 
 from . import Meta, MetaIOError, MultipleMetaError, ZeroMetaError
-from .utils import Version
+from .utils import Version, dir_state
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
 
 default_meta_format = ".json"
-supported_meta_formats = (".json", ".yml", ".yaml")
+supported_meta_formats = (".json", ".yml", ".yaml", ".msgpack")
+supported_json_backends = ("orjson", "ujson", "json")
+
+# Meta file found in each directory with the state of the directory
+# at the moment of search. While the state is the same, the set of files
+# is the same, so the directory is not listed again
+_meta_path_cache: Dict[str, Tuple[Tuple[int, int, int], str]] = {}
+_META_PATH_CACHE_SIZE = 65536
+
+# C implementations produce the same output, but much faster
+_YAMLLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YAMLDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
 
 # This is for python 3.7
 # where latest deepdiff is 6.7.1
@@ -40,8 +59,34 @@ else:
     diff_set = deepdiff.diff.SetOrdered
 
 
+_scalar_types = frozenset((str, int, float, bool, type(None)))
+
+
+def _isoformat(obj: Any) -> str:
+    return obj.isoformat()
+
+
+# Exact types that are met most often in meta
+# to skip the chain of isinstance checks below
+_converters: Dict[type, Callable[[Any], Any]] = {
+    datetime.datetime: _isoformat,
+    datetime.date: _isoformat,
+    datetime.time: _isoformat,
+    np.ndarray: np.ndarray.tolist,
+    np.bool_: bool,
+    set: list,
+    **{t: int for t in (np.int8, np.int16, np.int32, np.int64, np.intc, np.intp)},
+    **{t: int for t in (np.uint8, np.uint16, np.uint32, np.uint64)},
+    **{t: float for t in (np.float16, np.float32, np.float64)},
+}
+
+
 class CustomEncoder(JSONEncoder):
     def default(self, obj: Any) -> Any:
+        converter = _converters.get(type(obj))
+        if converter is not None:
+            return converter(obj)
+
         if isinstance(obj, type):
             return str(obj)
 
@@ -104,6 +149,229 @@ class CustomEncoder(JSONEncoder):
     def obj_to_dict(self, obj: Any) -> Any:
         return json.loads(self.encode(obj))
 
+    def to_builtin(self, obj: Any) -> Any:
+        """
+        Converts object to the same builtin types as ``obj_to_dict``
+        in one pass without encoding it into string and decoding back
+        """
+        t = type(obj)
+        if t in _scalar_types:
+            return obj
+        if t is dict:
+            key = self._key
+            convert = self.to_builtin
+            return {
+                (k if type(k) is str else key(k)): (
+                    v if type(v) in _scalar_types else convert(v)
+                )
+                for k, v in obj.items()
+            }
+        if t is list or t is tuple:
+            convert = self.to_builtin
+            return [v if type(v) in _scalar_types else convert(v) for v in obj]
+        if isinstance(obj, dict):
+            return self.to_builtin(dict(obj))
+        if isinstance(obj, (list, tuple)):
+            return self.to_builtin(list(obj))
+        if isinstance(obj, str):
+            return str(obj)
+        if isinstance(obj, bool):
+            return bool(obj)
+        if isinstance(obj, int):
+            return int(obj)
+        if isinstance(obj, float):
+            return float(obj)
+        return self.to_builtin(self.default(obj))
+
+    @staticmethod
+    def _key(key: Any) -> str:
+        if isinstance(key, str):
+            return str(key)
+        # The same conversion of keys as json does
+        if key is True:
+            return "true"
+        if key is False:
+            return "false"
+        if key is None:
+            return "null"
+        if isinstance(key, (int, float)):
+            return json.dumps(key)
+        raise TypeError(f"keys must be str, int, float, bool or None, not {type(key).__name__}")
+
+
+_encoder = CustomEncoder()
+
+
+def _json_dumps(obj: Any) -> str:
+    return json.dumps(obj, cls=CustomEncoder, indent=4)
+
+
+def _json_loads(s: str) -> Any:
+    return json.loads(s)
+
+
+def _import_backend(name: str) -> Optional[Dict[str, Callable[..., Any]]]:
+    if name == "json":
+        return {"dumps": _json_dumps, "loads": _json_loads}
+
+    if name == "ujson":
+        try:
+            import ujson
+        except ModuleNotFoundError:
+            return None
+
+        def dumps(obj: Any) -> str:
+            return ujson.dumps(
+                obj, indent=4, default=_encoder.default, escape_forward_slashes=False
+            )
+
+        return {"dumps": dumps, "loads": ujson.loads}
+
+    if name == "orjson":
+        try:
+            import orjson
+        except ModuleNotFoundError:
+            return None
+
+        option = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+        def dumps(obj: Any) -> str:
+            return orjson.dumps(obj, default=_encoder.default, option=option).decode("utf-8")
+
+        return {"dumps": dumps, "loads": orjson.loads}
+
+    raise ValueError(f"Only {supported_json_backends} JSON backends are supported, got {name}")
+
+
+def set_json_backend(name: Optional[str] = None) -> str:
+    """
+    Sets the library used to read and write JSON meta.
+
+    The standard ``json`` is used by default. ``ujson`` is faster, but may
+    format floats differently, for example ``1e-7`` instead of ``1e-07``, so
+    the files it writes are not always the same as the ones of ``json``.
+    ``orjson`` is even faster, but writes NaN and infinite floats as ``null``
+    and indents with two spaces. Both are used only if chosen explicitly.
+    If the chosen library fails to process some object, the standard
+    ``json`` is used for it.
+
+    Parameters
+    ----------
+    name : Optional[str]
+        One of ``"orjson"``, ``"ujson"`` or ``"json"``. If None, uses ``json``
+
+    Returns
+    -------
+    str
+        The name of the backend that is used
+
+    Raises
+    ------
+    ModuleNotFoundError
+        If the library requested is not installed
+    """
+    global _json_backend, _json_backend_name
+
+    if name is None:
+        name = "json"
+
+    backend = _import_backend(name)
+    if backend is None:
+        raise ModuleNotFoundError(
+            f"""
+            Cannot import {name}. It is conditional
+            dependency you can install it
+            using the instructions from https://pypi.org/project/{name}/"""
+        )
+    _json_backend = backend
+    _json_backend_name = name
+    return name
+
+
+def get_json_backend() -> str:
+    """
+    Returns the name of the library used to read and write JSON meta
+    """
+    return _json_backend_name
+
+
+_json_backend: Dict[str, Callable[..., Any]] = {}
+_json_backend_name = "json"
+set_json_backend()
+
+
+def write_file_atomic(path: str, data: Union[str, bytes]) -> None:
+    """
+    Writes data into a temporary file in the same folder,
+    flushes it to disk and then renames into the target path.
+    Since rename is atomic, readers see either the old version of the file
+    or the new one and never partially written file even if
+    the process is killed in the middle of writing.
+
+    Parameters
+    ----------
+    path : str
+        Path to the file
+    data : Union[str, bytes]
+        Contents of the file
+    """
+    folder, name = os.path.split(path)
+    # Temporary file starts with a dot to be
+    # invisible to the search of meta.* files
+    tmp_path = os.path.join(folder, f".{name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+    mode = "xb" if isinstance(data, bytes) else "x"
+    try:
+        with open(tmp_path, mode) as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+@contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """
+    Exclusive lock held on the file between processes. Blocks until
+    the lock is acquired. The file is created if it does not exist and
+    is never removed, because removing it would allow two processes
+    to lock different files with the same path.
+
+    The lock is not reentrant - opening it again in the same process
+    while holding it will block.
+
+    Parameters
+    ----------
+    path : str
+        Path to the lock file
+    """
+    with open(path, "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        else:
+            # Locking the first byte of the file, since locking
+            # past the end is allowed this works for the empty file too
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gives up after 10 seconds
+                    continue
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
 
 class BaseHandler:
     def read(self, path: str) -> Meta:
@@ -112,6 +380,9 @@ class BaseHandler:
     def write(self, path: str, obj: Any, overwrite: bool = True) -> None:
         raise NotImplementedError()
 
+    def _write_file(self, path: str, data: Union[str, bytes]) -> None:
+        write_file_atomic(path, data)
+
     def _raise_io_error(self, path: str, exc: Optional[Exception] = None) -> NoReturn:
         # Any file decoding errors will be
         # prepended with filepath for user
@@ -129,20 +400,44 @@ class JSONHandler(BaseHandler):
             path += ".json"
 
         with open(path, "r") as meta_file:
+            text = meta_file.read()
+
+        try:
+            meta = self._loads(text)
+            if isinstance(meta, str):
+                meta = self._loads(meta)
+        except json.JSONDecodeError as e:
+            self._raise_io_error(path, e)
+        return meta
+
+    @staticmethod
+    def _loads(s: str) -> Any:
+        if _json_backend_name != "json":
             try:
-                meta = json.load(meta_file)
-                if isinstance(meta, str):
-                    meta = json.loads(meta)
-            except json.JSONDecodeError as e:
-                self._raise_io_error(path, e)
-            return meta
+                return _json_backend["loads"](s)
+            except ValueError:
+                # The backend may not support something like NaN,
+                # the standard json decides if the file is broken
+                pass
+        return json.loads(s)
+
+    @staticmethod
+    def _dumps(obj: Any) -> str:
+        if _json_backend_name != "json":
+            try:
+                return _json_backend["dumps"](obj)
+            except (OverflowError, TypeError, ValueError):
+                # Backends fail on some objects that json supports
+                # like integers above 64 bit or very deep nesting,
+                # if the object is not serializable json raises again
+                pass
+        return _json_dumps(obj)
 
     def write(self, path: str, obj: Any, overwrite: bool = True) -> None:
         if not overwrite and os.path.exists(path):
             return
 
-        with open(path, "w") as f:
-            json.dump(obj, f, cls=CustomEncoder, indent=4)
+        self._write_file(path, self._dumps(obj))
 
 
 class YAMLHandler(BaseHandler):
@@ -153,7 +448,7 @@ class YAMLHandler(BaseHandler):
 
         with open(path, "r") as meta_file:
             try:
-                meta = yaml.safe_load(meta_file)
+                meta = yaml.load(meta_file, Loader=_YAMLLoader)
 
                 # Safe load may return None if something wrong
                 if meta is None:
@@ -166,9 +461,65 @@ class YAMLHandler(BaseHandler):
         if not overwrite and os.path.exists(path):
             return
 
-        obj = CustomEncoder().obj_to_dict(obj)
-        with open(path, "w") as f:
-            yaml.safe_dump(obj, f)
+        obj = _encoder.to_builtin(obj)
+        self._write_file(path, yaml.dump(obj, Dumper=_YAMLDumper))
+
+
+class MsgPackHandler(BaseHandler):
+    """
+    Binary format which is smaller and faster to parse than text formats.
+    Meta is converted to the same types as when it is written in JSON.
+    Integers that do not fit into 64 bits are written as strings.
+    """
+
+    def _import(self) -> Any:
+        try:
+            import msgpack
+        except ModuleNotFoundError:
+            raise ModuleNotFoundError(
+                """
+                Cannot import msgpack. It is conditional
+                dependency you can install it
+                using the instructions from https://pypi.org/project/msgpack/"""
+            )
+        return msgpack
+
+    def read(self, path: str) -> Meta:
+        msgpack = self._import()
+
+        _, ext = os.path.splitext(path)
+        if ext == "":
+            path += ".msgpack"
+
+        with open(path, "rb") as meta_file:
+            data = meta_file.read()
+
+        try:
+            return msgpack.unpackb(data, raw=False, strict_map_key=False)
+        except (ValueError, msgpack.UnpackException) as e:
+            self._raise_io_error(path, e)
+
+    def write(self, path: str, obj: Any, overwrite: bool = True) -> None:
+        msgpack = self._import()
+
+        if not overwrite and os.path.exists(path):
+            return
+
+        obj = _encoder.to_builtin(obj)
+        try:
+            data = msgpack.packb(obj, use_bin_type=True)
+        except OverflowError:
+            data = msgpack.packb(self._big_ints_to_str(obj), use_bin_type=True)
+        self._write_file(path, data)
+
+    def _big_ints_to_str(self, obj: Any) -> Any:
+        if isinstance(obj, dict):
+            return {k: self._big_ints_to_str(v) for k, v in obj.items()}
+        if isinstance(obj, list):
+            return [self._big_ints_to_str(v) for v in obj]
+        if type(obj) is int and not -(2**63) <= obj < 2**64:
+            return str(obj)
+        return obj
 
 
 class TextHandler(BaseHandler):
@@ -195,7 +546,8 @@ class MetaHandler:
     """
     Encapsulates the logic of reading and writing metadata to disk.
 
-    Supported read-write formats are ``.json`` and ``.yml`` or ``.yaml``. Other formats
+    Supported read-write formats are ``.json``, ``.yml`` or ``.yaml`` and binary
+    ``.msgpack`` which needs ``msgpack`` to be installed. Other formats
     are supported as read-only. For example one can read meta from txt or md file.
 
     Examples
@@ -259,12 +611,16 @@ class MetaHandler:
             return JSONHandler()
         elif ext in (".yml", ".yaml"):
             return YAMLHandler()
+        elif ext == ".msgpack":
+            return MsgPackHandler()
         else:
             return TextHandler()
 
     # TODO: template should cover only supported fmts
     @classmethod
-    def read_dir(cls, path: str, meta_template: str = "meta.*") -> Meta:
+    def read_dir(
+        cls, path: str, meta_template: str = "meta.*", meta_fmt: Optional[str] = None
+    ) -> Meta:
         """
         Reads a single meta file from a given directory
 
@@ -274,6 +630,11 @@ class MetaHandler:
             Path to a directory
         meta_template : str, optional
             The template to identify meta file, by default "meta.*"
+        meta_fmt : str, optional
+            The expected format of meta like ".json". If given, ``meta<meta_fmt>``
+            is opened without listing the directory, so other meta files
+            in it are not detected. The directory is searched only if
+            there is no such file.
 
         Returns
         -------
@@ -287,20 +648,91 @@ class MetaHandler:
         MultipleMetaError
             If the number of files filtered by the template are more than 1
         """
+        if meta_fmt is not None and meta_template == "meta.*":
+            try:
+                return cls.read(os.path.join(path, "meta" + meta_fmt))
+            except FileNotFoundError:
+                pass
+
+        meta_path = cls.find_meta_path(path, meta_template)
+        try:
+            return cls.read(meta_path)
+        except FileNotFoundError:
+            # Removed after it was found, search again
+            # to raise the right error or find a new one
+            _meta_path_cache.pop(path, None)
+            return cls.read(cls.find_meta_path(path, meta_template))
+
+    @classmethod
+    def find_meta_path(
+        cls, path: str, meta_template: str = "meta.*", meta_fmt: Optional[str] = None
+    ) -> str:
+        """
+        Finds a single meta file in a given directory. The result is cached
+        and the directory is listed again only if anything was created or
+        removed in it since the last search.
+
+        Parameters
+        ----------
+        path : str
+            Path to a directory
+        meta_template : str, optional
+            The template to identify meta file, by default "meta.*"
+        meta_fmt : str, optional
+            The expected format of meta. If ``meta<meta_fmt>`` exists
+            it is returned without listing the directory
+
+        Returns
+        -------
+        str
+            Path to the meta file
+
+        Raises
+        ------
+        ZeroMetaError
+            If there is no files satisfying the template in the directory provided
+        MultipleMetaError
+            If the number of files filtered by the template are more than 1
+        """
+        if meta_template != "meta.*":
+            return cls._glob_meta_path(path, meta_template)
+
+        if meta_fmt is not None:
+            meta_path = os.path.join(path, "meta" + meta_fmt)
+            if os.path.isfile(meta_path):
+                return meta_path
+
+        state = dir_state(path)
+        if state is None:
+            raise ZeroMetaError(f"There is no {meta_template} file in {path}")
+
+        cached = _meta_path_cache.get(path)
+        if cached is not None and cached[0] == state:
+            return cached[1]
+
+        meta_path = cls._glob_meta_path(path, meta_template)
+        if len(_meta_path_cache) >= _META_PATH_CACHE_SIZE:
+            _meta_path_cache.clear()
+        _meta_path_cache[path] = (state, meta_path)
+        return meta_path
+
+    @staticmethod
+    def _glob_meta_path(path: str, meta_template: str) -> str:
         meta_paths = glob.glob(os.path.join(path, meta_template))
         if len(meta_paths) == 0:
             raise ZeroMetaError(f"There is no {meta_template} file in {path}")
         elif len(meta_paths) > 1:
             raise MultipleMetaError(f"There are {len(meta_paths)} in {path}")
-        else:
-            return cls.read(os.path.join(meta_paths[0]))
+        return meta_paths[0]
 
     @classmethod
     def determine_meta_fmt(cls, path: str, template: str) -> Optional[str]:
-        meta_paths = glob.glob(os.path.join(path, template))
-        if len(meta_paths) == 1:
-            _, ext = os.path.splitext(meta_paths[0])
-            return ext
+        try:
+            meta_path = cls.find_meta_path(path, template)
+        except MetaIOError:
+            return None
+        _, ext = os.path.splitext(meta_path)
+        return ext
 
     @classmethod
     def write_dir(
@@ -0,0 +1,389 @@
+"""
+Copyright 2022-2025 Ilia Moiseev
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import glob
+import json
+import os
+import sqlite3
+import threading
+from typing import Iterator, Optional, Tuple
+from urllib.parse import quote
+
+from . import Meta, MetaHandler, MetaIOError, MultipleMetaError, ZeroMetaError
+from .meta_handler import CustomEncoder, supported_meta_formats
+from .utils import is_shard_folder
+
+INDEX_FILENAME = ".cascade_index.sqlite"
+
+# How many levels above the written folder to look for indexes:
+# model -> (shard) -> line -> repo -> workspace
+_NOTIFY_DEPTH = 4
+
+
+def _loads(data: object) -> Optional[Meta]:
+    # Entries that are not JSON text are ignored and the
+    # file is parsed again, they are never unpickled
+    if not isinstance(data, str):
+        return None
+    try:
+        return json.loads(data)
+    except ValueError:
+        return None
+
+
+class MetaIndex:
+    """
+    On-disk index of all meta files under a container root.
+
+    Stores parsed meta of every ``meta.*`` file together with its
+    modification time and size in a SQLite database in the root of the container.
+    When meta is read through the index, the file is only stat-ed and parsed again
+    only if it changed since the last time.
+
+    Containers keep the existing indexes up to date when they write meta,
+    see ``MetaIndex.notify``. Code that only reads should not create indexes
+    and should use ``MetaIndex.open`` that opens an existing index read-only.
+
+    Meta is stored as JSON text, so the index file does not
+    need to be trusted more than meta files themselves.
+
+    Examples
+    --------
+    >>> from cascade.base import MetaIndex
+    >>> index = MetaIndex("repo")
+    >>> index.refresh()
+    >>> meta = index.read_dir("repo/00000/00000")
+    """
+
+    def __init__(self, root: str, readonly: bool = False) -> None:
+        """
+        Parameters
+        ----------
+        root : str
+            Path to the container. The index file is created
+            there if it does not exist
+        readonly : bool, optional
+            Opens the existing index without writing anything to it.
+            Files changed since they were indexed are parsed every time.
+            Raises ``sqlite3.Error`` if there is no index
+        """
+        self._root = os.path.abspath(root)
+        self._readonly = readonly
+        # The index can be shared between reading threads
+        # all access to the connection is guarded by the lock
+        self._lock = threading.Lock()
+        path = os.path.join(self._root, INDEX_FILENAME)
+        if readonly:
+            self._conn = sqlite3.connect(
+                f"file:{quote(path)}?mode=ro", uri=True, timeout=30, check_same_thread=False
+            )
+            return
+
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta ("
+            "path TEXT PRIMARY KEY, dir TEXT, mtime_ns INTEGER, size INTEGER, meta TEXT)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS meta_dir ON meta (dir)")
+        self._conn.commit()
+
+    @classmethod
+    def open(cls, root: str) -> Optional["MetaIndex"]:
+        """
+        Opens the index in ``root`` read-only if it exists
+
+        Returns
+        -------
+        Optional[MetaIndex]
+            The index or None if there is no index or it cannot be opened
+        """
+        if cls.find(root) is None:
+            return None
+        try:
+            index = cls(root, readonly=True)
+            # Checks that the file is a valid index
+            len(index)
+        except sqlite3.Error:
+            return None
+        return index
+
+    def get_root(self) -> str:
+        return self._root
+
+    def is_readonly(self) -> bool:
+        return self._readonly
+
+    def _rel(self, path: str) -> str:
+        return os.path.relpath(os.path.abspath(path), self._root)
+
+    def _read_file(self, path: str, stat: os.stat_result, commit: bool = True) -> Meta:
+        meta = MetaHandler.read(path)
+        if self._readonly:
+            return meta
+
+        rel_path = self._rel(path)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta VALUES (?, ?, ?, ?, ?)",
+                (
+                    rel_path,
+                    os.path.dirname(rel_path),
+                    stat.st_mtime_ns,
+                    stat.st_size,
+                    json.dumps(meta, cls=CustomEncoder),
+                ),
+            )
+            if commit:
+                self._conn.commit()
+        return meta
+
+    def read(self, path: str) -> Meta:
+        """
+        Reads meta file using the index. The file is parsed
+        only if it was changed since it was indexed.
+
+        Parameters
+        ----------
+        path : str
+            Path to the meta file
+
+        Returns
+        -------
+        Meta
+            Meta from file
+
+        Raises
+        ------
+        MetaIOError
+            when decoding errors occur
+        """
+        stat = os.stat(path)
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT mtime_ns, size, meta FROM meta WHERE path = ?", (self._rel(path),)
+                ).fetchone()
+
+            if row is not None and row[0] == stat.st_mtime_ns and row[1] == stat.st_size:
+                meta = _loads(row[2])
+                if meta is not None:
+                    return meta
+            return self._read_file(path, stat)
+        except sqlite3.Error:
+            # Index is just a cache, the file can always be read directly
+            return MetaHandler.read(path)
+
+    def read_dir(self, path: str, meta_template: str = "meta.*") -> Meta:
+        """
+        Reads a single meta file from a given directory using the index.
+        Behaves the same way as ``MetaHandler.read_dir``, but does not
+        search the directory if the name of meta file is already known.
+
+        Parameters
+        ----------
+        path : str
+            Path to a directory
+        meta_template : str, optional
+            The template to identify meta file, by default "meta.*"
+
+        Returns
+        -------
+        Meta
+            Meta
+
+        Raises
+        ------
+        ZeroMetaError
+            If there is no files satisfying the template in the directory provided
+        MultipleMetaError
+            If the number of files filtered by the template are more than 1
+        """
+        try:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT path FROM meta WHERE dir = ?", (self._rel(path),)
+                ).fetchall()
+        except sqlite3.Error:
+            rows = []
+        if len(rows) == 1:
+            try:
+                return self.read(os.path.join(self._root, rows[0][0]))
+            except FileNotFoundError:
+                if not self._readonly:
+                    with self._lock:
+                        self._conn.execute("DELETE FROM meta WHERE path = ?", (rows[0][0],))
+                        self._conn.commit()
+
+        meta_paths = glob.glob(os.path.join(path, meta_template))
+        if len(meta_paths) == 0:
+            raise ZeroMetaError(f"There is no {meta_template} file in {path}")
+        elif len(meta_paths) > 1:
+            raise MultipleMetaError(f"There are {len(meta_paths)} in {path}")
+        else:
+            return self.read(meta_paths[0])
+
+    def update(self, path: str) -> None:
+        """
+        Updates the entries of a single directory
+
+        Parameters
+        ----------
+        path : str
+            Path to the directory in which meta was written
+        """
+        if self._readonly:
+            return
+        rel_dir = self._rel(path)
+        with self._lock:
+            self._conn.execute("DELETE FROM meta WHERE dir = ?", (rel_dir,))
+        for meta_path in glob.glob(os.path.join(path, "meta.*")):
+            if os.path.splitext(meta_path)[-1] not in supported_meta_formats:
+                continue
+            try:
+                self._read_file(meta_path, os.stat(meta_path), commit=False)
+            except (MetaIOError, FileNotFoundError):
+                continue
+        with self._lock:
+            self._conn.commit()
+
+    def refresh(self) -> None:
+        """
+        Synchronizes the index with the disk. Walks over the containers
+        under the root, parses new and changed meta files and forgets
+        the removed ones. Does not descend into folders without meta files
+        except for the root itself. Does nothing if the index is read-only.
+        """
+        if self._readonly:
+            return
+        with self._lock:
+            known = {
+                path: (mtime_ns, size)
+                for path, mtime_ns, size in self._conn.execute(
+                    "SELECT path, mtime_ns, size FROM meta"
+                )
+            }
+        seen = set()
+
+        def _walk(path: str, is_root: bool = False) -> None:
+            try:
+                entries = list(os.scandir(path))
+            except OSError:
+                return
+
+            found = False
+            for entry in entries:
+                name, ext = os.path.splitext(entry.name)
+                if name != "meta" or ext not in supported_meta_formats:
+                    continue
+                if not entry.is_file():
+                    continue
+                found = True
+
+                rel_path = self._rel(entry.path)
+                seen.add(rel_path)
+                stat = entry.stat()
+                if known.get(rel_path) == (stat.st_mtime_ns, stat.st_size):
+                    continue
+                try:
+                    self._read_file(entry.path, stat, commit=False)
+                except MetaIOError:
+                    seen.discard(rel_path)
+
+            if found or is_root:
+                for entry in sorted(entries, key=lambda e: e.name):
+                    if entry.is_dir():
+                        _walk(entry.path, is_root=found and is_shard_folder(entry.name))
+
+        _walk(self._root, is_root=True)
+
+        removed = [(path,) for path in known if path not in seen]
+        with self._lock:
+            self._conn.executemany("DELETE FROM meta WHERE path = ?", removed)
+            self._conn.commit()
+
+    def items(self) -> Iterator[Tuple[str, Meta]]:
+        """
+        Iterates over the indexed meta files without checking the disk
+
+        Yields
+        ------
+        Tuple[str, Meta]
+            Full path to the meta file and its contents
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT path, meta FROM meta ORDER BY path").fetchall()
+        for path, meta in rows:
+            full_path = os.path.join(self._root, path)
+            decoded = _loads(meta)
+            if decoded is None:
+                # Written by the older version, read the file instead
+                try:
+                    decoded = MetaHandler.read(full_path)
+                except (MetaIOError, FileNotFoundError):
+                    continue
+            yield full_path, decoded
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM meta").fetchone()[0]
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "MetaIndex":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @classmethod
+    def find(cls, path: str) -> Optional[str]:
+        """
+        Returns the path to the directory with the index if the
+        index exists in ``path`` or None
+        """
+        if os.path.isfile(os.path.join(path, INDEX_FILENAME)):
+            return path
+        return None
+
+    @classmethod
+    def notify(cls, path: str) -> None:
+        """
+        Updates all existing indexes of the folder ``path`` and its
+        parent containers. Used by containers after they write meta.
+        Does nothing if there are no indexes.
+
+        Parameters
+        ----------
+        path : str
+            Path to the directory in which meta was written
+        """
+        path = os.path.abspath(path)
+        current = path
+        for _ in range(_NOTIFY_DEPTH + 1):
+            if cls.find(current):
+                try:
+                    with cls(current) as index:
+                        index.update(path)
+                except sqlite3.Error:
+                    # Index is just a cache, so failure to
+                    # update it should not break saving
+                    pass
+
+            parent = os.path.dirname(current)
+            if parent == current:
+                break
+            current = parent
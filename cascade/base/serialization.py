@@ -17,10 +17,81 @@ limitations under the License.
 import os
 import pickle
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, List, Tuple
 
+import numpy as np
 from typing_extensions import Literal
 
+# Out-of-band buffers are stored in a file next to the pickle
+BUFFERS_SUFFIX = ".buffers"
+# Buffers are aligned in the file for arrays over them to be aligned too
+_BUFFER_ALIGNMENT = 64
+
+
+def dump_with_buffers(obj: Any, path: str) -> None:
+    """
+    Pickles the object with protocol 5 writing large buffers like
+    contents of numpy arrays out-of-band into ``path + ".buffers"``.
+    The object can then be loaded with ``load_with_buffers`` without
+    reading the buffers into memory.
+
+    Parameters
+    ----------
+    obj : Any
+        The object to pickle
+    path : str
+        Path to the pickle file
+    """
+    if pickle.HIGHEST_PROTOCOL < 5:
+        raise RuntimeError("Out-of-band buffers require pickle protocol 5 (Python 3.8+)")
+
+    buffers: List[pickle.PickleBuffer] = []
+    data = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+
+    layout: List[Tuple[int, int]] = []
+    with open(path + BUFFERS_SUFFIX, "wb") as f:
+        for buffer in buffers:
+            raw = buffer.raw()
+            offset = -f.tell() % _BUFFER_ALIGNMENT
+            f.write(b"\0" * offset)
+            layout.append((f.tell(), raw.nbytes))
+            f.write(raw)
+
+    # The layout of buffers goes first and then the object itself
+    with open(path, "wb") as f:
+        pickle.dump(layout, f, protocol=5)
+        f.write(data)
+
+
+def load_with_buffers(path: str, mmap_mode: Literal["r", "c"] = "c") -> Any:
+    """
+    Loads the object saved by ``dump_with_buffers`` mapping its buffers
+    into memory instead of reading them. Pages of the buffers are read
+    lazily when accessed and are shared between processes that load
+    the same file.
+
+    Parameters
+    ----------
+    path : str
+        Path to the pickle file
+    mmap_mode : Literal["r", "c"], optional
+        "r" makes arrays read-only, "c" allows to change them
+        in memory without writing changes to the file, by default "c"
+
+    Returns
+    -------
+    Any
+        Loaded object
+    """
+    with open(path, "rb") as f:
+        layout = pickle.load(f)
+        buffers = [bytearray() for _ in layout]
+        # Empty file cannot be mapped
+        if any(size for _, size in layout):
+            mapped = np.memmap(path + BUFFERS_SUFFIX, dtype=np.uint8, mode=mmap_mode)
+            buffers = [mapped[offset:offset + size] for offset, size in layout]
+        return pickle.load(f, buffers=buffers)
+
 
 class BaseObjectHandler(ABC):
     @abstractmethod
@@ -0,0 +1,200 @@
+"""
+Copyright 2022-2025 Ilia Moiseev
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+import sqlite3
+import threading
+from typing import Optional
+
+SLUG_INDEX_FILENAME = ".cascade_slugs.sqlite"
+
+# How many levels above the model folder to look
+# for indexes: (shard) -> line -> repo -> workspace
+_NOTIFY_DEPTH = 4
+
+
+def _read_slug(path: str) -> Optional[str]:
+    try:
+        with open(os.path.join(path, "SLUG"), "r") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+class SlugIndex:
+    """
+    On-disk mapping from the slugs of the models to their folders
+    for all models under a container root.
+
+    Lines add the slugs of the models they save into the existing indexes
+    of parent containers, see ``SlugIndex.notify``. If a slug is not found
+    the index can be rebuilt from the ``SLUG`` files with ``rebuild``.
+
+    Examples
+    --------
+    >>> from cascade.base import SlugIndex
+    >>> with SlugIndex("repo") as index:
+    ...     index.rebuild()
+    ...     path = index.get("fair_squid_of_bliss")
+    """
+
+    def __init__(self, root: str) -> None:
+        """
+        Parameters
+        ----------
+        root : str
+            Path to the container. The index file is created
+            there if it does not exist
+        """
+        self._root = os.path.abspath(root)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            os.path.join(self._root, SLUG_INDEX_FILENAME), timeout=30, check_same_thread=False
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS slugs (slug TEXT PRIMARY KEY, path TEXT)")
+        self._conn.commit()
+
+    def get_root(self) -> str:
+        return self._root
+
+    def get(self, slug: str) -> Optional[str]:
+        """
+        Returns full path to the folder of the model with the slug
+        given or None if the slug is not in the index or the model
+        was moved or removed
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT path FROM slugs WHERE slug = ?", (slug,)).fetchone()
+        if row is None:
+            return None
+
+        path = os.path.join(self._root, row[0])
+        if _read_slug(path) != slug:
+            return None
+        return path
+
+    def add(self, slug: str, path: str) -> None:
+        """
+        Adds the slug of the model in the folder ``path`` to the index
+        """
+        rel_path = os.path.relpath(os.path.abspath(path), self._root)
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO slugs VALUES (?, ?)", (slug, rel_path))
+            self._conn.commit()
+
+    def rebuild(self) -> None:
+        """
+        Fills the index from scratch reading all SLUG files
+        of the models inside the container
+        """
+        rows = []
+
+        def _walk(path: str, depth: int) -> None:
+            try:
+                entries = list(os.scandir(path))
+            except OSError:
+                return
+
+            for entry in entries:
+                if entry.name.startswith(".") or not entry.is_dir():
+                    continue
+                slug = _read_slug(entry.path)
+                if slug is not None:
+                    rows.append((slug, os.path.relpath(entry.path, self._root)))
+                elif depth > 1:
+                    _walk(entry.path, depth - 1)
+
+        _walk(self._root, _NOTIFY_DEPTH)
+
+        with self._lock:
+            self._conn.execute("DELETE FROM slugs")
+            self._conn.executemany("INSERT OR REPLACE INTO slugs VALUES (?, ?)", rows)
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM slugs").fetchone()[0]
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "SlugIndex":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @classmethod
+    def exists(cls, path: str) -> bool:
+        return os.path.isfile(os.path.join(path, SLUG_INDEX_FILENAME))
+
+    @classmethod
+    def notify(cls, path: str, slug: str) -> None:
+        """
+        Adds the slug of the model in the folder ``path`` to all
+        existing indexes of its parent containers. Used by lines
+        after they save a model. Does nothing if there are no indexes.
+        """
+        path = os.path.abspath(path)
+        current = os.path.dirname(path)
+        for _ in range(_NOTIFY_DEPTH):
+            if cls.exists(current):
+                try:
+                    with cls(current) as index:
+                        index.add(slug, path)
+                except sqlite3.Error:
+                    # Index is just a cache, so failure to
+                    # update it should not break saving
+                    pass
+
+            parent = os.path.dirname(current)
+            if parent == current:
+                break
+            current = parent
+
+    @classmethod
+    def find(cls, root: str, slug: str, create: bool = True) -> Optional[str]:
+        """
+        Finds the folder of the model by slug using the index of the container.
+        Creates and fills the index if it does not exist.
+
+        Parameters
+        ----------
+        root : str
+            Path to the container
+        slug : str
+            Slug of the model
+        create : bool, optional
+            If False and there is no index, returns None
+            instead of creating it, by default True
+
+        Returns
+        -------
+        Optional[str]
+            Full path to the model or None if it is not in the index
+
+        Raises
+        ------
+        sqlite3.Error, OSError
+            If the index cannot be created or read
+        """
+        created = not cls.exists(root)
+        if created and not create:
+            return None
+        with cls(root) as index:
+            if created:
+                index.rebuild()
+            return index.get(slug)
@@ -14,22 +14,31 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-import glob
 import os
-import socket
+import threading
 import warnings
-from dataclasses import asdict, dataclass
+from contextlib import ExitStack, contextmanager
+from dataclasses import asdict, dataclass, replace
 from datetime import datetime
-from getpass import getuser
-from typing import Any, Callable, Dict, Iterable, Optional, Union
+from typing import (Any, Callable, Dict, Hashable, Iterable, Iterator, List,
+                    Optional, Set, Union)
 
 import pendulum
 from typing_extensions import Literal
 
-from . import (Config, Meta, MetaBlock, MetaHandler, MetaIOError,
-               default_meta_format, supported_meta_formats)
+from . import (Config, Meta, MetaBlock, MetaHandler, MetaIndex, MetaIOError,
+               MultipleMetaError, ReadOnlyError, ZeroMetaError, default_meta_format,
+               supported_meta_formats)
+from .meta_handler import file_lock
+from .utils import get_hostname, get_user
 
 DO_NOT_UPDATE = ["created_at"]
+# Fields of meta that are merged with what is on disk
+# and not overwritten when meta is synced
+MERGED_FIELDS = ["tags", "comments", "links"]
+# Hidden file in the folder of the object which is locked
+# while meta is updated
+LOCK_FILENAME = ".lock"
 
 
 @dataclass
@@ -54,6 +63,22 @@ class Link:
             self.uri = os.path.abspath(self.uri)
 
 
+def _stamp(value: Any) -> str:
+    # Time as it is written in meta, the same for the
+    # objects in memory and the strings read from disk
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _entry_key(entry: Dict[str, Any]) -> Hashable:
+    # Comments and links are identified by id and creation time,
+    # ids alone are not unique between processes
+    if "timestamp" in entry:
+        return (entry["id"], _stamp(entry["timestamp"]))
+    return (entry["id"], _stamp(entry["created_at"]))
+
+
 class Traceable:
     """
     Base class for everything that has metadata in Cascade
@@ -281,7 +306,7 @@ class Traceable:
     def comment(self, message: str) -> None:
         comment_id = str(int(self._find_latest_comment_id()) + 1)
         comment = Comment(
-            comment_id, getuser(), socket.gethostname(), pendulum.now(tz="UTC"), message
+            comment_id, get_user(), get_hostname(), pendulum.now(tz="UTC"), message
         )
 
         self.comments.append(comment)
@@ -386,11 +411,36 @@ class TraceableOnDisk(Traceable):
     def __init__(
         self,
         root: str,
-        meta_fmt: Literal[".json", ".yml", ".yaml", None],
+        meta_fmt: Literal[".json", ".yml", ".yaml", ".msgpack", None],
         *args: Any,
         meta_prefix: Union[Dict[Any, Any], str, None] = None,
+        readonly: bool = False,
         **kwargs: Any,
     ) -> None:
+        """
+        Parameters
+        ----------
+        readonly : bool, optional
+            If True, the object never writes anything on disk. Meta is only read
+            and all methods that would write raise ``ReadOnlyError``, by default False
+        """
+        self._readonly = readonly
+        # Depth of nested batch_meta blocks and whether
+        # there are changes not written to disk yet
+        self._meta_batch_depth = 0
+        self._meta_dirty = False
+        # First block of meta found on disk when the object was opened
+        self._disk_meta = None
+        # Tags, comments and links as they were on disk after
+        # the last sync, used to merge the concurrent changes
+        self._synced: Dict[str, Set[Hashable]] = {field: set() for field in MERGED_FIELDS}
+        # Explicit meta prefix should always reach the disk
+        self._sync_on_open = meta_prefix is not None
+        # Guards the lock file against threads and counts
+        # nested acquisitions since file locks are not reentrant
+        self._meta_thread_lock = threading.RLock()
+        self._meta_lock_depth = 0
+
         super().__init__(*args, meta_prefix=meta_prefix, **kwargs)
         self._root = root
 
@@ -417,22 +467,26 @@ class TraceableOnDisk(Traceable):
         # if meta exists
         if ext:
             try:
-                disk_meta = MetaHandler.read_dir(self._root)
+                disk_meta = MetaHandler.read_dir(self._root, meta_fmt=ext)
             except MetaIOError as e:
                 warnings.warn(f"File reading error ignored: {e}")
             else:
+                block = disk_meta[0] if isinstance(disk_meta, list) else disk_meta
+                self._disk_meta = dict(block)
                 self.from_meta(disk_meta)
+                self._synced = self._merged_keys()
 
     def _determine_meta_fmt(self) -> Optional[str]:
         # TODO: maybe meta.* should become a global setting
-        meta_paths = glob.glob(os.path.join(self._root, "meta.*"))
-        if len(meta_paths) == 0:
+        try:
+            meta_path = MetaHandler.find_meta_path(self._root, "meta.*")
+        except ZeroMetaError:
             return
-        elif len(meta_paths) == 1:
-            _, ext = os.path.splitext(meta_paths[0])
-            return ext
-        else:
+        except MultipleMetaError:
             warnings.warn(f"Multiple meta files found in {self._root}")
+            return
+        _, ext = os.path.splitext(meta_path)
+        return ext
 
     def sync_meta(self) -> None:
         """
@@ -445,40 +499,161 @@ class TraceableOnDisk(Traceable):
         If meta consists of several blocks, it zips two lists
         and update accordingly
 
+        Tags, comments and links are merged with the ones on disk instead
+        of being overwritten, so that the changes made by other objects
+        of the same root since the last sync are not lost. See ``_merge_disk_meta``
+
         The object should already exist to be synced
-        """
-        meta_path = sorted(glob.glob(os.path.join(self._root, "meta.*")))
-        # Object was created before -> update meta on disk
-        if len(meta_path) > 0:
-            meta = [{}]
-            from . import MetaHandler
 
+        Raises
+        ------
+        ReadOnlyError
+            If the object was opened with ``readonly=True``
+        """
+        self._check_writable()
+        # Other processes should not write between reading and writing meta
+        with self._meta_lock():
+            # The format is usually known, so the file is checked
+            # directly without listing the folder
+            meta_path = None
             try:
-                meta = MetaHandler.read_dir(self._root)
+                meta_path = MetaHandler.find_meta_path(self._root, meta_fmt=self._meta_fmt)
+            except ZeroMetaError:
+                pass
             except MetaIOError as e:
                 warnings.warn(f"File reading error ignored: {e}")
+                meta_path = os.path.join(self._root, "meta" + self._meta_fmt)
+
+            # Object was created before -> update meta on disk
+            if meta_path is not None:
+                meta = [{}]
+                try:
+                    meta = MetaHandler.read(meta_path)
+                except (MetaIOError, FileNotFoundError) as e:
+                    warnings.warn(f"File reading error ignored: {e}")
+                else:
+                    self._merge_disk_meta(meta[0] if isinstance(meta, list) else meta)
+
+                self_meta = self.get_meta()
+                for self_block, block in zip(self_meta, meta):
+                    for key in self_block:
+                        if key not in DO_NOT_UPDATE:
+                            block[key] = self_block[key]
+
+                try:
+                    MetaHandler.write(meta_path, meta)
+                except MetaIOError as e:
+                    warnings.warn(f"File writing error ignored: {e}")
+            else:
+                created = str(pendulum.now(tz="UTC"))
+                meta = self.get_meta()
+                meta[0].update({"created_at": created})
 
-            self_meta = self.get_meta()
-            for self_block, block in zip(self_meta, meta):
-                for key in self_block:
-                    if key not in DO_NOT_UPDATE:
-                        block[key] = self_block[key]
+                try:
+                    MetaHandler.write(os.path.join(self._root, "meta" + self._meta_fmt), meta)
+                except MetaIOError as e:
+                    warnings.warn(f"File writing error ignored: {e}")
 
-            try:
-                MetaHandler.write_dir(self._root, meta)
-            except MetaIOError as e:
-                warnings.warn(f"File writing error ignored: {e}")
-        else:
-            created = str(pendulum.now(tz="UTC"))
-            meta = self.get_meta()
-            meta[0].update({"created_at": created})
+            self._synced = self._merged_keys()
 
-            from . import MetaHandler
+        MetaIndex.notify(self._root)
 
-            try:
-                MetaHandler.write(os.path.join(self._root, "meta" + self._meta_fmt), meta)
-            except MetaIOError as e:
-                warnings.warn(f"File writing error ignored: {e}")
+    def _merged_keys(self) -> Dict[str, Set[Hashable]]:
+        return {
+            "tags": set(self.tags),
+            "comments": {_entry_key(asdict(comment)) for comment in self.comments},
+            "links": {_entry_key(asdict(link)) for link in self.links},
+        }
+
+    def _merge_disk_meta(self, block: MetaBlock) -> None:
+        """
+        Merges tags, comments and links on disk into the object.
+        Several objects can be opened on the same root, for example
+        in different processes, and each of them changes only its own copy.
+
+        This is a three-way merge with the state of the last sync as a base:
+        the entries added or removed by this object since then are added or removed,
+        the entries added or removed by others are kept as they are on disk.
+        Comments and links added concurrently with the same id get new ids.
+        """
+        if "tags" in block:
+            base = self._synced["tags"]
+            disk = set(block["tags"] or [])
+            self.tags = (disk - (base - self.tags)) | (self.tags - base)
+
+        if "comments" in block:
+            self.comments = self._merge_entries(
+                self.comments, block["comments"] or [], self._synced["comments"], Comment
+            )
+        if "links" in block:
+            self.links = self._merge_entries(
+                self.links, block["links"] or [], self._synced["links"], Link
+            )
+
+    @staticmethod
+    def _merge_entries(
+        local: List[Any], disk: List[Dict[str, Any]], base: Set[Hashable], cls: Any
+    ) -> List[Any]:
+        local_entries = {_entry_key(asdict(entry)): entry for entry in local}
+        merged = []
+        for item in disk:
+            key = _entry_key(item)
+            if key in local_entries:
+                merged.append(local_entries.pop(key))
+            elif key not in base:
+                # Added by others
+                merged.append(cls(**item))
+            # Else removed by this object
+
+        ids = {entry.id for entry in merged}
+        for key, entry in local_entries.items():
+            if key in base:
+                # Removed by others
+                continue
+            if entry.id in ids:
+                last = max((int(i) for i in ids if str(i).isdigit()), default=0)
+                entry = replace(entry, id=str(last + 1))
+            ids.add(entry.id)
+            merged.append(entry)
+        return merged
+
+    def _sync_meta_on_open(self, state: Dict[str, Any]) -> None:
+        """
+        Syncs meta when the object is constructed only if there
+        is no meta on disk yet or if any of the fields in ``state``
+        differ from what is written. This way opening an existing
+        object just to read it does not write anything on disk.
+        """
+        if self._readonly:
+            return
+        if not self._sync_on_open and self._disk_meta is not None and all(
+            self._disk_meta.get(key) == value for key, value in state.items()
+        ):
+            return
+        self.sync_meta()
+
+    @contextmanager
+    def _meta_lock(self) -> Iterator[None]:
+        """
+        Exclusive lock on the meta of the object between processes and threads.
+        Can be nested. Does nothing if the folder of the object does not exist.
+        """
+        with self._meta_thread_lock:
+            with ExitStack() as stack:
+                if self._meta_lock_depth == 0 and os.path.isdir(self._root):
+                    stack.enter_context(file_lock(os.path.join(self._root, LOCK_FILENAME)))
+                self._meta_lock_depth += 1
+                try:
+                    yield
+                finally:
+                    self._meta_lock_depth -= 1
+
+    def _check_writable(self) -> None:
+        if self._readonly:
+            raise ReadOnlyError(f"{self._root} was opened with readonly=True")
+
+    def is_readonly(self) -> bool:
+        return self._readonly
 
     def get_root(self) -> str:
         return self._root
@@ -489,15 +664,50 @@ class TraceableOnDisk(Traceable):
         return meta
 
     def load_meta(self):
-        from . import MetaHandler
-
-        meta = MetaHandler.read_dir(self._root)
+        meta = MetaHandler.read_dir(self._root, meta_fmt=self._meta_fmt)
         return meta
 
+    @contextmanager
+    def batch_meta(self) -> Iterator["TraceableOnDisk"]:
+        """
+        Defers writing of meta on disk until the end of the block.
+        Inside it the methods like ``tag``, ``comment`` or ``link`` only change
+        the object and meta is synced once when the outermost block exits,
+        even if an exception was raised.
+
+        Examples
+        --------
+        >>> line = ModelLine("line")
+        >>> with line.batch_meta():
+        ...     for i in range(100):
+        ...         line.tag(f"tag_{i}")
+        """
+        self._meta_batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._meta_batch_depth -= 1
+            if self._meta_batch_depth == 0:
+                self.flush()
+
+    def flush(self) -> None:
+        """
+        Writes the changes deferred by ``batch_meta`` on disk.
+        Does nothing if there are no such changes.
+        """
+        if self._meta_dirty:
+            self._meta_dirty = False
+            self.sync_meta()
+
     def _sync_meta_after(self, function: Callable[..., Any]):
         def wrap(*args: Any, **kwargs: Any):
+            # Fail before changing the object
+            self._check_writable()
             result = function(*args, **kwargs)
-            self.sync_meta()
+            if self._meta_batch_depth > 0:
+                self._meta_dirty = True
+            else:
+                self.sync_meta()
             return result
 
         return wrap
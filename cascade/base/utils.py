@@ -16,9 +16,14 @@ limitations under the License.
 
 import os
 import re
+import socket
 import subprocess
 import sys
-from typing import Any, Dict, List, Optional, Tuple, Union
+import threading
+import time
+from functools import lru_cache
+from getpass import getuser
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from coolname import generate
 
@@ -100,7 +105,126 @@ def generate_slug() -> str:
     return slug
 
 
-def get_latest_commit_hash() -> Optional[str]:
+# How long the list of uncommitted changes is cached. Changes
+# of files not added to the index cannot be detected without
+# running git, so they may be reported with this delay
+UNCOMMITTED_CHANGES_TTL = 10.0
+
+_git_cache: Dict[Tuple[str, str], Tuple[Any, Any, float]] = {}
+_git_cache_lock = threading.Lock()
+
+
+def _find_git_dir(path: str) -> Optional[str]:
+    while True:
+        dot_git = os.path.join(path, ".git")
+        if os.path.isdir(dot_git):
+            return dot_git
+        if os.path.isfile(dot_git):
+            # Worktrees and submodules have a file with the path
+            try:
+                with open(dot_git, "r") as f:
+                    content = f.read().strip()
+            except OSError:
+                return None
+            if content.startswith("gitdir:"):
+                return os.path.join(path, content[len("gitdir:"):].strip())
+            return None
+
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+
+def _mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _common_dir(git_dir: str) -> str:
+    # Worktrees have their own HEAD and index, but branches
+    # and packed refs are in the git dir of the main repository
+    try:
+        with open(os.path.join(git_dir, "commondir"), "r") as f:
+            return os.path.normpath(os.path.join(git_dir, f.read().strip()))
+    except OSError:
+        return git_dir
+
+
+def _git_state(git_dir: str, with_index: bool) -> Tuple[Any, ...]:
+    """
+    Returns modification times of the files that change on checkout,
+    commit or staging (if ``with_index``), so that the state changes
+    if any of them happens
+    """
+    common_dir = _common_dir(git_dir)
+    head_path = os.path.join(git_dir, "HEAD")
+    ref_mtime = None
+    try:
+        with open(head_path, "r") as f:
+            head = f.read().strip()
+        if head.startswith("ref:"):
+            ref_mtime = _mtime(os.path.join(common_dir, head[len("ref:"):].strip()))
+    except OSError:
+        head = None
+
+    return (
+        head,
+        _mtime(head_path),
+        ref_mtime,
+        _mtime(os.path.join(common_dir, "packed-refs")),
+        # Appended on every commit or checkout in this worktree
+        _mtime(os.path.join(git_dir, "logs", "HEAD")),
+        _mtime(os.path.join(git_dir, "index")) if with_index else None,
+    )
+
+
+def _cached_git(
+    name: str,
+    compute: Callable[[], Any],
+    outside_repo: Any,
+    with_index: bool = False,
+    ttl: Optional[float] = None,
+) -> Any:
+    if "GIT_DIR" in os.environ:
+        return compute()
+
+    cwd = os.getcwd()
+    git_dir = _find_git_dir(cwd)
+    if git_dir is None:
+        # Nothing to ask git about
+        return outside_repo
+
+    state = _git_state(git_dir, with_index)
+    now = time.monotonic()
+    with _git_cache_lock:
+        cached = _git_cache.get((cwd, name))
+    if cached is not None:
+        cached_state, value, computed_at = cached
+        if cached_state == state and (ttl is None or now - computed_at < ttl):
+            return value
+
+    value = compute()
+    # Git may refresh the index while running,
+    # so the state is taken again after the call
+    state = _git_state(git_dir, with_index)
+    with _git_cache_lock:
+        _git_cache[(cwd, name)] = (state, value, now)
+    return value
+
+
+def clear_provenance_cache() -> None:
+    """
+    Forgets cached git information, so that it is requested
+    from git the next time
+    """
+    with _git_cache_lock:
+        _git_cache.clear()
+
+
+def _run_latest_commit_hash() -> Optional[str]:
     try:
         result = subprocess.run(
             ["git", "rev-parse", "HEAD"], capture_output=True, text=True
@@ -110,7 +234,7 @@ def get_latest_commit_hash() -> Optional[str]:
         return None
 
 
-def get_uncommitted_changes() -> Optional[List[str]]:
+def _run_uncommitted_changes() -> Optional[List[str]]:
     try:
         result = subprocess.run(
             ["git", "status", "--porcelain"], capture_output=True, text=True
@@ -123,11 +247,75 @@ def get_uncommitted_changes() -> Optional[List[str]]:
         return None
 
 
+def get_latest_commit_hash() -> Optional[str]:
+    """
+    Returns the hash of the current commit of the git repository
+    in the working directory.
+
+    Git is called only when the HEAD or the current branch changed
+    since the last call.
+    """
+    # Outside of a repository git prints nothing
+    return _cached_git("commit", _run_latest_commit_hash, outside_repo="")
+
+
+def get_uncommitted_changes() -> Optional[List[str]]:
+    """
+    Returns the list of uncommitted changes in the git repository
+    in the working directory or None if there are no changes.
+
+    Git is called only when the state of the repository changed
+    since the last call or when ``UNCOMMITTED_CHANGES_TTL`` seconds passed.
+    """
+    changes = _cached_git(
+        "uncommitted",
+        _run_uncommitted_changes,
+        outside_repo=None,
+        with_index=True,
+        ttl=UNCOMMITTED_CHANGES_TTL,
+    )
+    return list(changes) if changes is not None else None
+
+
+@lru_cache(maxsize=None)
 def get_python_version() -> str:
     info = sys.version
     return info
 
 
+@lru_cache(maxsize=None)
+def get_user() -> str:
+    return getuser()
+
+
+@lru_cache(maxsize=None)
+def get_hostname() -> str:
+    return socket.gethostname()
+
+
+def is_shard_folder(name: str) -> bool:
+    """
+    Returns True if the folder is a shard of a ModelLine with sharded layout.
+    Shards have no meta of their own, but contain folders of models.
+    """
+    return len(name) == 4 and name.isdigit()
+
+
+def dir_state(path: str) -> Optional[Tuple[int, int, int]]:
+    """
+    Returns a cheap fingerprint of a folder that changes when
+    any entry is created, removed or replaced in it. Since meta files
+    are written by replacing them, this also covers rewrites of meta.
+
+    Returns None if the folder does not exist.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_nlink
+
+
 def parse_version(ver: str) -> Tuple[int, int, int]:
     numbers = re.findall("[0-9]+.[0-9]+.[0-9]+", ver)
     if len(numbers) == 1:
@@ -311,6 +499,71 @@ def migrate_repo_v0_13(path: str) -> None:
     print("Done")
 
 
+def convert_meta_fmt(path: str, meta_fmt: str) -> int:
+    """
+    Converts meta files of the container and all containers
+    inside it to another format in place
+
+    Walks only into the folders that have meta files except for the root,
+    so artifacts and other files are not touched. Skips meta files
+    if fails to read them.
+
+    Parameters
+    ----------
+    path : str
+        Path to the container to convert
+    meta_fmt : str
+        The extension of the new meta format like ``.msgpack``
+
+    Returns
+    -------
+    int
+        The number of converted files
+    """
+    from cascade.base import MetaHandler, MetaIndex, MetaIOError, supported_meta_formats
+
+    if meta_fmt not in supported_meta_formats:
+        raise ValueError(f"Only {supported_meta_formats} are supported formats")
+
+    count = 0
+
+    def _convert(folder: str, is_root: bool = False) -> None:
+        nonlocal count
+        try:
+            entries = sorted(os.scandir(folder), key=lambda e: e.name)
+        except OSError:
+            return
+
+        meta_paths = []
+        for entry in entries:
+            name, ext = os.path.splitext(entry.name)
+            if name == "meta" and ext in supported_meta_formats and entry.is_file():
+                meta_paths.append(entry.path)
+
+        if len(meta_paths) == 1 and os.path.splitext(meta_paths[0])[-1] != meta_fmt:
+            try:
+                meta = MetaHandler.read(meta_paths[0])
+            except MetaIOError as e:
+                print(f"Failed to read meta: {e}")
+            else:
+                # New file is written first to not to lose
+                # the meta if something fails
+                MetaHandler.write(os.path.join(folder, "meta" + meta_fmt), meta)
+                os.remove(meta_paths[0])
+                MetaIndex.notify(folder)
+                count += 1
+        elif len(meta_paths) > 1:
+            print(f"Multiple meta files found in {folder}, skipping")
+
+        if meta_paths or is_root:
+            for entry in entries:
+                if entry.is_dir():
+                    _convert(entry.path, is_root=bool(meta_paths) and is_shard_folder(entry.name))
+
+    _convert(path, is_root=True)
+    return count
+
+
 def flatten_dict(
     nested_dict: Dict[str, Any],
     separator: str = "_",
@@ -23,6 +23,8 @@ from typing import List, Optional
 import click
 from typing_extensions import Literal
 
+from ..base import BlobStore
+from ..base.blob_store import BLOB_STORE_FOLDER
 from .common import create_container
 
 
@@ -67,7 +69,7 @@ def remove_model_artifacts(path) -> List[RemoveResult]:
 
 
 def remove_line_artifacts(path, type) -> List[List[RemoveResult]]:
-    line = create_container(type, path)
+    line = create_container(type, path, readonly=True)
     line_results = []
     for name in line.get_model_names():
         results = remove_model_artifacts(os.path.join(path, name))
@@ -76,16 +78,16 @@ def remove_line_artifacts(path, type) -> List[List[RemoveResult]]:
 
 
 def remove_repo_artifacts(path) -> List[List[List[RemoveResult]]]:
-    repo = create_container("repo", path)
+    repo = create_container("repo", path, readonly=True)
     repo_results = []
     for name in repo.get_line_names():
-        results = remove_line_artifacts(os.path.join(path, name))
+        results = remove_line_artifacts(os.path.join(path, name), "model_line")
         repo_results.append(results)
     return repo_results
 
 
 def remove_wp_artifacts(path) -> List[List[List[List[RemoveResult]]]]:
-    wp = create_container("workspace", path)
+    wp = create_container("workspace", path, readonly=True)
     wp_results = []
     for name in wp.get_repo_names():
         results = remove_repo_artifacts(os.path.join(path, name))
@@ -93,6 +95,48 @@ def remove_wp_artifacts(path) -> List[List[List[List[RemoveResult]]]]:
     return wp_results
 
 
+def _blob_store_parents(path: str, type: str) -> List[str]:
+    if type == "model":
+        # The model may be in a shard of a line in a repo
+        parents = [os.path.dirname(path)]
+        for _ in range(2):
+            parents.append(os.path.dirname(parents[-1]))
+        return parents
+    elif type in ("line", "model_line"):
+        return [path, os.path.dirname(path)]
+    elif type == "repo":
+        repo = create_container("repo", path, readonly=True)
+        return [path] + [os.path.join(path, name) for name in repo.get_line_names()]
+    elif type == "workspace":
+        wp = create_container("workspace", path, readonly=True)
+        parents = []
+        for name in wp.get_repo_names():
+            parents += _blob_store_parents(os.path.join(path, name), "repo")
+        return parents
+    return []
+
+
+def find_blob_stores(path: str, type: str) -> List[BlobStore]:
+    """
+    Finds the stores that files of the container can be linked to.
+    Lines keep the store in their folder or share the one in the repo's folder.
+    """
+    stores = []
+    for parent in _blob_store_parents(path, type):
+        store_root = os.path.join(parent, BLOB_STORE_FOLDER)
+        if os.path.isdir(store_root):
+            stores.append(BlobStore(store_root))
+    return stores
+
+
+def format_size(size: int) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
 @click.group("artifact")
 @click.pass_context
 def artifact(ctx):
@@ -146,13 +190,43 @@ def artifact_rm(ctx, y):
 
     c = Counter(res.status for res in flat_results)
 
+    # Blobs that were used only by removed files are not needed anymore
+    removed_blobs = 0
+    freed = 0
+    for store in find_blob_stores(ctx.obj["cwd"], ctx.obj["type"]):
+        n, size = store.gc()
+        removed_blobs += n
+        freed += size
+
     click.echo(f"Found {c['OKAY'] + c['FAIL']} files in {len(results_list)} models")
     click.echo(f"Removed: {c['OKAY']}")
     click.echo(f"Missing files: {c['MISS']}")
     click.echo(f"Failed: {c['FAIL']}")
+    if removed_blobs:
+        click.echo(f"Removed unused blobs: {removed_blobs}, freed {format_size(freed)}")
 
     if c["FAIL"] != 0:
         for res in flat_results:
             if res.status == "FAIL":
                 click.echo(f"Failed to remove {res.path}")
                 click.echo(res.traceback)
+
+
+@artifact.command("stats")
+@click.pass_context
+def artifact_stats(ctx):
+    """
+    Show how much space the deduplication of artifacts saves
+    """
+    stores = find_blob_stores(ctx.obj["cwd"], ctx.obj["type"])
+    if not stores:
+        click.echo("No blob stores found, save models into lines with dedup=True")
+        return
+
+    for store in stores:
+        stats = store.stats()
+        click.echo(store.get_root())
+        click.echo(f"  Blobs: {stats['blobs']}, {format_size(stats['size'])}")
+        click.echo(f"  Linked files: {stats['links']}")
+        click.echo(f"  Saved: {format_size(stats['saved'])}")
+        click.echo(f"  Unused: {format_size(stats['garbage'])}")
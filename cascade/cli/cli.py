@@ -18,11 +18,12 @@ import os
 
 import click
 
-from ..base import MetaHandler, MetaIOError
+from ..base import MetaHandler, MetaIOError, supported_meta_formats
 from .artifact import artifact
 from .comment import comment
 from .common import create_container
 from .desc import desc
+from .export import export
 from .query import query
 from .run import run
 from .tag import tag
@@ -77,7 +78,7 @@ def cat(ctx, p):
             click.echo(pformat(ctx.obj["meta"]))
     else:
         if ctx.obj.get("meta"):
-            container = create_container(ctx.obj["type"], ctx.obj["cwd"])
+            container = create_container(ctx.obj["type"], ctx.obj["cwd"], readonly=True)
             if not container:
                 return
 
@@ -106,9 +107,64 @@ def migrate(ctx):
     migrate_repo_v0_13(ctx.obj.get("cwd"))
 
 
+@cli.command("convert")
+@click.pass_context
+@click.argument("meta_fmt", type=click.Choice(supported_meta_formats))
+def convert(ctx, meta_fmt):
+    """
+    Convert meta files of the container and everything inside to another format
+    """
+    if not ctx.obj.get("meta"):
+        return
+
+    from cascade.base.utils import convert_meta_fmt
+
+    count = convert_meta_fmt(ctx.obj["cwd"], meta_fmt)
+    click.echo(f"Converted {count} meta files to {meta_fmt}")
+
+
+@cli.command("layout")
+@click.pass_context
+@click.argument("layout", type=click.Choice(["flat", "sharded"]))
+def layout(ctx, layout):
+    """
+    Move models of the line into the flat or sharded layout
+    """
+    if ctx.obj.get("type") not in ("line", "model_line"):
+        click.echo(f"Cannot change layout of {ctx.obj.get('type')}, only model lines have it")
+        return
+
+    from cascade.lines import ModelLine
+
+    count = ModelLine(ctx.obj["cwd"]).set_layout(layout)
+    click.echo(f"Moved {count} models into {layout} layout")
+
+
+@cli.command("index")
+@click.pass_context
+def index(ctx):
+    """
+    Build or refresh the indexes of meta files and slugs in the container
+    """
+    if not ctx.obj.get("meta"):
+        return
+
+    from cascade.base import MetaIndex, SlugIndex
+
+    with MetaIndex(ctx.obj["cwd"]) as meta_index:
+        meta_index.refresh()
+        click.echo(f"Indexed {len(meta_index)} meta files")
+
+    if ctx.obj["type"] in ("repo", "workspace"):
+        with SlugIndex(ctx.obj["cwd"]) as slug_index:
+            slug_index.rebuild()
+            click.echo(f"Indexed {len(slug_index)} slugs")
+
+
 cli.add_command(artifact)
 cli.add_command(comment)
 cli.add_command(desc)
+cli.add_command(export)
 cli.add_command(run)
 cli.add_command(query)
 cli.add_command(tag)
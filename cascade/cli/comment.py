@@ -91,7 +91,7 @@ def comment_ls(ctx):
     else:
         click.echo("No comments here")
 
-    container = create_container(ctx.obj.get("type"), ctx.obj.get("cwd"))
+    container = create_container(ctx.obj.get("type"), ctx.obj.get("cwd"), readonly=True)
     if container:
         from cascade.lines import ModelLine
 
@@ -17,24 +17,26 @@ limitations under the License.
 from typing import Any
 
 
-def create_container(type: str, cwd: str) -> Any:
+def create_container(type: str, cwd: str, readonly: bool = False) -> Any:
     # "line" fallback here is for compatibility
     # with older versions
+    # Commands that only read should pass readonly=True
+    # to not write anything on disk
     if type in ("line", "model_line"):
         from cascade.lines import ModelLine
 
-        return ModelLine(cwd)
+        return ModelLine(cwd, readonly=readonly)
     elif type == "data_line":
         from cascade.lines import DataLine
 
-        return DataLine(cwd)
+        return DataLine(cwd, readonly=readonly)
     elif type == "repo":
         from cascade.repos import Repo
 
-        return Repo(cwd)
+        return Repo(cwd, readonly=readonly)
     elif type == "workspace":
         from cascade.workspaces import Workspace
 
-        return Workspace(cwd)
+        return Workspace(cwd, readonly=readonly)
     else:
         return
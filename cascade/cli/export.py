@@ -0,0 +1,47 @@
+"""
+Copyright 2022-2025 Ilia Moiseev
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import click
+
+from .common import create_container
+
+
+@click.command("export")
+@click.pass_context
+@click.argument("path")
+@click.option(
+    "-f", "--format", "fmt", type=click.Choice(["parquet", "arrow"]), default="parquet"
+)
+@click.option("--batch-size", type=int, default=1000, help="Objects per file")
+@click.option("--append", is_flag=True, help="Export only new or changed objects")
+def export(ctx, path: str, fmt: str, batch_size: int, append: bool):
+    """
+    Export meta of all objects into Parquet or Arrow files
+    """
+    if not ctx.obj.get("meta"):
+        return
+
+    container = create_container(ctx.obj["type"], ctx.obj["cwd"], readonly=True)
+    if container is None:
+        click.echo(f"Cannot export from {ctx.obj['type']}")
+        return
+
+    from cascade.meta import MetaExporter
+
+    count = MetaExporter(container, batch_size=batch_size).export(
+        path, fmt=fmt, append=append
+    )
+    click.echo(f"Exported {count} objects to {path}")
@@ -15,18 +15,28 @@ limitations under the License.
 """
 
 import ast
+import heapq
 import time
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Union
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from types import CodeType
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple, Union
 
 import click
 import pendulum
 
-from ..base import MetaIOError
+from ..base import Meta, MetaIndex
 from ..base.utils import get_terminal_width
 from .common import create_container
 
 
+# How many items each worker gets at once
+# when reading and evaluating in parallel
+ITEMS_PER_JOB = 4
+
+
 class QueryParsingError(Exception): ...  # noqa: E701
 
 
@@ -46,12 +56,28 @@ class Query:
     offset: Optional[int] = None
 
 
+@dataclass
+class CompiledQuery:
+    """
+    Query with all expressions validated and compiled. Expression
+    that is not a valid Python expression is compiled to None and
+    always evaluates to None.
+    """
+
+    query: Query
+    columns: List[Tuple[str, Optional[CodeType]]]
+    filter_code: Optional[CodeType] = None
+    sort_code: Optional[CodeType] = None
+
+
 @dataclass
 class Result:
     columns: List[str]
     rows: int
     data: List[Dict[str, Any]]
     time_s: int
+    # Time in seconds spent on each phase of execution
+    timings: Dict[str, float] = field(default_factory=dict, compare=False)
 
 
 class QueryParser:
@@ -258,26 +284,48 @@ class Field:
 
 
 class Executor:
-    def __init__(self, root: str, container_type: str):
-        container = create_container(container_type, root)
+    def __init__(self, root: str, container_type: str, jobs: int = 1):
+        """
+        Parameters
+        ----------
+        root : str
+            Path to the container
+        container_type : str
+            Type of the container
+        jobs : int, optional
+            The number of threads that read meta and evaluate the query
+            on it, by default 1 which means no parallelism
+        """
+        container = create_container(container_type, root, readonly=True)
         if container:
             self.container = container
             self.type = container_type
         else:
             raise ValueError("Can run queries only inside a container")
 
-    def iterate_over_container(self, container, container_type: str):
+        if jobs < 1:
+            raise ValueError(f"The number of jobs should be positive, got {jobs}")
+        self.jobs = jobs
+        # Queries only read, so the index is used only if it already exists
+        self.index = MetaIndex.open(root)
+
+    def iterate_over_lines(self, container, container_type: str) -> Iterator[Any]:
         if container_type in ("line", "model_line", "data_line"):
-            for i in range(len(container)):
-                try:
-                    yield container.load_obj_meta(i)
-                except MetaIOError:
-                    yield [{}]
+            container.set_index(self.index)
+            yield container
         elif container_type == "repo":
             for name in container.get_line_names():
-                line = container.add_line(name)
-                for meta in self.iterate_over_container(line, "line"):
-                    yield meta
+                yield from self.iterate_over_lines(container[name], "line")
+
+    def iterate_over_container(self, container, container_type: str) -> Iterator[Meta]:
+        # Meta of the next items is read in background threads while
+        # the current ones are evaluated, the window is bounded to be able to stop early
+        for line in self.iterate_over_lines(container, container_type):
+            yield from line.iter_meta(
+                prefetch=self.jobs * ITEMS_PER_JOB if self.jobs > 1 else 0,
+                workers=self.jobs,
+                ignore_errors=True,
+            )
 
     def validate_eval(self, expr: str) -> None:
         tree = ast.parse(expr)
@@ -294,7 +342,7 @@ class Executor:
             if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
                 if isinstance(node.func.value, ast.Name):
                     if node.func.value.id in ["subprocess", "socket"]:
-                        self.dangerous_calls.append(
+                        raise QueryExecutionError(
                             f"Found dangerous method call: {node.func.attr}"
                         )
 
@@ -304,71 +352,168 @@ class Executor:
             if isinstance(node, (ast.Import, ast.ImportFrom)):
                 raise QueryExecutionError("Imports are not allowed")
 
-    def eval_or_none(self, expr: str, context: Dict[str, Any]) -> Optional[Any]:
+    def compile_expr(self, expr: str) -> Optional[CodeType]:
+        self.validate_eval(expr)
         try:
-            return eval(expr, context.copy())
+            return compile(expr, "<query>", "eval")
+        except SyntaxError:
+            # Statements are valid for validation, but
+            # cannot be evaluated - they will always give None
+            return None
+
+    def compile(self, q: Query) -> CompiledQuery:
+        """
+        Validates and compiles every expression of the query once
+        to be evaluated on every meta later
+
+        Raises
+        ------
+        QueryExecutionError
+            If any of the expressions is not allowed
+        """
+        return CompiledQuery(
+            query=q,
+            columns=[(col, self.compile_expr(col)) for col in q.columns],
+            filter_code=self.compile_expr(q.filter_expr) if q.filter_expr else None,
+            sort_code=self.compile_expr(q.sort_expr) if q.sort_expr else None,
+        )
+
+    def eval_or_none(
+        self, expr: Union[str, CodeType, None], context: Dict[str, Any]
+    ) -> Optional[Any]:
+        """
+        Evaluates expression in the context or returns None if anything fails.
+        Context is used as globals and is not copied, so it should not be shared.
+        """
+        if expr is None:
+            return None
+        try:
+            return eval(expr, context)
         except Exception:
             return None
 
-    def select(self, ctx: Dict[str, Union[Field, Any]], columns: List[str]):
+    def select(
+        self,
+        ctx: Dict[str, Union[Field, Any]],
+        columns: List[Tuple[str, Optional[CodeType]]],
+    ) -> Dict[str, Any]:
         res = {}
-        for col in columns:
-            self.validate_eval(col)
-            res[col] = self.eval_or_none(col, ctx)
+        for col, code in columns:
+            res[col] = self.eval_or_none(code, ctx)
         return res
 
+    def process_meta(self, cq: CompiledQuery, meta: Meta) -> Optional[Tuple[Dict[str, Any], Any]]:
+        """
+        Evaluates compiled query on a single meta
+
+        Returns
+        -------
+        Optional[Tuple[Dict[str, Any], Any]]
+            Selected columns and sorting key or None if filtered out
+        """
+        # Field creates a new dict each time, so it
+        # can be safely used as globals without copying
+        full_ctx = Field(meta[0]).to_dict()  # TODO: somehow deal with meta lists
+        ctx = self.select(full_ctx, cq.columns)
+
+        if cq.query.filter_expr:
+            result = self.eval_or_none(cq.filter_code, full_ctx)
+            if not result:
+                return None
+
+        sorting_key = None
+        if cq.query.sort_expr:
+            sorting_key = self.eval_or_none(cq.sort_code, full_ctx)
+
+        return ctx, sorting_key
+
+    def process_chunk(
+        self, cq: CompiledQuery, chunk: List[Meta]
+    ) -> List[Optional[Tuple[Dict[str, Any], Any]]]:
+        return [self.process_meta(cq, meta) for meta in chunk]
+
+    def scan(self, cq: CompiledQuery) -> Iterator[Tuple[Dict[str, Any], Any]]:
+        """
+        Lazily reads and evaluates meta of every item in the container.
+        If there are several jobs, the query is evaluated on chunks of items
+        in worker threads, rows are yielded in the order of items
+
+        Yields
+        ------
+        Tuple[Dict[str, Any], Any]
+            Selected columns and sorting key of items that passed the filter
+        """
+        metas = self.iterate_over_container(self.container, self.type)
+        if self.jobs == 1:
+            for meta in metas:
+                row = self.process_meta(cq, meta)
+                if row is not None:
+                    yield row
+            return
+
+        chunks = iter(lambda: list(islice(metas, ITEMS_PER_JOB)), [])
+        # The window of chunks is bounded to not read the
+        # whole container if the caller stops early
+        window = self.jobs * 2
+        futures: Deque[Future] = deque()
+        pool = ThreadPoolExecutor(max_workers=self.jobs)
+        try:
+            for chunk in chunks:
+                futures.append(pool.submit(self.process_chunk, cq, chunk))
+                if len(futures) >= window:
+                    yield from filter(None, futures.popleft().result())
+            while futures:
+                yield from filter(None, futures.popleft().result())
+        finally:
+            for future in futures:
+                future.cancel()
+            pool.shutdown(wait=True)
+
     def execute(self, q: Query) -> Result:
         start_time = time.time()
-        data = []
-        sorting_keys = []
-
-        # Validate once, then execute many times
-        # little optimization
-        if q.filter_expr:
-            self.validate_eval(q.filter_expr)
-        if q.sort_expr:
-            self.validate_eval(q.sort_expr)
-
-        # TODO: meta data is independent, can be highly parallel
-        for meta in self.iterate_over_container(self.container, self.type):
-            full_ctx = Field(meta[0]).to_dict()  # TODO: somehow deal with meta lists
-            ctx = self.select(full_ctx, q.columns)
-
-            if q.filter_expr:
-                result = self.eval_or_none(q.filter_expr, full_ctx)
-                if not result:
-                    continue
-
-            if q.sort_expr:
-                sorting_key = self.eval_or_none(q.sort_expr, full_ctx)
-                sorting_keys.append(sorting_key)
-
-            data.append(ctx)
-
-        if q.sort_expr is not None:
-            # This one sorts the data by the order of sorting_keys
-            # First we make tuples of items and their indices
-            # then we use indices to make sortable elements
-            # we push values containing None to the end by
-            # placing boolean `is None` first
-            data = [
-                item
-                for _, item in sorted(
-                    enumerate(data),
-                    key=lambda i_item: (sorting_keys[i_item[0]] is None, sorting_keys[i_item[0]]),
-                    reverse=q.desc,
-                )
-            ]
 
-        if q.offset is not None:
-            data = data[q.offset:]
+        # Validate and compile once, then execute many times
+        cq = self.compile(q)
+        compiled_time = time.time()
 
-        if q.limit is not None:
-            data = data[: q.limit]
+        rows = self.scan(cq)
+        offset = q.offset if q.offset is not None else 0
+        stop = offset + q.limit if q.limit is not None else None
+
+        if q.sort_expr is None:
+            # Without sorting the reading stops
+            # as soon as enough rows are found
+            data = [ctx for ctx, _ in islice(rows, offset, stop)]
+            scanned_time = time.time()
+        else:
+            # We push values containing None to the end by
+            # placing boolean `is None` first
+            def sorting_key(row: Tuple[Dict[str, Any], Any]) -> Tuple[bool, Any]:
+                return row[1] is None, row[1]
+
+            if stop is not None:
+                # Keeps only top-k rows in memory
+                # both functions are equivalent to sorted(...)[:stop]
+                select = heapq.nlargest if q.desc else heapq.nsmallest
+                top = select(stop, rows, key=sorting_key)
+                scanned_time = time.time()
+            else:
+                rows = list(rows)
+                scanned_time = time.time()
+                top = sorted(rows, key=sorting_key, reverse=q.desc)
+            data = [ctx for ctx, _ in top[offset:]]
 
         end_time = time.time()
         return Result(
-            columns=q.columns, rows=len(data), data=data, time_s=round(end_time - start_time, 4)
+            columns=q.columns,
+            rows=len(data),
+            data=data,
+            time_s=round(end_time - start_time, 4),
+            timings={
+                "compile": round(compiled_time - start_time, 4),
+                "scan": round(scanned_time - compiled_time, 4),
+                "sort": round(end_time - scanned_time, 4),
+            },
         )
 
 
@@ -403,23 +548,30 @@ def render_results(result: Result) -> None:
     click.echo("─" * sum(widths))
     click.echo(render_header(result.columns, widths))
     click.echo("─" * sum(widths))
-    for field in result.data:
-        click.echo(render_row(result.columns, field, widths))
+    for row in result.data:
+        click.echo(render_row(result.columns, row, widths))
     click.echo("─" * sum(widths))
     click.echo(f"Finished: {pendulum.now()}")
     click.echo(f"Returned rows: {result.rows}")
     click.echo(f"Time: {result.time_s}s")
+    if result.timings:
+        click.echo(
+            "Phases: " + ", ".join(f"{name} {t}s" for name, t in result.timings.items())
+        )
 
 
 @click.command("query", context_settings={"ignore_unknown_options": True})
+@click.option(
+    "-j", "--jobs", type=int, default=1, help="The number of threads to read and evaluate meta with"
+)
 @click.argument("args", nargs=-1, type=click.UNPROCESSED)
 @click.pass_context
-def query(ctx, args: List[str]):
+def query(ctx, jobs: int, args: List[str]):
     q = QueryParser().parse(list(args))
 
     if not ctx.obj.get("meta"):
         return
 
-    ex = Executor(ctx.obj["cwd"], ctx.obj["type"])
+    ex = Executor(ctx.obj["cwd"], ctx.obj["type"], jobs=jobs)
     results = ex.execute(q)
     render_results(results)
@@ -28,7 +28,7 @@ from .common import create_container
 @click.option("-p", type=int, default=3, help="Update period in seconds")
 def view_history(ctx, host, port, l, m, p):  # noqa: E741
     if ctx.obj.get("meta"):
-        container = create_container(ctx.obj["type"], ctx.obj["cwd"])
+        container = create_container(ctx.obj["type"], ctx.obj["cwd"], readonly=True)
         if not container:
             click.echo(f"Cannot open History Viewer in object of type `{ctx.obj['type']}`")
             return
@@ -49,14 +49,8 @@ def view_history(ctx, host, port, l, m, p):  # noqa: E741
 @click.option("-x", type=str, multiple=True, help="Metrics or params to exclude")
 def view_metric(ctx, host, port, p, i, x):
     type = ctx.obj["type"]
-    if type == "repo":
-        from ..repos import Repo
-
-        container = Repo(ctx.obj["cwd"])
-    elif type == "line":
-        from ..models import ModelLine
-
-        container = ModelLine(ctx.obj["cwd"])
+    if type in ("repo", "line", "model_line"):
+        container = create_container(type, ctx.obj["cwd"], readonly=True)
     else:
         click.echo(f"Cannot open Metric Viewer in object of type `{type}`")
         return
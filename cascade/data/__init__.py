@@ -21,16 +21,19 @@ limitations under the License.
 
 from .apply_modifier import ApplyModifier
 from .bruteforce_cacher import BruteforceCacher
+from .cached_modifier import CachedModifier, sizeof
 from .composer import Composer
 from .concatenator import Concatenator
 from .cyclic_sampler import CyclicSampler
 from .data_card import Assessor, DataCard, LabelingInfo
+from .data_loader import DataLoader, default_collate
 from .dataset import (BaseDataset, Dataset, IteratorDataset, IteratorWrapper,
-                      SizedDataset, T, Wrapper)
+                      SizedDataset, T, Wrapper, batch_items)
 from .filter import Filter, IteratorFilter
 from .folder_dataset import FolderDataset
 from .functions import dataset, modifier
 from .modifier import BaseModifier, IteratorModifier, Modifier, Sampler
+from .parallel_apply_modifier import ParallelApplyModifier
 from .pickler import Pickler
 from .random_sampler import RandomSampler
 from .range_sampler import RangeSampler
@@ -15,18 +15,69 @@ limitations under the License.
 """
 
 import random
-from typing import Any, Callable, Iterator, Optional
+from typing import Any, Callable, Iterator, List, Optional, Sequence
 
-from .dataset import T
+import numpy as np
+
+from ..base import Meta
+from .dataset import Dataset, T, batch_items
 from .modifier import Modifier
 from .utils import DatasetOrIterator
 
+# The number of items that batched mode gets from the
+# previous dataset at once when iterating over it
+ITER_BATCH_SIZE = 256
+
+
+def _merge(batch: Any, mask: np.ndarray, result: Any) -> Any:
+    positions = np.flatnonzero(mask)
+    if isinstance(batch, np.ndarray) and isinstance(result, np.ndarray):
+        if result.shape[1:] == batch.shape[1:]:
+            merged = batch.astype(np.result_type(batch, result), copy=True)
+            merged[positions] = result
+            return merged
+    elif hasattr(batch, "iloc") and hasattr(result, "iloc"):
+        merged = batch.copy()
+        merged.iloc[positions] = result.to_numpy()
+        return merged
+
+    # Rows changed their shape or type, so they
+    # cannot be put back into the same container
+    merged = list(batch_items(batch))
+    for pos, item in zip(positions, batch_items(result)):
+        merged[pos] = item
+    return merged
+
+
+def _check_batch(batch: Any, result: Any, n: int) -> Any:
+    # Batched function that treats the batch as a whole
+    # may return a different number of items without an error
+    if not hasattr(result, "__len__") or len(result) != n:
+        size = len(result) if hasattr(result, "__len__") else "no"
+        raise ValueError(
+            f"Batched function should return one result per item, it got {type(batch).__name__}"
+            f" of {n} items and returned {type(result).__name__} with {size} items. Note that"
+            " the type of the batch depends on the previous dataset and may be a list"
+        )
+    return result
+
+
+def _select(batch: Any, mask: np.ndarray) -> Any:
+    if isinstance(batch, np.ndarray):
+        return batch[mask]
+    if hasattr(batch, "iloc"):
+        return batch.iloc[np.flatnonzero(mask)]
+    return [item for item, m in zip(batch, mask) if m]
+
 
 class ApplyModifier(Modifier[T]):
     """
     Modifier that applies a function to given dataset's items in each __getitem__ call.
 
     Can be applied to Iterators too.
+
+    In batched mode ``func`` is applied to whole batches instead of items,
+    which allows to transform arrays and tables with vectorized operations.
     """
 
     def __init__(
@@ -36,6 +87,7 @@ class ApplyModifier(Modifier[T]):
         p: Optional[float] = None,
         seed: Optional[int] = None,
         *args: Any,
+        batched: bool = False,
         **kwargs: Any,
     ) -> None:
         """
@@ -49,7 +101,15 @@ class ApplyModifier(Modifier[T]):
         p: Optional[float], by default None
             The probability [0, 1] with which to apply `func`
         seed: Optional[int], by default None
-            Random seed is used when p is not None
+            Random seed is used when p is not None. Every modifier has its own
+            random generator, if seed is None it is seeded from the global ``random``
+        batched: bool, by default False
+            If True, ``func`` receives a batch of items - what ``get_batch``
+            of the previous dataset returns, a stacked array for arrays, a table for
+            tables or a list, and should return the batch of results of the same length,
+            otherwise ``ValueError`` is raised.
+            When ``p`` is given, the mask of items is drawn at once and ``func``
+            receives only the selected items.
 
         Examples
         --------
@@ -60,31 +120,79 @@ class ApplyModifier(Modifier[T]):
         Now function will only be applied when items are retrieved
 
         >>> assert [item for item in ds] == [0, 1, 4, 9, 16]
+
+        In batched mode the function is applied to arrays
+
+        >>> import numpy as np
+        >>> ds = cdd.Wrapper(np.random.rand(1000, 3))
+        >>> ds = cdd.ApplyModifier(ds, lambda x: x * 2, p=0.5, batched=True)
+        >>> batch = ds.get_batch(list(range(100)))
         """
         super().__init__(dataset, *args, **kwargs)
         self._func = func
         self._p = p
-        if seed is not None:
-            random.seed(seed)
+        self._batched = batched
+        if seed is None:
+            seed = random.getrandbits(64)
+        self._random = random.Random(seed)
+        self._rng = np.random.default_rng(seed)
 
-    def __getitem__(self, index: int) -> Any:
-        item = self._dataset[index]
+    def _apply(self, item: T) -> Any:
         if self._p is not None:
-            rnd = random.random()
+            rnd = self._random.random()
             if rnd > self._p:
                 return item
-            else:
-                return self._func(item)
-        else:
-            return self._func(item)
+        return self._func(item)
+
+    def _call_batched(self, batch: Any) -> Any:
+        return _check_batch(batch, self._func(batch), len(batch))
+
+    def _apply_batch(self, batch: Any) -> Any:
+        if self._p is None:
+            return self._call_batched(batch)
+
+        # The same condition as for single items
+        mask = self._rng.random(len(batch)) <= self._p
+        if mask.all():
+            return self._call_batched(batch)
+        if not mask.any():
+            return batch
+        return _merge(batch, mask, self._call_batched(_select(batch, mask)))
+
+    def __getitem__(self, index: int) -> Any:
+        if self._batched:
+            return batch_items(self.get_batch([index]))[0]
+        return self._apply(self._dataset[index])
+
+    def get_batch(self, indices: Sequence[int]) -> Sequence[Any]:
+        batch = self._dataset.get_batch(indices)
+        if self._batched:
+            return self._apply_batch(batch)
+        return [self._apply(item) for item in batch_items(batch)]
 
     def __iter__(self) -> Iterator[T]:
+        if not self._batched:
+            for item in self._dataset:
+                yield self._apply(item)
+            return
+
+        if isinstance(self._dataset, (Dataset, Modifier)):
+            for start in range(0, len(self._dataset), ITER_BATCH_SIZE):
+                indices = range(start, min(start + ITER_BATCH_SIZE, len(self._dataset)))
+                yield from batch_items(self._apply_batch(self._dataset.get_batch(indices)))
+            return
+
+        chunk: List[Any] = []
         for item in self._dataset:
-            if self._p is not None:
-                rnd = random.random()
-                if rnd > self._p:
-                    yield item
-                else:
-                    yield self._func(item)
-            else:
-                yield self._func(item)
+            chunk.append(item)
+            if len(chunk) == ITER_BATCH_SIZE:
+                yield from batch_items(self._apply_batch(chunk))
+                chunk = []
+        if chunk:
+            yield from batch_items(self._apply_batch(chunk))
+
+    def get_meta(self) -> Meta:
+        meta = super().get_meta()
+        meta[0]["p"] = self._p
+        meta[0]["batched"] = self._batched
+        return meta
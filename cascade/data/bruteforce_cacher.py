@@ -51,6 +51,8 @@ class BruteforceCacher(Modifier[T]):
     See also
     --------
     cascade.data.Pickler
+    cascade.data.CachedModifier
+        Caches items lazily with a bounded memory
     """
 
     def __init__(self, dataset: BaseDataset[T], *args: Any, **kwargs: Any) -> None:
@@ -0,0 +1,299 @@
+"""
+Copyright 2022-2025 Ilia Moiseev
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from typing_extensions import Literal
+
+from ..base import Meta
+from .dataset import Dataset, T, batch_items, normalize_indices
+from .modifier import Modifier
+
+
+def sizeof(item: Any) -> int:
+    """
+    Approximate size of an item in bytes. Counts the data of numpy arrays
+    and tables, for other objects only the size of the object itself
+    without the objects it refers to.
+    """
+    if isinstance(item, np.ndarray):
+        return item.nbytes
+    if hasattr(item, "memory_usage"):
+        usage = item.memory_usage(deep=True)
+        return int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+    if isinstance(item, (tuple, list)):
+        return sys.getsizeof(item) + sum(sizeof(x) for x in item)
+    return sys.getsizeof(item)
+
+
+def _empty_like(batch: Any) -> Any:
+    # Keeps only the type of the batch, for example dtype and shape
+    # of the rows of arrays or columns of tables
+    if isinstance(batch, np.ndarray):
+        return batch[:0]
+    if hasattr(batch, "iloc"):
+        return batch.iloc[:0]
+    return None
+
+
+def _make_batch(template: Any, items: List[Any]) -> Any:
+    # Puts cached and new items into the same container
+    # as get_batch of the previous dataset returns
+    if isinstance(template, np.ndarray):
+        return np.stack(items) if items else template
+    if hasattr(template, "iloc"):
+        import pandas as pd
+
+        if not items:
+            return template
+        return pd.DataFrame(items, columns=template.columns).astype(template.dtypes)
+    return items
+
+
+class CachedModifier(Modifier[T]):
+    """
+    Remembers items of the previous dataset when they are requested for the first time.
+    When the cache is full, evicts the least recently used or the least frequently
+    used items, so repeated access to an expensive pipeline costs memory
+    proportional to the working set and not to the whole dataset.
+
+    Can be used from several threads.
+
+    ``get_batch`` returns batches of the same type as the previous dataset:
+    arrays are stacked and tables are made again from the cached rows.
+
+    Example
+    -------
+    >>> from cascade import data as cdd
+    >>> ds = cdd.ApplyModifier(cdd.Wrapper(paths), load_image)
+    >>> ds = cdd.CachedModifier(ds, max_bytes=2 * 2**30)
+    >>> ds = cdd.RandomSampler(ds, 100000)
+    >>> ds.get_meta()[1]["hit_rate"]
+
+    See also
+    --------
+    cascade.data.BruteforceCacher
+    """
+
+    def __init__(
+        self,
+        dataset: Dataset[T],
+        *args: Any,
+        max_items: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        policy: Literal["lru", "lfu"] = "lru",
+        size_fn: Optional[Callable[[Any], int]] = None,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        dataset : Dataset[T]
+            A dataset to cache
+        max_items : Optional[int], optional
+            The number of items to keep
+        max_bytes : Optional[int], optional
+            The size of items to keep in bytes. Items bigger than that are not cached
+        policy : Literal["lru", "lfu"], optional
+            Which items to evict first - least recently used or least frequently used
+            where ties are broken by recency, by default "lru"
+        size_fn : Optional[Callable[[Any], int]], optional
+            Returns the size of an item in bytes, by default ``cascade.data.sizeof``.
+            Used only with ``max_bytes``
+
+        If neither ``max_items`` nor ``max_bytes`` is set, the cache is not bounded.
+        """
+        if max_items is not None and max_items < 1:
+            raise ValueError(f"max_items should be positive, got {max_items}")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError(f"max_bytes should be positive, got {max_bytes}")
+        if policy not in ("lru", "lfu"):
+            raise ValueError(f"policy should be lru or lfu, got {policy}")
+
+        super().__init__(dataset, *args, **kwargs)
+        self._max_items = max_items
+        self._max_bytes = max_bytes
+        self._policy = policy
+        self._size_fn = size_fn if size_fn is not None else sizeof
+
+        self._lock = threading.RLock()
+        # Index -> (item, size, frequency)
+        self._items: Dict[int, Tuple[Any, int, int]] = {}
+        # Frequency -> indices in order of use, only one bucket for lru
+        self._buckets: Dict[int, "OrderedDict[int, None]"] = {}
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        # Empty batch of the previous dataset to make batches of the same type
+        self._template: Any = None
+        self._template_known = False
+
+    def _key(self, index: Any) -> Optional[int]:
+        if not isinstance(index, (int, np.integer)):
+            return None
+        index = int(index)
+        return index + len(self) if index < 0 else index
+
+    def _bucket(self, freq: int) -> int:
+        return freq if self._policy == "lfu" else 0
+
+    def _lookup(self, key: int) -> Tuple[bool, Any]:
+        # Should be called under the lock
+        entry = self._items.get(key)
+        if entry is None:
+            self._misses += 1
+            return False, None
+
+        self._hits += 1
+        item, size, freq = entry
+        bucket = self._bucket(freq)
+        if self._policy == "lfu":
+            del self._buckets[bucket][key]
+            if not self._buckets[bucket]:
+                del self._buckets[bucket]
+            freq += 1
+            self._buckets.setdefault(freq, OrderedDict())[key] = None
+            self._items[key] = (item, size, freq)
+        else:
+            self._buckets[bucket].move_to_end(key)
+        return True, item
+
+    def _evict(self) -> None:
+        bucket = min(self._buckets) if self._policy == "lfu" else 0
+        key, _ = self._buckets[bucket].popitem(last=False)
+        if not self._buckets[bucket]:
+            del self._buckets[bucket]
+        _, size, _ = self._items.pop(key)
+        self._bytes -= size
+        self._evictions += 1
+
+    def _full(self, size: int) -> bool:
+        if self._max_items is not None and len(self._items) + 1 > self._max_items:
+            return True
+        if self._max_bytes is not None and self._bytes + size > self._max_bytes:
+            return True
+        return False
+
+    def _size(self, item: Any) -> int:
+        return self._size_fn(item) if self._max_bytes is not None else 0
+
+    def _store(self, key: int, item: Any, size: int) -> None:
+        # Should be called under the lock
+        if key in self._items:
+            # Was stored by another thread in the meantime
+            return
+        if self._max_bytes is not None and size > self._max_bytes:
+            return
+        while self._items and self._full(size):
+            self._evict()
+        self._items[key] = (item, size, 1)
+        self._buckets.setdefault(self._bucket(1), OrderedDict())[key] = None
+        self._bytes += size
+
+    def __getitem__(self, index: Any) -> T:
+        key = self._key(index)
+        if key is None:
+            return self._dataset[index]
+
+        with self._lock:
+            found, item = self._lookup(key)
+        if found:
+            return item
+
+        # Reads outside of the lock to not to block other threads
+        item = self._dataset[index]
+        size = self._size(item)
+        with self._lock:
+            self._store(key, item, size)
+        return item
+
+    def _remember_template(self, batch: Any) -> None:
+        if not self._template_known:
+            self._template = _empty_like(batch)
+            self._template_known = True
+
+    def get_batch(self, indices: Sequence[int]) -> Sequence[T]:
+        keys = normalize_indices(indices, len(self)).tolist()
+        result: List[Any] = [None] * len(keys)
+        missing: List[int] = []
+        with self._lock:
+            for pos, key in enumerate(keys):
+                found, item = self._lookup(key)
+                if found:
+                    result[pos] = item
+                else:
+                    missing.append(pos)
+
+        if not missing:
+            if not self._template_known and keys:
+                # All items were cached by __getitem__,
+                # the type of batches is not known yet
+                self._remember_template(self._dataset.get_batch(keys[:1]))
+            return _make_batch(self._template, result)
+
+        batch = self._dataset.get_batch([keys[pos] for pos in missing])
+        self._remember_template(batch)
+        items = batch_items(batch)
+        sizes = [self._size(item) for item in items]
+        with self._lock:
+            for pos, item, size in zip(missing, items, sizes):
+                result[pos] = item
+                self._store(keys[pos], item, size)
+        if len(missing) == len(keys):
+            return batch
+        return _make_batch(self._template, result)
+
+    def clear(self) -> None:
+        """
+        Removes all items from the cache. Statistics are kept.
+        """
+        with self._lock:
+            self._items.clear()
+            self._buckets.clear()
+            self._bytes = 0
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    def get_meta(self) -> Meta:
+        meta = super().get_meta()
+        with self._lock:
+            requests = self._hits + self._misses
+            meta[0].update(
+                {
+                    "policy": self._policy,
+                    "max_items": self._max_items,
+                    "max_bytes": self._max_bytes,
+                    "cached_items": len(self._items),
+                    "cached_bytes": self._bytes if self._max_bytes is not None else None,
+                    "hits": self._hits,
+                    "misses": self._misses,
+                    "evictions": self._evictions,
+                    "hit_rate": self._hits / requests if requests else None,
+                }
+            )
+        return meta
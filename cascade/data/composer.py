@@ -14,10 +14,10 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-from typing import Any, List, Tuple
+from typing import Any, List, Sequence, Tuple
 
 from ..base import Meta
-from .dataset import Dataset, T
+from .dataset import Dataset, T, batch_items
 
 
 class Composer(Dataset[T]):
@@ -59,6 +59,10 @@ class Composer(Dataset[T]):
     def __getitem__(self, index: int) -> Tuple[T]:
         return tuple(ds[index] for ds in self._datasets)
 
+    def get_batch(self, indices: Sequence[int]) -> Sequence[Tuple[T]]:
+        batches = [batch_items(ds.get_batch(indices)) for ds in self._datasets]
+        return list(zip(*batches))
+
     def __len__(self) -> int:
         return self._len
 
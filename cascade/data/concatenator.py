@@ -14,12 +14,12 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-from typing import Any, List
+from typing import Any, List, Sequence
 
 import numpy as np
 
 from ..base import Meta
-from .dataset import Dataset, T
+from .dataset import Dataset, T, batch_items, normalize_indices
 
 
 class Concatenator(Dataset[T]):
@@ -50,12 +50,31 @@ class Concatenator(Dataset[T]):
         super().__init__(*args, **kwargs)
 
     def __getitem__(self, index: int) -> T:
+        if index < 0:
+            index += len(self)
         ds_index = 0
         for sh in self._shifts[1:]:
             if index >= sh:
                 ds_index += 1
         return self._datasets[ds_index][index - self._shifts[ds_index]]
 
+    def get_batch(self, indices: Sequence[int]) -> Sequence[T]:
+        idx = normalize_indices(indices, len(self))
+        ds_indices = np.searchsorted(self._shifts, idx, side="right") - 1
+        local = idx - self._shifts[ds_indices]
+
+        if len(idx) > 0 and (ds_indices == ds_indices[0]).all():
+            # The whole batch is from one dataset
+            return self._datasets[ds_indices[0]].get_batch(local)
+
+        items: List[Any] = [None] * len(idx)
+        for ds_index in np.unique(ds_indices):
+            positions = np.flatnonzero(ds_indices == ds_index)
+            batch = batch_items(self._datasets[ds_index].get_batch(local[positions]))
+            for pos, item in zip(positions, batch):
+                items[pos] = item
+        return items
+
     def __len__(self) -> int:
         """
         Length of Concatenator is a sum of lengths of its datasets
@@ -14,7 +14,9 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-from typing import Iterator
+from typing import Iterator, Sequence
+
+import numpy as np
 
 from .dataset import T
 from .modifier import Sampler
@@ -36,6 +38,9 @@ class CyclicSampler(Sampler[T]):
         internal_index = index % len(self._dataset)
         return self._dataset[internal_index]
 
+    def get_batch(self, indices: Sequence[int]) -> Sequence[T]:
+        return self._dataset.get_batch(np.asarray(indices, dtype=np.int64) % len(self._dataset))
+
     def __iter__(self) -> Iterator[T]:
         for index in range(super().__len__()):
             yield self.__getitem__(index)
@@ -0,0 +1,290 @@
+"""
+Copyright 2022-2025 Ilia Moiseev
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from collections import deque
+from concurrent.futures import (FIRST_COMPLETED, Executor, Future,
+                                ProcessPoolExecutor, ThreadPoolExecutor, wait)
+from typing import (Any, Callable, Deque, Dict, Iterable, Iterator, List,
+                    Optional, Sequence, Set, Union)
+
+import numpy as np
+from typing_extensions import Literal
+
+from ..base import Meta
+from .dataset import BaseDataset, Dataset, T, Wrapper, batch_items
+from .modifier import Modifier
+
+# Dataset and collate function of the process,
+# sent once when a worker process starts
+_worker_state: Dict[str, Any] = {}
+
+
+def default_collate(batch: Sequence[Any]) -> Any:
+    """
+    Makes a batch from the list of items. Numpy arrays of the same
+    shape are stacked into one contiguous array, numbers become an array,
+    tuples and dicts are collated field by field. Anything else
+    is returned as a list.
+
+    Batches that are already made by ``get_batch`` of a dataset like
+    arrays or tables are returned as is, arrays are made contiguous.
+    """
+    if isinstance(batch, np.ndarray):
+        return np.ascontiguousarray(batch)
+    if not isinstance(batch, list):
+        return batch
+    first = batch[0]
+    if isinstance(first, np.ndarray):
+        try:
+            return np.stack(batch)
+        except ValueError:
+            # Different shapes
+            return batch
+    if isinstance(first, (int, float, np.number)):
+        return np.array(batch)
+    if isinstance(first, dict):
+        return {key: default_collate([item[key] for item in batch]) for key in first}
+    if isinstance(first, tuple):
+        return tuple(default_collate(list(field)) for field in zip(*batch))
+    return batch
+
+
+def _fetch(dataset: Dataset[Any], indices: List[int], collate_fn: Callable) -> Any:
+    batch = dataset.get_batch(indices)
+    if collate_fn is default_collate or isinstance(batch, list):
+        return collate_fn(batch)
+    return collate_fn(list(batch_items(batch)))
+
+
+def _init_worker(dataset: Dataset[Any], collate_fn: Callable) -> None:
+    _worker_state["dataset"] = dataset
+    _worker_state["collate_fn"] = collate_fn
+
+
+def _fetch_in_worker(indices: List[int]) -> Any:
+    return _fetch(_worker_state["dataset"], indices, _worker_state["collate_fn"])
+
+
+class DataLoader(Modifier[T]):
+    """
+    Makes batches from a dataset. Items of the batches are read in worker threads
+    or processes ahead of time while the previous batches are used.
+    Every batch is read with one ``get_batch`` call of the dataset.
+
+    The loader itself is a dataset of batches, so it keeps the meta of the
+    whole pipeline and can be linked to models and lines.
+
+    Example
+    -------
+    >>> from cascade.data import DataLoader
+    >>> dl = DataLoader([0, 1, 2, 3, 4], batch_size=2)
+    >>> [batch.tolist() for batch in dl]
+    [[0, 1], [2, 3], [4]]
+    >>> dl = DataLoader(ds, batch_size=32, shuffle=True, workers=4)
+    >>> for x, y in dl:
+    ...     model.fit(x, y)
+    """
+
+    def __init__(
+        self,
+        dataset: Union[Dataset[T], Sequence[T]],
+        batch_size: int = 1,
+        *args: Any,
+        shuffle: bool = False,
+        sampler: Optional[Iterable[int]] = None,
+        drop_last: bool = False,
+        collate_fn: Optional[Callable[[List[T]], Any]] = None,
+        workers: int = 0,
+        backend: Literal["thread", "process"] = "thread",
+        prefetch: int = 2,
+        ordered: bool = True,
+        seed: Optional[int] = None,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        dataset : Union[Dataset[T], Sequence[T]]
+            Dataset or any sequence to make batches from
+        batch_size : int, optional
+            The number of items in a batch, by default 1
+        shuffle : bool, optional
+            Whether to read items in a new random order on each iteration, by default False
+        sampler : Iterable[int], optional
+            The indices of items in the order they should be read. It is iterated
+            on each iteration over the loader. Cannot be used with ``shuffle``
+        drop_last : bool, optional
+            Whether to skip the last batch if it is smaller than ``batch_size``, by default False
+        collate_fn : Callable[[List[T]], Any], optional
+            Makes a batch from a list of items, by default ``default_collate``
+            which stacks numpy arrays. Pass ``list`` to get lists of items
+        workers : int, optional
+            The number of workers that read batches, by default 0 which means
+            that batches are read in the calling thread when requested
+        backend : Literal["thread", "process"], optional
+            Threads are cheap and good for IO and code that releases the GIL like
+            image decoding. Processes are for the pure Python code, the dataset and
+            ``collate_fn`` should be picklable then. By default "thread"
+        prefetch : int, optional
+            How many batches each worker reads ahead, by default 2
+        ordered : bool, optional
+            Whether batches are returned in the order of indices, by default True.
+            If False, batches are returned as soon as they are ready
+        seed : int, optional
+            Seed of the shuffling
+        """
+        if batch_size < 1:
+            raise ValueError(f"Batch size should be positive, got {batch_size}")
+        if shuffle and sampler is not None:
+            raise ValueError("shuffle and sampler cannot be used together")
+        if workers < 0:
+            raise ValueError(f"The number of workers cannot be negative, got {workers}")
+        if prefetch < 1:
+            raise ValueError(f"prefetch should be positive, got {prefetch}")
+        if backend not in ("thread", "process"):
+            raise ValueError(f"backend should be thread or process, got {backend}")
+
+        if not isinstance(dataset, BaseDataset):
+            dataset = Wrapper(dataset)
+        super().__init__(dataset, *args, **kwargs)
+
+        self._batch_size = batch_size
+        self._shuffle = shuffle
+        self._sampler = sampler
+        self._drop_last = drop_last
+        self._collate_fn = collate_fn if collate_fn is not None else default_collate
+        self._workers = workers
+        self._backend = backend
+        self._prefetch = prefetch
+        self._ordered = ordered
+        self._rng = np.random.default_rng(seed)
+        self._order = self._new_order()
+
+    def _new_order(self) -> Sequence[int]:
+        if self._sampler is not None:
+            return list(self._sampler)
+        if self._shuffle:
+            return self._rng.permutation(len(self._dataset)).tolist()
+        return range(len(self._dataset))
+
+    def _batch_indices(self, order: Sequence[int], index: int) -> List[int]:
+        return list(order[index * self._batch_size:(index + 1) * self._batch_size])
+
+    def _num_batches(self, n: int) -> int:
+        if self._drop_last:
+            return n // self._batch_size
+        return (n + self._batch_size - 1) // self._batch_size
+
+    def __len__(self) -> int:
+        return self._num_batches(len(self._order))
+
+    def __getitem__(self, index: int) -> Any:
+        """
+        Returns the batch with the index in the order of the last iteration
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"Batch {index} is out of range of {len(self)} batches")
+        return _fetch(self._dataset, self._batch_indices(self._order, index), self._collate_fn)
+
+    def __iter__(self) -> Iterator[Any]:
+        # Every pass over the data is a new epoch with its own order
+        order = self._order = self._new_order()
+        batches = (self._batch_indices(order, i) for i in range(self._num_batches(len(order))))
+
+        if self._workers == 0:
+            for indices in batches:
+                yield _fetch(self._dataset, indices, self._collate_fn)
+            return
+
+        pool = self._make_pool()
+        # Not more than this number of batches
+        # are in memory at the same time
+        window = self._workers * self._prefetch
+        try:
+            if self._ordered:
+                yield from self._iter_ordered(pool, batches, window)
+            else:
+                yield from self._iter_unordered(pool, batches, window)
+        finally:
+            pool.shutdown(wait=True)
+
+    def _make_pool(self) -> Executor:
+        if self._backend == "process":
+            # The dataset is sent once per worker and not with every batch
+            return ProcessPoolExecutor(
+                max_workers=self._workers,
+                initializer=_init_worker,
+                initargs=(self._dataset, self._collate_fn),
+            )
+        return ThreadPoolExecutor(max_workers=self._workers)
+
+    def _submit(self, pool: Executor, indices: List[int]) -> Future:
+        if self._backend == "process":
+            return pool.submit(_fetch_in_worker, indices)
+        return pool.submit(_fetch, self._dataset, indices, self._collate_fn)
+
+    def _iter_ordered(
+        self, pool: Executor, batches: Iterator[List[int]], window: int
+    ) -> Iterator[Any]:
+        futures: Deque[Future] = deque()
+        try:
+            for indices in batches:
+                futures.append(self._submit(pool, indices))
+                if len(futures) >= window:
+                    yield futures.popleft().result()
+            while futures:
+                yield futures.popleft().result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def _iter_unordered(
+        self, pool: Executor, batches: Iterator[List[int]], window: int
+    ) -> Iterator[Any]:
+        pending: Set[Future] = set()
+        try:
+            for indices in batches:
+                pending.add(self._submit(pool, indices))
+                if len(pending) >= window:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def get_meta(self) -> Meta:
+        meta = super().get_meta()
+        meta[0].update(
+            {
+                "batch_size": self._batch_size,
+                "shuffle": self._shuffle,
+                "sampler": repr(self._sampler) if self._sampler is not None else None,
+                "drop_last": self._drop_last,
+                "collate_fn": getattr(self._collate_fn, "__name__", repr(self._collate_fn)),
+                "workers": self._workers,
+                "backend": self._backend,
+                "prefetch": self._prefetch,
+                "ordered": self._ordered,
+            }
+        )
+        return meta
@@ -13,15 +13,48 @@ limitations under the License.
 
 import warnings
 from abc import ABC, abstractmethod
+from operator import itemgetter
 from typing import (Any, Generic, Iterable, Iterator, Optional, Sequence,
                     Sized, TypeVar)
 
+import numpy as np
+
 from ..base import Meta, Traceable
 from .data_card import DataCard
 
 T = TypeVar("T", covariant=True)
 
 
+def normalize_indices(indices: Sequence[int], length: int) -> np.ndarray:
+    """
+    Turns indices of a batch into an integer array, resolving
+    negative indices as ``__getitem__`` of a list does
+
+    Raises
+    ------
+    IndexError
+        If any of indices is out of range
+    """
+    idx = np.asarray(indices, dtype=np.int64)
+    if idx.ndim != 1:
+        raise IndexError(f"Indices of a batch should be one-dimensional, got shape {idx.shape}")
+    if len(idx) == 0:
+        return idx
+    if idx.min() < -length or idx.max() >= length:
+        raise IndexError(f"Indices of a batch are out of range of {length} items")
+    return np.where(idx < 0, idx + length, idx)
+
+
+def batch_items(batch: Any) -> Sequence[Any]:
+    """
+    Returns the batch made by ``get_batch`` as a sequence of its items.
+    Tables are split back into rows, any other batch is returned as is.
+    """
+    if hasattr(batch, "iloc"):
+        return [batch.iloc[i] for i in range(len(batch))]
+    return batch
+
+
 class BaseDataset(ABC, Generic[T], Traceable):
     """
     Base class of any object that constitutes a step in a data-pipeline
@@ -90,6 +123,31 @@ class Dataset(BaseDataset[T], Sized):
         for i in range(len(self)):
             yield self.__getitem__(i)
 
+    def get_batch(self, indices: Sequence[int]) -> Sequence[T]:
+        """
+        Returns items with given indices at once.
+
+        By default calls ``__getitem__`` for every index. Datasets that
+        can do better, for example with fancy indexing of an array, override
+        this to read the whole batch in a few vectorized calls.
+
+        Parameters
+        ----------
+        indices : Sequence[int]
+            Indices of items in the order they should be returned
+
+        Returns
+        -------
+        Sequence[T]
+            Items in the order of indices. A list by default, datasets backed by arrays
+            return an array and tables return a table, where the first axis is the items.
+            Use ``cascade.data.batch_items`` to get a sequence of items from any batch.
+        """
+        if isinstance(indices, np.ndarray):
+            # Items are requested with Python ints as in __getitem__ calls
+            indices = indices.tolist()
+        return [self.__getitem__(i) for i in indices]
+
     def get_meta(self) -> Meta:
         meta = super().get_meta()
         meta[0]["len"] = len(self)
@@ -127,6 +185,15 @@ class Wrapper(Dataset):
     def __getitem__(self, index: Any) -> T:
         return self._data[index]
 
+    def get_batch(self, indices: Sequence[int]) -> Sequence[T]:
+        if isinstance(self._data, np.ndarray):
+            return self._data[np.asarray(indices, dtype=np.int64)]
+        if len(indices) == 0:
+            return []
+        if len(indices) == 1:
+            return [self._data[indices[0]]]
+        return list(itemgetter(*indices)(self._data))
+
     def __len__(self) -> int:
         return len(self._data)
 
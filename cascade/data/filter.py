@@ -14,9 +14,11 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-from typing import Any, Callable
+from typing import Any, Callable, Sequence
 
-from .dataset import Dataset, IteratorDataset
+import numpy as np
+
+from .dataset import Dataset, IteratorDataset, normalize_indices
 from .modifier import IteratorModifier, Sampler
 
 
@@ -52,10 +54,15 @@ class Filter(Sampler):
                     self._mask.append(i)
             except Exception as e:
                 raise RuntimeError(f"Error when filtering dataset on index: {i}") from e
+        self._mask = np.asarray(self._mask, dtype=np.int64)
         super().__init__(dataset, len(self._mask), *args, **kwargs)
 
     def __getitem__(self, index: Any):
-        return self._dataset[self._mask[index]]
+        # Upstream datasets may accept only Python ints
+        return self._dataset[int(self._mask[index])]
+
+    def get_batch(self, indices: Sequence[int]) -> Sequence[Any]:
+        return self._dataset.get_batch(self._mask[normalize_indices(indices, len(self))])
 
 
 class IteratorFilter(IteratorModifier):
@@ -1,4 +1,6 @@
-from typing import Any, Iterator
+from typing import Any, Iterator, Sequence
+
+import numpy as np
 
 from ..base import Meta
 from .dataset import BaseDataset, Dataset, IteratorDataset, T
@@ -93,6 +95,13 @@ class Modifier(BaseModifier[T]):
     def __getitem__(self, index: Any) -> T:
         return self._dataset[index]
 
+    def get_batch(self, indices: Sequence[int]) -> Sequence[T]:
+        # Passes the batch through if items are not changed,
+        # modifiers that override __getitem__ read item by item
+        if type(self).__getitem__ is Modifier.__getitem__:
+            return self._dataset.get_batch(indices)
+        return [self.__getitem__(i) for i in np.asarray(indices).tolist()]
+
     def __len__(self) -> int:
         return len(self._dataset)
 
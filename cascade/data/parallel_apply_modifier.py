@@ -0,0 +1,334 @@
+"""
+Copyright 2022-2025 Ilia Moiseev
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+import pickle
+import threading
+import time
+import warnings
+from collections import deque
+from concurrent.futures import (FIRST_COMPLETED, Executor, Future,
+                                ProcessPoolExecutor, ThreadPoolExecutor, wait)
+from typing import (Any, Callable, Deque, Dict, Iterator, List, Optional,
+                    Sequence, Set, Tuple)
+
+import numpy as np
+from typing_extensions import Literal
+
+from ..base import Meta
+from .apply_modifier import ApplyModifier, _check_batch, _merge, _select
+from .dataset import Dataset, T, batch_items
+from .modifier import Modifier
+from .utils import DatasetOrIterator
+
+# Function of the process, sent once when a worker process starts
+_worker_state: Dict[str, Any] = {}
+
+
+def _run(func: Callable, items: Any, batched: bool) -> Any:
+    if batched:
+        return func(items)
+    return [func(item) for item in items]
+
+
+def _init_worker(func: Callable) -> None:
+    _worker_state["func"] = func
+
+
+def _run_in_worker(items: Any, batched: bool) -> Any:
+    return _run(_worker_state["func"], items, batched)
+
+
+def _concat(parts: List[Any]) -> Any:
+    if len(parts) == 1:
+        return parts[0]
+    if all(isinstance(part, np.ndarray) for part in parts):
+        return np.concatenate(parts)
+    if all(hasattr(part, "iloc") for part in parts):
+        import pandas as pd
+
+        return pd.concat(parts)
+    items: List[Any] = []
+    for part in parts:
+        items.extend(batch_items(part))
+    return items
+
+
+def _slice(batch: Any, start: int, stop: int) -> Any:
+    if hasattr(batch, "iloc"):
+        return batch.iloc[start:stop]
+    return batch[start:stop]
+
+
+class ParallelApplyModifier(ApplyModifier[T]):
+    """
+    ApplyModifier that evaluates ``func`` in a pool of worker processes or threads.
+    Useful for expensive functions like tokenization, image resizing
+    or feature extraction.
+
+    Items are read from the previous dataset in the calling thread and sent to
+    workers in chunks, so only ``func`` should be picklable for the process backend.
+    If it is not, for example it is a lambda, the threads are used with a warning.
+
+    ``__getitem__`` applies ``func`` in the calling thread, parallel are ``get_batch``
+    and iteration.
+
+    The pool is started on the first use and lives until ``close`` is called.
+
+    Example
+    -------
+    >>> from cascade.data import ParallelApplyModifier, Wrapper
+    >>> ds = Wrapper(texts)
+    >>> ds = ParallelApplyModifier(ds, tokenize, workers=8, chunk_size=128)
+    >>> tokens = [item for item in ds]
+    >>> ds.close()
+
+    See also
+    --------
+    cascade.data.ApplyModifier
+    """
+
+    def __init__(
+        self,
+        dataset: DatasetOrIterator[T],
+        func: Callable[[T], Any],
+        p: Optional[float] = None,
+        seed: Optional[int] = None,
+        *args: Any,
+        workers: Optional[int] = None,
+        backend: Literal["process", "thread"] = "process",
+        chunk_size: int = 64,
+        ordered: bool = True,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        dataset: Dataset
+            A dataset to modify
+        func: Callable
+            A function to be applied to every item or to every chunk if ``batched``
+        p: Optional[float], by default None
+            The probability [0, 1] with which to apply `func`
+        seed: Optional[int], by default None
+            Random seed is used when p is not None
+        workers: Optional[int], by default None
+            The number of workers, by default the number of CPUs
+        backend: Literal["process", "thread"], by default "process"
+            Processes are for the pure Python functions,
+            threads are for the functions that release the GIL like numpy or IO
+        chunk_size: int, by default 64
+            The number of items sent to a worker at once
+        ordered: bool, by default True
+            Whether iteration returns items in the order of the previous dataset.
+            If False, chunks are returned as soon as they are ready.
+            ``get_batch`` is always ordered
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError(f"The number of workers should be positive, got {workers}")
+        if chunk_size < 1:
+            raise ValueError(f"Chunk size should be positive, got {chunk_size}")
+        if backend not in ("process", "thread"):
+            raise ValueError(f"backend should be process or thread, got {backend}")
+
+        super().__init__(dataset, func, p, seed, *args, **kwargs)
+
+        if backend == "process":
+            try:
+                pickle.dumps(func)
+            except (pickle.PicklingError, AttributeError, TypeError) as e:
+                warnings.warn(
+                    f"Function {func} cannot be sent to worker processes, threads are used"
+                    f" instead. Define it on the module level to use processes.\n{e}"
+                )
+                backend = "thread"
+
+        self._workers = workers
+        self._backend = backend
+        self._chunk_size = chunk_size
+        self._ordered = ordered
+
+        self._pool: Optional[Executor] = None
+        self._pool_lock = threading.Lock()
+        self._processed = 0
+        self._elapsed = 0.0
+
+    def _get_pool(self) -> Executor:
+        with self._pool_lock:
+            if self._pool is None:
+                if self._backend == "process":
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self._workers,
+                        initializer=_init_worker,
+                        initargs=(self._func,),
+                    )
+                else:
+                    self._pool = ThreadPoolExecutor(max_workers=self._workers)
+            return self._pool
+
+    def close(self) -> None:
+        """
+        Stops the workers. The pool is started again if the modifier is used after that.
+        """
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+
+    def __del__(self) -> None:
+        pool = getattr(self, "_pool", None)
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state["_pool"] = None
+        del state["_pool_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._pool_lock = threading.Lock()
+
+    def _draw_mask(self, n: int) -> Optional[np.ndarray]:
+        if self._p is None:
+            return None
+        if self._batched:
+            return self._rng.random(n) <= self._p
+        # The same draws as in __getitem__
+        return np.array([self._random.random() <= self._p for _ in range(n)], dtype=bool)
+
+    def _submit(self, pool: Executor, items: Any) -> Future:
+        if self._backend == "process":
+            return pool.submit(_run_in_worker, items, self._batched)
+        return pool.submit(_run, self._func, items, self._batched)
+
+    def _map_chunk(self, pool: Executor, chunk: Any) -> Tuple[Any, Optional[np.ndarray], Future]:
+        mask = self._draw_mask(len(chunk))
+        selected = chunk if mask is None else _select(chunk, mask)
+        return chunk, mask, self._submit(pool, selected)
+
+    def _result(self, chunk: Any, mask: Optional[np.ndarray], future: Future) -> Any:
+        result = future.result()
+        if self._batched:
+            _check_batch(chunk, result, len(chunk) if mask is None else int(mask.sum()))
+        if mask is None or mask.all():
+            return result
+        if not mask.any():
+            return chunk
+        return _merge(chunk, mask, result)
+
+    def _record(self, n: int, start: float) -> None:
+        self._processed += n
+        self._elapsed += time.perf_counter() - start
+
+    def get_batch(self, indices: Sequence[int]) -> Sequence[Any]:
+        start = time.perf_counter()
+        batch = self._dataset.get_batch(indices)
+        if not self._batched:
+            batch = list(batch_items(batch))
+
+        pool = self._get_pool()
+        chunks = [
+            self._map_chunk(pool, _slice(batch, i, i + self._chunk_size))
+            for i in range(0, len(batch), self._chunk_size)
+        ]
+        if not chunks:
+            return batch
+        result = _concat([self._result(*chunk) for chunk in chunks])
+        self._record(len(batch), start)
+        return result
+
+    def _iter_chunks(self) -> Iterator[Any]:
+        if isinstance(self._dataset, (Dataset, Modifier)):
+            for i in range(0, len(self._dataset), self._chunk_size):
+                chunk = self._dataset.get_batch(
+                    range(i, min(i + self._chunk_size, len(self._dataset)))
+                )
+                yield chunk if self._batched else list(batch_items(chunk))
+            return
+
+        chunk: List[Any] = []
+        for item in self._dataset:
+            chunk.append(item)
+            if len(chunk) == self._chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def __iter__(self) -> Iterator[T]:
+        pool = self._get_pool()
+        # Not more than this number of chunks
+        # are in memory at the same time
+        window = self._workers * 2
+        start = time.perf_counter()
+        n = 0
+        try:
+            if self._ordered:
+                futures: Deque[Tuple[Any, Optional[np.ndarray], Future]] = deque()
+                for chunk in self._iter_chunks():
+                    futures.append(self._map_chunk(pool, chunk))
+                    if len(futures) >= window:
+                        chunk, mask, future = futures.popleft()
+                        n += len(chunk)
+                        yield from batch_items(self._result(chunk, mask, future))
+                while futures:
+                    chunk, mask, future = futures.popleft()
+                    n += len(chunk)
+                    yield from batch_items(self._result(chunk, mask, future))
+            else:
+                pending: Dict[Future, Tuple[Any, Optional[np.ndarray]]] = {}
+                for chunk in self._iter_chunks():
+                    chunk, mask, future = self._map_chunk(pool, chunk)
+                    pending[future] = (chunk, mask)
+                    if len(pending) >= window:
+                        for item, size in self._pop_done(pending):
+                            n += size
+                            yield from item
+                while pending:
+                    for item, size in self._pop_done(pending):
+                        n += size
+                        yield from item
+        finally:
+            self._record(n, start)
+
+    def _pop_done(
+        self, pending: Dict[Future, Tuple[Any, Optional[np.ndarray]]]
+    ) -> Iterator[Tuple[Sequence[Any], int]]:
+        done: Set[Future]
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            chunk, mask = pending.pop(future)
+            yield batch_items(self._result(chunk, mask, future)), len(chunk)
+
+    def get_meta(self) -> Meta:
+        meta = super().get_meta()
+        meta[0].update(
+            {
+                "workers": self._workers,
+                "backend": self._backend,
+                "chunk_size": self._chunk_size,
+                "ordered": self._ordered,
+                "processed": self._processed,
+                "throughput": (
+                    self._processed / self._elapsed if self._elapsed > 0 else None
+                ),
+            }
+        )
+        return meta
@@ -14,11 +14,12 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-from typing import Any, Optional
+from typing import Any, Optional, Sequence
 
+import numpy as np
 from numpy.random import randint, shuffle
 
-from .dataset import Dataset, T
+from .dataset import Dataset, T, normalize_indices
 from .modifier import Sampler
 
 
@@ -52,7 +53,12 @@ class RandomSampler(Sampler[T]):
             self._indices = self._indices[:num_samples]
         else:
             self._indices = randint(0, len(dataset), num_samples)
+        self._indices = np.asarray(self._indices, dtype=np.int64)
         super().__init__(dataset, num_samples, *args, **kwargs)
 
     def __getitem__(self, index: int) -> T:
-        return super().__getitem__(self._indices[index])
+        # Upstream datasets may accept only Python ints
+        return super().__getitem__(int(self._indices[index]))
+
+    def get_batch(self, indices: Sequence[int]) -> Sequence[T]:
+        return self._dataset.get_batch(self._indices[normalize_indices(indices, len(self))])
@@ -14,9 +14,9 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-from typing import Any, Optional
+from typing import Any, Optional, Sequence
 
-from .dataset import Dataset, T
+from .dataset import Dataset, T, normalize_indices
 from .modifier import Sampler
 
 
@@ -83,7 +83,8 @@ class RangeSampler(Sampler[T]):
             stop = start
             start = 0
 
-        self._indices = [i for i in range(start, stop, step)]
+        self._range = range(start, stop, step)
+        self._indices = [i for i in self._range]
 
         if len(self._indices) == 0:
             raise ValueError(
@@ -96,3 +97,7 @@ class RangeSampler(Sampler[T]):
     def __getitem__(self, index: int) -> T:
         internal_index = self._indices[index]
         return super().__getitem__(internal_index)
+
+    def get_batch(self, indices: Sequence[int]) -> Sequence[T]:
+        idx = normalize_indices(indices, len(self))
+        return self._dataset.get_batch(self._range.start + self._range.step * idx)
@@ -19,4 +19,6 @@ from typing import Any
 
 class SequentialCacher:
     def __init__(self, *args: Any, **kwargs: Any) -> None:
-        raise NotImplementedError("SequentialCacher was removed in 0.14.0")
+        raise NotImplementedError(
+            "SequentialCacher was removed in 0.14.0, consider using CachedModifier"
+        )
@@ -26,6 +26,11 @@ class SimpleDataloader:
     Simple batch builder - given a sequence and a size of batch
     breaks it in the subsequences
 
+    See also
+    --------
+    cascade.data.DataLoader
+        Reads batches in parallel workers ahead of time
+
     >>> from cascade.data import SimpleDataloader
     >>> dl = SimpleDataloader([0, 1, 2], 2)
     >>> [item for item in dl]
@@ -12,19 +12,18 @@ limitations under the License.
 """
 
 import os
-import socket
 from collections import defaultdict
-from getpass import getuser
 from hashlib import md5
-from typing import Any, Optional, Tuple, Type, Union
+from typing import Any, Dict, Optional, Tuple, Type, Union
 
 import pendulum
 from typing_extensions import Literal
 
-from ..base import Meta, MetaHandler
+from ..base import Meta, MetaHandler, MetaIndex
 from ..base.serialization import ObjectHandler
-from ..base.utils import (Version, get_latest_commit_hash, get_python_version,
-                          get_uncommitted_changes, skeleton)
+from ..base.utils import (Version, get_hostname, get_latest_commit_hash,
+                          get_python_version, get_uncommitted_changes,
+                          get_user, skeleton)
 from ..data.dataset import Dataset
 from .disk_line import DiskLine
 
@@ -34,19 +33,31 @@ class DataLine(DiskLine):
         self,
         root: str,
         ds_cls: Type[Any] = Dataset,
-        meta_fmt: Literal[".json", ".yml", ".yaml"] = ".json",
+        meta_fmt: Literal[".json", ".yml", ".yaml", ".msgpack"] = ".json",
         obj_backend: Literal["pickle"] = "pickle",
         *args: Any,
         **kwargs: Any,
     ) -> None:
-        self._hashes = defaultdict(lambda: defaultdict(dict))
+        # HASHES files are read only when versions are needed
+        self._hash_map = None
         super().__init__(root, item_cls=ds_cls, meta_fmt=meta_fmt, *args, **kwargs)
 
         self._obj_handler = ObjectHandler(obj_backend)
-        for name in self._item_names:
-            with open(os.path.join(self._root, name, "HASHES"), "r") as f:
-                skel_hash, meta_hash = f.read().split("\n")
-                self._hashes[skel_hash][meta_hash] = Version(name)
+
+    @property
+    def _hashes(self) -> Dict[str, Dict[str, Version]]:
+        if self._hash_map is None:
+            hashes = defaultdict(dict)
+            for name in self._item_names:
+                with open(os.path.join(self._root, name, "HASHES"), "r") as f:
+                    skel_hash, meta_hash = f.read().split("\n")
+                    hashes[skel_hash][meta_hash] = Version(name)
+            self._hash_map = hashes
+        return self._hash_map
+
+    def reload(self) -> None:
+        super().reload()
+        self._hash_map = None
 
     def _get_hashes(self, meta: Meta) -> Tuple[str, str]:
         skel = skeleton(meta)
@@ -125,6 +136,7 @@ class DataLine(DiskLine):
         then major version updates. An when the structure is the same, but meta changed
         in some way, then minor version is updated.
         """
+        self._check_writable()
         meta = ds.get_meta()
         obj_type = meta[0].get("type")
         if obj_type != "dataset":
@@ -146,8 +158,8 @@ class DataLine(DiskLine):
         meta[0]["saved_at"] = pendulum.now(tz="UTC")
         meta[0]["version"] = version_str
         meta[0]["python_version"] = get_python_version()
-        meta[0]["user"] = getuser()
-        meta[0]["host"] = socket.gethostname()
+        meta[0]["user"] = get_user()
+        meta[0]["host"] = get_hostname()
 
         git_commit = get_latest_commit_hash()
         if git_commit:
@@ -160,6 +172,7 @@ class DataLine(DiskLine):
 
         os.makedirs(full_path, exist_ok=True)
         MetaHandler.write(os.path.join(full_path, "meta" + self._meta_fmt), meta)
+        MetaIndex.notify(full_path)
 
         with open(os.path.join(self._root, version_str, "HASHES"), "w") as f:
             f.write("\n".join([skel_hash, meta_hash]))
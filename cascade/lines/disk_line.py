@@ -12,11 +12,14 @@ limitations under the License.
 """
 
 import os
-from typing import Any, List, Optional, Type
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Deque, Dict, Iterator, List, Optional, Type
 
 from typing_extensions import Literal
 
-from ..base import Meta, MetaHandler, TraceableOnDisk
+from ..base import (Meta, MetaHandler, MetaIndex, MetaIOError, ReadOnlyError,
+                    TraceableOnDisk)
 from ..version import __version__
 from .line import Line
 
@@ -26,11 +29,15 @@ class DiskLine(TraceableOnDisk, Line):
         self,
         root: str,
         item_cls: Type[Any],
-        meta_fmt: Literal[".json", ".yml", ".yaml", None],
+        meta_fmt: Literal[".json", ".yml", ".yaml", ".msgpack", None],
         *args: Any,
         **kwargs: Any,
     ) -> None:
         root = os.path.abspath(root)
+        self._meta_index = None
+        # Paths of meta files of items which format differs
+        # from the line's to not search for them in item folders again
+        self._meta_paths: Dict[str, str] = {}
         super().__init__(root, meta_fmt, *args, **kwargs)
 
         self._item_cls = item_cls
@@ -38,9 +45,13 @@ class DiskLine(TraceableOnDisk, Line):
 
         if os.path.exists(self._root):
             self._load_item_names()
+        elif self._readonly:
+            raise FileNotFoundError(f"Line {self._root} does not exist")
         else:
             os.mkdir(self._root)
-        self.sync_meta()
+        self._sync_meta_on_open(
+            {"root": self._root, "len": len(self), "cascade_version": __version__}
+        )
 
     def reload(self) -> None:
         # Here update slugs in ModelLine
@@ -54,7 +65,9 @@ class DiskLine(TraceableOnDisk, Line):
             [
                 item_folder
                 for item_folder in os.listdir(self._root)
+                # Hidden folders are service ones like journal
                 if os.path.isdir(os.path.join(self._root, item_folder))
+                and not item_folder.startswith(".")  # noqa: W503
             ]
         )
 
@@ -78,9 +91,121 @@ class DiskLine(TraceableOnDisk, Line):
         return item
 
     def _read_meta_by_name(self, name: str) -> Meta:
-        meta = MetaHandler.read_dir(os.path.join(self._root, name))
+        if self._meta_index is not None:
+            return self._meta_index.read_dir(os.path.join(self._root, name))
+
+        # Items are written in the format of the line, so meta is
+        # opened directly and the folder is searched only if it is not there
+        path = os.path.join(self._root, name)
+        meta_path = self._meta_paths.get(name, os.path.join(path, "meta" + self._meta_fmt))
+        try:
+            return MetaHandler.read(meta_path)
+        except FileNotFoundError:
+            # The item was removed or its meta format changed
+            self._meta_paths.pop(name, None)
+
+        meta_path = MetaHandler.find_meta_path(path)
+        meta = MetaHandler.read(meta_path)
+        self._meta_paths[name] = meta_path
         return meta
 
+    def iter_meta(
+        self,
+        start: int = 0,
+        prefetch: int = 0,
+        workers: int = 1,
+        ignore_errors: bool = False,
+    ) -> Iterator[Meta]:
+        """
+        Yields meta of items in the order of the line. The list of items
+        is taken when the iteration starts.
+
+        Parameters
+        ----------
+        start : int, optional
+            The number of the first item, negative numbers count
+            from the end like in slicing, by default 0
+        prefetch : int, optional
+            How many metas are read ahead in background threads
+            while the caller processes the current one, by default 0
+            which means that meta is read when it is requested
+        workers : int, optional
+            The number of threads that read meta, by default 1.
+            If more than one, ``prefetch`` is at least ``workers``
+        ignore_errors : bool, optional
+            Whether to yield ``[{}]`` for items which meta could not be read
+            instead of raising, by default False
+
+        Yields
+        ------
+        Meta
+            Meta of each item
+
+        Raises
+        ------
+        MetaIOError
+            If meta of some item could not be read and ``ignore_errors`` is False
+        """
+        if prefetch < 0:
+            raise ValueError(f"prefetch should be non-negative, got {prefetch}")
+        if workers < 1:
+            raise ValueError(f"The number of workers should be positive, got {workers}")
+
+        def read(name: str) -> Meta:
+            try:
+                return self._read_meta_by_name(name)
+            except MetaIOError:
+                if ignore_errors:
+                    return [{}]
+                raise
+
+        names = iter(self._item_names[start:])
+        prefetch = max(prefetch, workers) if workers > 1 else prefetch
+        if prefetch == 0:
+            for name in names:
+                yield read(name)
+            return
+
+        # The window of futures is bounded to not read the whole
+        # line into memory if the caller stops early
+        futures: Deque[Future] = deque()
+        pool = ThreadPoolExecutor(max_workers=workers)
+        try:
+            for name in names:
+                futures.append(pool.submit(read, name))
+                if len(futures) > prefetch:
+                    yield futures.popleft().result()
+            while futures:
+                yield futures.popleft().result()
+        finally:
+            for future in futures:
+                future.cancel()
+            pool.shutdown(wait=True)
+
+    def set_index(self, index: Optional[MetaIndex]) -> None:
+        """
+        Sets the index through which items' meta is read.
+        The index should be located in the line's root or
+        in any of its parent containers.
+
+        Parameters
+        ----------
+        index : Optional[MetaIndex]
+            The index to use or None to read meta from files directly
+
+        Raises
+        ------
+        ReadOnlyError
+            If the line was opened with ``readonly=True`` and the index is
+            writable, since reading through it can update the index file
+        """
+        if self._readonly and index is not None and not index.is_readonly():
+            raise ReadOnlyError(
+                f"{self._root} was opened with readonly=True, use MetaIndex.open"
+                " to read through the index"
+            )
+        self._meta_index = index
+
     def _item_name_by_num(self, num: int) -> Optional[str]:
         if num < len(self._item_names):
             return self._item_names[num]
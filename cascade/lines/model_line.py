@@ -14,61 +14,577 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import json
 import os
-import socket
 import traceback
 import warnings
-from getpass import getuser
+from bisect import bisect_left
+from collections import Counter
 from typing import Any, Dict, List, Optional, Type, Union
 
 import pendulum
 from typing_extensions import Literal
 
-from ..base import Meta, MetaHandler
-from ..base.utils import (generate_slug, get_latest_commit_hash,
-                          get_python_version, get_uncommitted_changes)
+from ..base import (BlobStore, JSONEncoder, Meta, MetaHandler, MetaIndex,
+                    MetaIOError, SlugIndex)
+from ..base.blob_store import BLOB_STORE_FOLDER, use_blob_store
+from ..base.meta_handler import write_file_atomic
+from ..base.utils import (generate_slug, get_hostname, get_latest_commit_hash,
+                          get_python_version, get_uncommitted_changes,
+                          get_user)
 from ..models.model import Model
 from .disk_line import DiskLine
 
 
+JOURNAL_FOLDER = ".journal"
+MANIFEST_FILENAME = ".manifest"
+# Hidden folders that can be created in the folder of the line
+SERVICE_FOLDERS = (JOURNAL_FOLDER, BLOB_STORE_FOLDER)
+# The number of models in one folder of the sharded layout
+SHARD_SIZE = 10000
+supported_layouts = ("flat", "sharded")
+
+
+def _num_from_name(name: str) -> Optional[int]:
+    # Model's name is its folder relative to the line root
+    # in sharded layout it contains the folder of a shard
+    base = name.rsplit("/", 1)[-1]
+    return int(base) if base.isdigit() else None
+
+
 class ModelLine(DiskLine):
     """
     A manager for a line of models. Used by Repo to access models on disk.
     A line of models is typically models with the same hyperparameters and architecture,
     but different epochs or trained using different data.
+
+    Several processes can save models into the same line at the same time.
+    Each model gets its own number and the meta of the line is updated
+    under a file lock, so no models are lost.
     """
 
     def __init__(
         self,
         root: str,
         model_cls: Type[Any] = Model,
-        meta_fmt: Literal[".json", ".yml", ".yaml"] = ".json",
+        meta_fmt: Literal[".json", ".yml", ".yaml", ".msgpack"] = ".json",
         *args: Any,
+        journal: bool = False,
+        layout: Literal["flat", "sharded", None] = None,
+        dedup: bool = False,
         **kwargs: Any,
     ) -> None:
         """
         All models in line should be instances of the same class.
+
+        Parameters
+        ----------
+        journal : bool, optional
+            If True, every save is recorded in the journal in the line's folder
+            before it starts and removed from it when it is finished. Saves that were
+            interrupted are recovered when the line is opened, see ``recover``.
+            By default False
+        layout : Literal["flat", "sharded", None], optional
+            How model folders are placed in the line. In ``flat`` layout they are
+            ``00000``, ``00001``, etc. right in the line's folder. In ``sharded`` they are
+            grouped by ten thousand like ``0001/00012345``, which keeps folders small
+            for very large lines. Only used when the line is created, existing lines
+            keep their layout, see ``set_layout`` to change it. By default ``flat``
+        dedup : bool, optional
+            If True, files and artifacts of saved models are put into the content-addressed
+            store, see ``cascade.base.BlobStore``. Models that have the same file share it
+            through copy-on-write clones where the file system supports them or through
+            read-only hardlinks. Lines of a repo share the store in the repo's folder,
+            standalone lines keep it in their own folder. By default False
+
+        Raises
+        ------
+        ValueError
+            If the layout passed is different from the layout of the existing line
         """
+        if layout is not None and layout not in supported_layouts:
+            raise ValueError(f"Only {supported_layouts} layouts are supported, got {layout}")
 
         self._slug2name_cache = dict()
+        self._layout = layout
+        self._layout_resolved = False
+        self._journal = journal
+        self._dedup = dedup
+        self._blob_store = None
+        self._next_num = 0
+        # Inode of the manifest and the position up to which
+        # it was read, used to read only new records
+        self._manifest_state = None
+        # Hidden folders found when the folder was listed the last time
+        self._hidden_folders = set()
         super().__init__(root, item_cls=model_cls, meta_fmt=meta_fmt, *args, **kwargs)
 
+        if self._journal and not self._readonly:
+            self.recover()
+
+    def _get_layout(self) -> str:
+        # Layout is known only after the meta was read
+        if not self._layout_resolved:
+            disk_layout = None
+            if self._disk_meta is not None:
+                disk_layout = self._disk_meta.get("layout", "flat")
+            if disk_layout is not None:
+                if self._layout is not None and self._layout != disk_layout:
+                    raise ValueError(
+                        f"Line {self._root} has {disk_layout} layout, got {self._layout}."
+                        " Use set_layout to change it"
+                    )
+                self._layout = disk_layout
+            elif self._layout is None:
+                self._layout = "flat"
+            self._layout_resolved = True
+        return self._layout
+
+    def _get_blob_store(self) -> BlobStore:
+        if self._blob_store is None:
+            store_root = self._root
+            parent = os.path.dirname(self._root)
+            try:
+                if MetaHandler.read_dir(parent)[0].get("type") == "repo":
+                    store_root = parent
+            except MetaIOError:
+                pass
+            self._blob_store = BlobStore(os.path.join(store_root, BLOB_STORE_FOLDER))
+        return self._blob_store
+
+    def _journal_path(self) -> str:
+        return os.path.join(self._root, JOURNAL_FOLDER)
+
+    @staticmethod
+    def _journal_record_name(folder_name: str) -> str:
+        return folder_name.replace("/", "_")
+
+    def _journal_begin(self, folder_name: str, meta: Meta) -> None:
+        journal_path = self._journal_path()
+        os.makedirs(journal_path, exist_ok=True)
+        record = {
+            "name": folder_name,
+            "host": get_hostname(),
+            "pid": os.getpid(),
+            "meta": JSONEncoder().to_builtin(meta),
+        }
+        write_file_atomic(
+            os.path.join(journal_path, self._journal_record_name(folder_name)), json.dumps(record)
+        )
+
+    def _journal_end(self, folder_name: str) -> None:
+        os.remove(os.path.join(self._journal_path(), self._journal_record_name(folder_name)))
+
+    @staticmethod
+    def _is_running(pid: int) -> bool:
+        if pid == os.getpid():
+            return False
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except OSError:
+            # Exists, but belongs to another user
+            return True
+        return True
+
+    def recover(self, all_hosts: bool = False) -> List[str]:
+        """
+        Finishes saves that were interrupted using the journal.
+
+        If the model's meta was not written, it is written from the journal
+        with the ``errors`` field that says that save was interrupted, since
+        the artifacts may be incomplete. Model folders are never removed.
+        Saves of the processes that are still running are skipped.
+
+        Parameters
+        ----------
+        all_hosts : bool, optional
+            Saves started on other hosts are skipped by default since it is
+            impossible to check if they are still running. If True,
+            recovers them too, by default False
+
+        Returns
+        -------
+        List[str]
+            Names of the recovered models
+        """
+        self._check_writable()
+        journal_path = self._journal_path()
+        if not os.path.isdir(journal_path):
+            return []
+
+        recovered = []
+        for name in sorted(os.listdir(journal_path)):
+            # Skip temporary files of unfinished journal writes
+            if name.startswith("."):
+                continue
+
+            record_path = os.path.join(journal_path, name)
+            try:
+                with open(record_path, "r") as f:
+                    record = json.load(f)
+            except json.JSONDecodeError:
+                os.remove(record_path)
+                continue
+
+            if record.get("host") != get_hostname():
+                if not all_hosts:
+                    continue
+            elif self._is_running(record["pid"]):
+                continue
+
+            full_path = os.path.join(self._root, record.get("name", name))
+            if os.path.isdir(full_path):
+                try:
+                    MetaHandler.read_dir(full_path, meta_fmt=self._meta_fmt)
+                except MetaIOError:
+                    meta = record["meta"]
+                    meta[0].setdefault("errors", {})
+                    meta[0]["errors"]["interrupted"] = (
+                        "Save was interrupted and recovered from the journal,"
+                        " model and artifacts may be incomplete"
+                    )
+                    MetaHandler.write(os.path.join(full_path, "meta" + self._meta_fmt), meta)
+                    MetaIndex.notify(full_path)
+                    recovered.append(record.get("name", name))
+
+            os.remove(record_path)
+
+        if recovered:
+            self._load_item_names()
+            self.sync_meta()
+        return recovered
+
+    def _manifest_path(self) -> str:
+        return os.path.join(self._root, MANIFEST_FILENAME)
+
+    def _read_manifest(self, offset: int = 0) -> Optional[List[Dict[str, Any]]]:
+        try:
+            with open(self._manifest_path(), "rb") as f:
+                inode = os.fstat(f.fileno()).st_ino
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            self._manifest_state = None
+            return None
+
+        # The last line may be incomplete if it is being
+        # appended right now, then it is read next time
+        end = data.rfind(b"\n") + 1
+        self._manifest_state = (inode, offset + end)
+
+        lines = data[:end].splitlines()
+        try:
+            # Parsing all records at once is much faster
+            return json.loads(b"[" + b",".join(lines) + b"]")
+        except json.JSONDecodeError:
+            pass
+
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                # The process was killed while appending
+                continue
+        return records
+
+    def _read_new_manifest_records(self) -> Optional[List[Dict[str, Any]]]:
+        # Returns None if the manifest was replaced or removed
+        # since the last read and should be read again fully
+        if self._manifest_state is None:
+            return None
+        inode, offset = self._manifest_state
+        try:
+            st = os.stat(self._manifest_path())
+        except FileNotFoundError:
+            return None
+        if st.st_ino != inode:
+            return None
+        if st.st_size == offset:
+            return []
+
+        records = self._read_manifest(offset)
+        if self._manifest_state is None or self._manifest_state[0] != inode:
+            return None
+        return records
+
+    def _update_item_names(self) -> None:
+        """
+        Adds models saved by other line objects or processes
+        since the list of models was loaded
+        """
+        records = self._read_new_manifest_records()
+        if records is None:
+            # Folders that are not in the manifest may be still being
+            # saved by other processes, so the folder is not listed here
+            records = self._read_manifest()
+        if not records:
+            return
+
+        # Names are kept sorted, new ones are inserted in place
+        for record in records:
+            name = record["name"]
+            i = bisect_left(self._item_names, name)
+            if i == len(self._item_names) or self._item_names[i] != name:
+                self._item_names.insert(i, name)
+                num = _num_from_name(name)
+                if num is not None and num >= self._next_num:
+                    self._next_num = num + 1
+            if record.get("slug") is not None:
+                self._slug2name_cache[record["slug"]] = name
+
+    def _append_manifest(self, records: List[Dict[str, Any]]) -> None:
+        # Small appends are not interleaved by other
+        # processes writing into the same line
+        with open(self._manifest_path(), "a") as f:
+            f.write("".join(json.dumps(record) + "\n" for record in records))
+
+    def _read_slug(self, name: str) -> Optional[str]:
+        filepath = os.path.join(self._root, name, "SLUG")
+        if not os.path.exists(filepath):
+            return None
+        with open(filepath, "r") as f:
+            return f.read()
+
+    def _set_item_names(self, names: List[str]) -> None:
+        self._item_names = sorted(names)
+        nums = [_num_from_name(name) for name in self._item_names]
+        nums = [num for num in nums if num is not None]
+        self._next_num = max(nums) + 1 if nums else 0
+
+    @staticmethod
+    def _record(
+        name: str, slug: Optional[str], saved_at: Optional[str] = None
+    ) -> Dict[str, Any]:
+        return {
+            "num": _num_from_name(name),
+            "name": name,
+            "slug": slug,
+            "saved_at": saved_at,
+        }
+
+    def _manifest_is_complete(self, names: List[str]) -> bool:
+        # Link count of a directory is 2 + the number of its subdirectories
+        # this allows to check that no model folders were added or
+        # removed bypassing the manifest without listing the directory
+        nlink = os.stat(self._root).st_nlink
+        if nlink < 2:
+            # Some file systems do not count links of directories
+            return False
+        # Hidden folders are not models, but they are counted in the link count too
+        service = sum(
+            os.path.isdir(os.path.join(self._root, name))
+            for name in self._hidden_folders.union(SERVICE_FOLDERS)
+        )
+        if self._get_layout() == "flat":
+            return nlink - 2 == len(names) + service
+
+        shards = Counter(name.split("/", 1)[0] for name in names)
+        if nlink - 2 != len(shards) + service:
+            return False
+        for shard, count in shards.items():
+            try:
+                if os.stat(os.path.join(self._root, shard)).st_nlink - 2 != count:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def _scan_item_names(self) -> None:
+        if not os.path.isdir(self._root):
+            raise ValueError(f"folder should be directory, got `{self._root}`")
+
+        flat = self._get_layout() == "flat"
+        names = []
+        hidden = set()
+        for entry in os.scandir(self._root):
+            if not entry.is_dir():
+                continue
+            if entry.name.startswith("."):
+                # Hidden folders are service ones like journal
+                hidden.add(entry.name)
+            elif flat:
+                names.append(entry.name)
+            else:
+                for item in os.scandir(entry.path):
+                    if not item.name.startswith(".") and item.is_dir():
+                        names.append(f"{entry.name}/{item.name}")
+        self._item_names = sorted(names)
+        self._hidden_folders = hidden
+
+    def _load_item_names(self, scan: bool = False) -> None:
+        records = self._read_manifest()
+        if records is None:
+            self._scan_item_names()
+            self._set_item_names(self._item_names)
+            return
+
+        manifest = {record["name"]: record for record in records}
+        if not scan and self._manifest_is_complete(list(manifest)):
+            names = list(manifest)
+        else:
+            self._scan_item_names()
+            names = self._item_names
+            if set(names) != set(manifest):
+                new_manifest = {
+                    name: manifest.get(name, self._record(name, self._read_slug(name)))
+                    for name in names
+                }
+                if not self._readonly:
+                    try:
+                        write_file_atomic(
+                            self._manifest_path(),
+                            "".join(
+                                json.dumps(record) + "\n" for record in new_manifest.values()
+                            ),
+                        )
+                    except OSError:
+                        pass
+                    self._manifest_state = None
+                manifest = new_manifest
+
+        self._slug2name_cache = {
+            record["slug"]: name
+            for name, record in manifest.items()
+            if record.get("slug") is not None
+        }
+        self._set_item_names(names)
+
+    def reload(self) -> None:
+        """
+        Updates the list of models from disk.
+
+        When the line is opened the list is read from the manifest and the folder
+        is listed only if the number of model folders differs from it. Reload always
+        lists the folder to account for any changes made bypassing the line.
+        """
+        self._load_item_names(scan=True)
+
+    def set_layout(self, layout: Literal["flat", "sharded"]) -> int:
+        """
+        Moves the folders of models into another layout, see ``layout`` in
+        ``ModelLine.__init__``. Paths in the meta of models are updated.
+
+        Other processes should not use the line while it is migrated and
+        other line objects opened on it should be opened again after.
+
+        Parameters
+        ----------
+        layout : Literal["flat", "sharded"]
+            The new layout
+
+        Returns
+        -------
+        int
+            The number of moved models
+
+        Raises
+        ------
+        ValueError
+            If the layout is not supported or there are folders in the line
+            that are not named by the numbers of models
+        """
+        if layout not in supported_layouts:
+            raise ValueError(f"Only {supported_layouts} layouts are supported, got {layout}")
+        self._check_writable()
+
+        with self._meta_lock():
+            self.reload()
+            if layout == self._get_layout():
+                return 0
+
+            nums = {name: _num_from_name(name) for name in self._item_names}
+            unknown = [name for name, num in nums.items() if num is None]
+            if unknown:
+                raise ValueError(
+                    f"Cannot change layout of {self._root}, folders {unknown} are not models"
+                )
+
+            manifest = {record["name"]: record for record in self._read_manifest() or []}
+            old_shards = {name.split("/", 1)[0] for name in self._item_names if "/" in name}
+
+            self._layout = layout
+            records = []
+            for name, num in nums.items():
+                new_name = self._item_name_by_num(num)
+                new_path = os.path.join(self._root, new_name)
+                os.makedirs(os.path.dirname(new_path), exist_ok=True)
+                os.rename(os.path.join(self._root, name), new_path)
+
+                try:
+                    meta_path = MetaHandler.find_meta_path(new_path, meta_fmt=self._meta_fmt)
+                    meta = MetaHandler.read(meta_path)
+                except MetaIOError:
+                    pass
+                else:
+                    meta[0]["path"] = new_path
+                    MetaHandler.write(meta_path, meta)
+
+                record = manifest.get(name, self._record(name, self._read_slug(new_name)))
+                records.append({**record, "name": new_name, "num": num})
+
+            for shard in old_shards:
+                os.rmdir(os.path.join(self._root, shard))
+
+            write_file_atomic(
+                self._manifest_path(),
+                "".join(json.dumps(record) + "\n" for record in records),
+            )
+            self._manifest_state = None
+            self._load_item_names()
+            self.sync_meta()
+        return len(records)
+
+    def sync_meta(self) -> None:
+        self._check_writable()
+        with self._meta_lock():
+            # Take into account the models saved by other
+            # processes, so that len on disk is correct
+            self._update_item_names()
+            super().sync_meta()
+
+    def _create_manifest(self) -> None:
+        self._scan_item_names()
+        records = []
+        for name in self._item_names:
+            slug = self._read_slug(name)
+            if slug is not None:
+                self._slug2name_cache[slug] = name
+            records.append(self._record(name, slug))
+        self._append_manifest(records)
+        # Created under the lock, so there are only these records
+        st = os.stat(self._manifest_path())
+        self._manifest_state = (st.st_ino, st.st_size)
+        self._set_item_names(self._item_names)
+
     def _item_name_by_num(self, num: int) -> str:
+        if self._get_layout() == "sharded":
+            return f"{num // SHARD_SIZE:0>4d}/{num:0>8d}"
         return f"{num:0>5d}"
 
     def _find_name_by_slug(self, slug: str) -> Optional[str]:
         if slug in self._slug2name_cache:
-            return self._slug2name_cache[slug]
-
+            name = self._slug2name_cache[slug]
+            if os.path.isdir(os.path.join(self._root, name)):
+                return name
+            # The folder was renamed or removed bypassing the manifest
+            self.reload()
+            if slug in self._slug2name_cache:
+                return self._slug2name_cache[slug]
+
+        # Models not in the manifest
+        known = set(self._slug2name_cache.values())
         for name in self._item_names:
-            filepath = os.path.join(self._root, name, "SLUG")
-            if not os.path.exists(filepath):
+            if name in known:
+                continue
+            slug_from_file = self._read_slug(name)
+            if slug_from_file is None:
                 continue
-            with open(filepath, "r") as f:
-                slug_from_file = f.read()
-                self._slug2name_cache[slug_from_file] = name
-                if slug == slug_from_file:
-                    return name
+            self._slug2name_cache[slug_from_file] = name
+            if slug == slug_from_file:
+                return name
 
     def _parse_item_name(self, item: Union[int, str]) -> Optional[str]:
         if isinstance(item, str):
@@ -154,39 +670,46 @@ class ModelLine(DiskLine):
             Flag, that indicates whether to save model's artifacts.
             If True saves only metadata
         """
+        self._check_writable()
         meta = model.get_meta()
         obj_type = meta[0].get("type")
         if obj_type != "model":
             raise ValueError(f"Can only save meta of type model into ModelLine, got {obj_type}")
 
-        if len(self._item_names) == 0:
-            idx = 0
-        else:
-            idx = int(max(self._item_names)) + 1
+        if not os.path.exists(self._manifest_path()):
+            with self._meta_lock():
+                # Could be created by another process while waiting
+                if not os.path.exists(self._manifest_path()):
+                    self._create_manifest()
 
-        # Should check just in case
+        # The folder may be already taken by another line
+        # object or process, since creation of the folder is atomic
+        # only one of them succeeds and others try next numbers
+        idx = self._next_num
         while True:
             folder_name = self._item_name_by_num(idx)
             model_folder = os.path.join(self._root, folder_name)
-            if os.path.exists(model_folder):
-                idx += 1
+            try:
+                os.makedirs(model_folder)
+            except FileExistsError:
+                # Skip the numbers already saved by others
+                self._update_item_names()
+                idx = max(idx + 1, self._next_num)
                 continue
-
-            os.makedirs(model_folder)
             break
+        self._next_num = max(self._next_num, idx + 1)
 
         full_path = os.path.join(self._root, folder_name)
         slug = generate_slug()
-        with open(os.path.join(self._root, folder_name, "SLUG"), "w") as f:
-            f.write(slug)
+        write_file_atomic(os.path.join(self._root, folder_name, "SLUG"), slug)
         self._slug2name_cache[slug] = folder_name
 
         meta[0]["path"] = full_path
         meta[0]["slug"] = slug
         meta[0]["saved_at"] = pendulum.now(tz="UTC")
         meta[0]["python_version"] = get_python_version()
-        meta[0]["user"] = getuser()
-        meta[0]["host"] = socket.gethostname()
+        meta[0]["user"] = get_user()
+        meta[0]["host"] = get_hostname()
 
         git_commit = get_latest_commit_hash()
         if git_commit:
@@ -197,11 +720,16 @@ class ModelLine(DiskLine):
         if git_uncommitted is not None:
             meta[0]["git_uncommitted_changes"] = git_uncommitted
 
+        if self._journal:
+            self._journal_begin(folder_name, meta)
+
         model_tb = None
         artifact_tb = None
         if not only_meta:
+            store = self._get_blob_store() if self._dedup else None
             try:
-                model.save(full_path)
+                with use_blob_store(store):
+                    model.save(full_path)
             except Exception as e:
                 model_exception = str(e)
                 model_tb = traceback.format_exc()
@@ -220,6 +748,13 @@ class ModelLine(DiskLine):
                     f"Failed to save artifact {full_path}\n{artifact_exception}\n{artifact_tb}"
                 )
 
+            if store is not None:
+                try:
+                    store.put_tree(artifacts_folder)
+                except OSError as e:
+                    # Files that were not put stay as they are
+                    warnings.warn(f"Failed to deduplicate artifacts of {full_path}: {e}")
+
         if model_tb is not None or artifact_tb is not None:
             meta[0]["errors"] = {}
             if model_tb is not None:
@@ -228,14 +763,22 @@ class ModelLine(DiskLine):
                 meta[0]["errors"]["save_artifact"] = artifact_tb
 
         MetaHandler.write(os.path.join(full_path, "meta" + self._meta_fmt), meta)
-        self._item_names.append(folder_name)
+        # Appends of records are atomic, only the sync of line's meta
+        # takes the lock. The name is added from the manifest there
+        self._append_manifest([self._record(folder_name, slug, str(meta[0]["saved_at"]))])
         self.sync_meta()
+        MetaIndex.notify(full_path)
+        SlugIndex.notify(full_path, slug)
+
+        if self._journal:
+            self._journal_end(folder_name)
 
     def get_meta(self) -> Meta:
         meta = super().get_meta()
         meta[0].update(
             {
                 "type": "model_line",
+                "layout": self._get_layout(),
             }
         )
         return meta
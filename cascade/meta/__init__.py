@@ -20,6 +20,7 @@ limitations under the License.
 """
 
 from .diff_viewer import DiffViewer
+from .exporter import MetaExporter
 from .hashes import numpy_md5
 from .history_viewer import HistoryViewer
 from .meta_viewer import MetaViewer
@@ -0,0 +1,364 @@
+"""
+Copyright 2022-2025 Ilia Moiseev
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import glob
+import os
+from typing import Any, Dict, Iterator, List, NoReturn, Optional, Set, Tuple
+
+from typing_extensions import Literal
+
+from ..base import Meta, MetaHandler, MetaIndex, MetaIOError
+from ..base.utils import flatten_dict
+
+EXPORTED_FILENAME = "_exported.txt"
+_ext = {"parquet": ".parquet", "arrow": ".arrow"}
+
+
+def _read_exported(path: str) -> Tuple[Dict[str, List[str]], Set[int]]:
+    # Every line of the file is a record "item\tmtime\tsize\tpart\trow" where item is
+    # the path relative to the container, mtime and size are of its meta file and
+    # part and row are where it was written. Returns the last record of every item
+    # and the numbers of parts that have records. Files exported by older versions
+    # have only absolute paths
+    records: Dict[str, List[str]] = {}
+    parts: Set[int] = set()
+    if not os.path.exists(path):
+        return records, parts
+
+    with open(path, "r") as f:
+        for line in f.read().splitlines():
+            if not line:
+                continue
+            fields = line.split("\t")
+            records[fields[0]] = fields[1:]
+            if len(fields) == 5:
+                parts.add(int(fields[3]))
+    return records, parts
+
+
+def _part_num(path: str) -> int:
+    return int(os.path.splitext(os.path.basename(path))[0].split("-", 1)[1])
+
+
+class MetaExporter:
+    """
+    Exports metadata of all objects in a container into a columnar
+    format. Meta is flattened using ``flatten_dict`` and written by batches
+    as separate files of a dataset directory, so memory consumption does not
+    depend on the size of a container.
+
+    Different files may have different sets of columns, use ``MetaExporter.read``
+    to read them into one table.
+
+    Example
+    -------
+    >>> from cascade.meta import MetaExporter
+    >>> from cascade.repos import Repo
+    >>> repo = Repo("repo")
+    >>> MetaExporter(repo).export("repo_meta")
+    >>> df = MetaExporter.read("repo_meta").to_pandas()
+
+    Note
+    ----
+    This feature needs ``pyarrow`` to be installed.
+    """
+
+    def __init__(self, container: Any, batch_size: int = 1000) -> None:
+        """
+        Parameters
+        ----------
+        container : Union[Workspace, Repo, Line]
+            The container which meta to export
+        batch_size : int, optional
+            The number of objects in one file, by default 1000
+        """
+        if batch_size < 1:
+            raise ValueError(f"Batch size should be positive, got {batch_size}")
+
+        self._container = container
+        self._batch_size = batch_size
+
+    def _iterate_lines(self, container: Any) -> Iterator[Any]:
+        if hasattr(container, "get_repo_names"):
+            for name in container.get_repo_names():
+                for line in self._iterate_lines(container[name]):
+                    yield line
+        elif hasattr(container, "get_line_names"):
+            for name in container.get_line_names():
+                yield container[name]
+        else:
+            yield container
+
+    def iterate_meta(self) -> Iterator[Tuple[str, Meta]]:
+        """
+        Iterates over all items in the container
+
+        Yields
+        ------
+        Tuple[str, Meta]
+            Path to the item and its meta
+        """
+        for path, _, meta in self._iterate_meta(with_state=False):
+            yield path, meta
+
+    @staticmethod
+    def _meta_state(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(MetaHandler.find_meta_path(path))
+        except (MetaIOError, OSError):
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _iterate_meta(
+        self, with_state: bool
+    ) -> Iterator[Tuple[str, Optional[Tuple[int, int]], Meta]]:
+        # Export only reads, so the index is used only if it already exists
+        index = MetaIndex.open(self._container.get_root())
+        try:
+            for line in self._iterate_lines(self._container):
+                for name in line.get_item_names():
+                    path = os.path.join(line.get_root(), name)
+                    # Taken before reading, so that the changes
+                    # made in between are exported next time
+                    state = self._meta_state(path) if with_state else None
+                    try:
+                        if index is not None:
+                            meta = index.read_dir(path)
+                        else:
+                            meta = MetaHandler.read_dir(path)
+                    except MetaIOError:
+                        continue
+                    yield path, state, meta
+        finally:
+            if index is not None:
+                index.close()
+
+    @staticmethod
+    def _to_table(rows: List[Dict[str, Any]]) -> Any:
+        import pyarrow as pa
+
+        columns = {}
+        for row in rows:
+            for key in row:
+                columns[key] = None
+
+        arrays = []
+        for key in columns:
+            values = [row.get(key) for row in rows]
+            try:
+                arrays.append(pa.array(values))
+            except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError):
+                # Column has mixed types in different objects
+                # the only common representation is a string
+                arrays.append(pa.array([None if v is None else str(v) for v in values]))
+        return pa.Table.from_arrays(arrays, names=list(columns))
+
+    @staticmethod
+    def _raise_cannot_import_pyarrow() -> NoReturn:
+        raise ModuleNotFoundError(
+            """
+            Cannot import pyarrow. It is conditional
+            dependency you can install it
+            using the instructions from https://arrow.apache.org/docs/python/install.html"""
+        )
+
+    def _write(self, table: Any, path: str, fmt: str) -> None:
+        if fmt == "parquet":
+            import pyarrow.parquet as pq
+
+            pq.write_table(table, path)
+        else:
+            import pyarrow as pa
+
+            with pa.OSFile(path, "wb") as f:
+                with pa.ipc.new_file(f, table.schema) as writer:
+                    writer.write_table(table)
+
+    def export(
+        self,
+        path: str,
+        fmt: Literal["parquet", "arrow"] = "parquet",
+        append: bool = False,
+    ) -> int:
+        """
+        Exports meta into the directory.
+
+        Parameters
+        ----------
+        path : str
+            Directory where to write the files
+        fmt : Literal["parquet", "arrow"], optional
+            Format of the files, by default "parquet"
+        append : bool, optional
+            If True, exports only the objects that were not exported
+            into this directory before or which meta has changed since then.
+            Objects are identified by the path relative to the container, so
+            the container can be moved. If False, removes previously
+            exported files first, by default False
+
+        Returns
+        -------
+        int
+            The number of exported objects
+        """
+        try:
+            import pyarrow  # noqa: F401
+        except ModuleNotFoundError:
+            self._raise_cannot_import_pyarrow()
+
+        if fmt not in _ext:
+            raise ValueError(f"Only {tuple(_ext)} formats are supported, got {fmt}")
+
+        os.makedirs(path, exist_ok=True)
+        exported_path = os.path.join(path, EXPORTED_FILENAME)
+        # Parts of all formats, since read takes all of them
+        part_template = os.path.join(path, "part-*")
+
+        exported: Dict[str, List[str]] = {}
+        if append:
+            exported, _ = _read_exported(exported_path)
+        else:
+            for part in glob.glob(part_template):
+                os.remove(part)
+            if os.path.exists(exported_path):
+                os.remove(exported_path)
+
+        root = os.path.abspath(self._container.get_root())
+        # Numbers are unique across formats, so that
+        # the records point to the right files
+        part_num = max((_part_num(part) for part in glob.glob(part_template)), default=-1) + 1
+        count = 0
+        rows = []
+        records = []
+
+        def flush() -> None:
+            nonlocal part_num
+            if len(rows) == 0:
+                return
+
+            self._write(
+                self._to_table(rows),
+                os.path.join(path, f"part-{part_num:0>5d}" + _ext[fmt]),
+                fmt,
+            )
+            # Exported objects are recorded only after
+            # the file was written to not to lose any on failure
+            with open(exported_path, "a") as f:
+                f.writelines(
+                    f"{record}\t{part_num}\t{row}\n" for row, record in enumerate(records)
+                )
+
+            part_num += 1
+            rows.clear()
+            records.clear()
+
+        for item_path, state, meta in self._iterate_meta(with_state=True):
+            item = os.path.relpath(os.path.abspath(item_path), root)
+            mtime, size = state if state is not None else ("", "")
+            record = exported.get(item)
+            if record is None:
+                record = exported.get(os.path.abspath(item_path))
+            if record is not None and (
+                # Exported by older versions or the state is unknown
+                len(record) < 2 or state is None or record[:2] == [str(mtime), str(size)]
+            ):
+                continue
+
+            rows.append(flatten_dict(meta[0]))
+            records.append(f"{item}\t{mtime}\t{size}")
+            count += 1
+
+            if len(rows) >= self._batch_size:
+                flush()
+        flush()
+
+        return count
+
+    @classmethod
+    def read(cls, path: str) -> Any:
+        """
+        Reads all exported files from the directory into one table.
+        Missing columns are filled with nulls. If the same column has
+        incompatible types in different files, it is converted to string.
+        If an object was exported several times, only the last row is read.
+
+        Parameters
+        ----------
+        path : str
+            Directory with exported files
+
+        Returns
+        -------
+        pyarrow.Table
+            The table with meta of all exported objects
+        """
+        try:
+            import pyarrow as pa
+        except ModuleNotFoundError:
+            cls._raise_cannot_import_pyarrow()
+
+        records, recorded_parts = _read_exported(os.path.join(path, EXPORTED_FILENAME))
+        # Rows that are the last exports of their objects
+        current: Dict[int, List[int]] = {num: [] for num in recorded_parts}
+        for record in records.values():
+            if len(record) == 4:
+                current[int(record[2])].append(int(record[3]))
+
+        tables = []
+        for part in sorted(glob.glob(os.path.join(path, "part-*"))):
+            ext = os.path.splitext(part)[-1]
+            if ext == _ext["parquet"]:
+                import pyarrow.parquet as pq
+
+                table = pq.read_table(part)
+            elif ext == _ext["arrow"]:
+                with pa.memory_map(part, "r") as source:
+                    table = pa.ipc.open_file(source).read_all()
+            else:
+                continue
+
+            num = _part_num(part)
+            if num in current and len(current[num]) != table.num_rows:
+                table = table.take(pa.array(sorted(current[num]), type=pa.int64()))
+            tables.append(table)
+
+        if len(tables) == 0:
+            return pa.table({})
+
+        types: Dict[str, Set[Any]] = {}
+        for table in tables:
+            for f in table.schema:
+                if not pa.types.is_null(f.type):
+                    types.setdefault(f.name, set()).add(f.type)
+
+        conflicts = set()
+        for name, column_types in types.items():
+            if len(column_types) > 1 and not all(
+                pa.types.is_integer(t) or pa.types.is_floating(t) for t in column_types
+            ):
+                conflicts.add(name)
+
+        for i, table in enumerate(tables):
+            for name in conflicts.intersection(table.column_names):
+                column = table.column(name).cast(pa.string())
+                table = table.set_column(table.column_names.index(name), name, column)
+            tables[i] = table
+
+        try:
+            return pa.concat_tables(tables, promote_options="permissive")
+        except TypeError:
+            # pyarrow<14
+            return pa.concat_tables(tables, promote=True)
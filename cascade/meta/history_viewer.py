@@ -20,12 +20,11 @@ from typing import Any, Dict, List, Optional, Union
 import pandas as pd
 from deepdiff import DeepDiff
 
-from ..base import MetaHandler, ZeroMetaError
+from ..base import MetaHandler, MetaIndex, ZeroMetaError
 from ..base.utils import flatten_dict
 from ..lines import ModelLine
 from ..repos import Repo, SingleLineRepo
 from ..workspaces import Workspace
-from .meta_viewer import MetaViewer
 from .server import Server
 
 
@@ -128,39 +127,47 @@ class HistoryViewer(Server):
         if self._last_lines is not None:
             line_names = self._get_last_updated_lines(line_names)
 
-        for line_name in line_names:
-            line = self._repo[line_name]
-            line_root = line.get_root()
-            view = MetaViewer(line_root, filt={"type": "model"})
+        index = MetaIndex.open(self._repo.get_root())
+        try:
+            for line_name in line_names:
+                line = self._repo[line_name]
+                line_name = os.path.split(line.get_root())[-1]
+
+                last_models = self._last_models if self._last_models is not None else 0
+                nums = range(len(line))[-last_models:]
 
-            last_models = self._last_models if self._last_models is not None else 0
-            for i in range(len(line))[-last_models:]:
-                line_name = os.path.split(line_root)[-1]
-                new_meta = {"line": line_name, "model": i}
+                # Meta is read in background while the previous one is processed
+                line.set_index(index)
                 try:
-                    meta = view[i][0]
-
-                    metrics = dict()
-                    for metric in meta["metrics"]:
-                        name = metric["name"]
-                        for key in ["dataset", "split"]:
-                            part = metric.get(key)
-                            name += "_" + part if part else ""
-                        metrics[name] = metric.get("value")
-                    meta["metrics"] = metrics
-
-                    new_meta.update(flatten_dict(meta))
-                except IndexError:
-                    meta = {}
-                metas.append(new_meta)
-
-                p = {
-                    "line": line_name,
-                }
-                if "params" in meta:
-                    if len(meta["params"]) > 0:
-                        p.update(flatten_dict({"params": meta["params"]}))
-                params.append(p)
+                    line_metas = line.iter_meta(start=nums.start, prefetch=16, ignore_errors=True)
+                    for i, meta in zip(nums, line_metas):
+                        new_meta = {"line": line_name, "model": i}
+                        meta = meta[0] if meta[0].get("type") == "model" else {}
+                        if meta:
+                            metrics = dict()
+                            for metric in meta["metrics"]:
+                                name = metric["name"]
+                                for key in ["dataset", "split"]:
+                                    part = metric.get(key)
+                                    name += "_" + part if part else ""
+                                metrics[name] = metric.get("value")
+                            meta["metrics"] = metrics
+
+                            new_meta.update(flatten_dict(meta))
+                        metas.append(new_meta)
+
+                        p = {
+                            "line": line_name,
+                        }
+                        if "params" in meta:
+                            if len(meta["params"]) > 0:
+                                p.update(flatten_dict({"params": meta["params"]}))
+                        params.append(p)
+                finally:
+                    line.set_index(None)
+        finally:
+            if index is not None:
+                index.close()
 
         self._table = pd.DataFrame(metas)
         self._params = params
@@ -21,7 +21,8 @@ from typing import Any, Dict, Optional
 
 from typing_extensions import deprecated
 
-from ..base import Meta, MetaHandler, MetaIOError, supported_meta_formats
+from ..base import (Meta, MetaHandler, MetaIndex, MetaIOError,
+                    supported_meta_formats)
 
 
 def is_meta(file_path: str) -> bool:
@@ -38,7 +39,12 @@ class MetaViewer:
     The class to view all metadata in folders and subfolders.
     """
 
-    def __init__(self, root: str, filt: Optional[Dict[Any, Any]] = None) -> None:
+    def __init__(
+        self,
+        root: str,
+        filt: Optional[Dict[Any, Any]] = None,
+        index: Optional[MetaIndex] = None,
+    ) -> None:
         """
         Parameters
         ----------
@@ -47,6 +53,9 @@ class MetaViewer:
         filt: Dict, optional
             dictionary that specifies which values that should be present in meta
             for example to find all models use ``filt={'type': 'model'}``
+        index: MetaIndex, optional
+            if passed, meta files are read through the index and
+            only changed files are parsed
 
         See also
         --------
@@ -57,6 +66,7 @@ class MetaViewer:
 
         self._root = root
         self._filt = filt
+        self._index = index
 
         self.names = []
         for root, _, files in os.walk(self._root):
@@ -77,7 +87,7 @@ class MetaViewer:
         meta: Meta
             Meta object that was read from file
         """
-        return MetaHandler.read(self.names[index])
+        return self._read(self.names[index])
 
     def __len__(self) -> int:
         return len(self.names)
@@ -102,9 +112,14 @@ class MetaViewer:
             "Consider using MetaHandler.read or switching to previous versions."
         )
 
+    def _read(self, name: str) -> Meta:
+        if self._index is not None:
+            return self._index.read(name)
+        return MetaHandler.read(name)
+
     def _filter(self, name: str) -> bool:
         try:
-            meta = MetaHandler.read(name)
+            meta = self._read(name)
         except MetaIOError as e:
             warnings.warn(str(e))
             return False
@@ -20,12 +20,11 @@ from typing import Any, Dict, List, Optional, Union
 import pandas as pd
 import pendulum
 
-from ..base import MetaHandler
+from ..base import MetaHandler, MetaIndex
 from ..base.utils import flatten_dict
 from ..lines import ModelLine
 from ..models import Model
 from ..repos import Repo, SingleLineRepo
-from .meta_viewer import MetaViewer
 from .server import Server
 
 
@@ -73,8 +72,36 @@ class MetricViewer:
         return MetricViewer(self._repo, scope=key)
 
     def reload_table(self) -> None:
+        self._metrics = []
+        selected_names = self._repo.get_line_names()
+
+        if self._scope is not None:
+            selected_names = selected_names[self._scope]
+            if not isinstance(selected_names, list):
+                selected_names = [selected_names]
+
+        index = MetaIndex.open(self._repo.get_root())
+        try:
+            for name in selected_names:
+                line = self._repo[name]
+                _, line_name = os.path.split(line.get_root())
+
+                # Meta is read in background while the previous one is processed
+                line.set_index(index)
+                try:
+                    for i, meta in enumerate(line.iter_meta(prefetch=16, ignore_errors=True)):
+                        meta = meta[-1] if meta[0].get("type") == "model" else {}
+                        self._add_metrics(meta, line_name, i)
+                finally:
+                    line.set_index(None)
+        finally:
+            if index is not None:
+                index.close()
+        self.table = pd.DataFrame(self._metrics)
+
+    def _add_metrics(self, meta: Dict[str, Any], line: str, num: int) -> None:
         def create_metric(meta: Dict[str, Any]) -> Dict[str, Any]:
-            metric = {"line": line, "num": i}
+            metric = {"line": line, "num": num}
             if "created_at" in meta:
                 metric["created_at"] = pendulum.parse(meta["created_at"])
                 if "saved_at" in meta:
@@ -93,44 +120,22 @@ class MetricViewer:
 
             return metric
 
-        self._metrics = []
-        selected_names = self._repo.get_line_names()
+        if "metrics" in meta:
+            # Need to generate new metric each time
+            for m in meta["metrics"]:
+                metric = create_metric(meta)
 
-        if self._scope is not None:
-            selected_names = selected_names[self._scope]
-            if not isinstance(selected_names, list):
-                selected_names = [selected_names]
-
-        for name in selected_names:
-            line = self._repo[name]
-            viewer_root = line.get_root()
+                metric["name"] = m.get("name")
+                metric["value"] = m.get("value")
 
-            view = MetaViewer(viewer_root, filt={"type": "model"})
+                for key in m.keys():
+                    if key not in ("name", "value", "created_at"):
+                        if m[key] is not None:
+                            metric[key] = m[key]
 
-            for i in range(len(line)):
-                try:
-                    meta = view[i][-1]  # Takes last model from meta
-                except IndexError:
-                    meta = {}
-
-                _, line = os.path.split(viewer_root)
-                if "metrics" in meta:
-                    # Need to generate new metric each time
-                    for m in meta["metrics"]:
-                        metric = create_metric(meta)
-
-                        metric["name"] = m.get("name")
-                        metric["value"] = m.get("value")
-
-                        for key in m.keys():
-                            if key not in ("name", "value", "created_at"):
-                                if m[key] is not None:
-                                    metric[key] = m[key]
-
-                        self._metrics.append(metric)
-                else:
-                    self._metrics.append(create_metric(meta))
-        self.table = pd.DataFrame(self._metrics)
+                self._metrics.append(metric)
+        else:
+            self._metrics.append(create_metric(meta))
 
     def __repr__(self) -> str:
         return repr(self.table)
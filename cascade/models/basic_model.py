@@ -22,6 +22,8 @@ from hashlib import md5
 from typing import Any, Callable, List, Union
 
 from ..base import MetaHandler, raise_not_implemented
+from ..base.serialization import (BUFFERS_SUFFIX, dump_with_buffers,
+                                  load_with_buffers)
 from ..metrics import Metric, MetricType
 from .model import Model, ModelModifier
 
@@ -37,6 +39,10 @@ class BasicModel(Model):
     cascade.models.Model
     """
 
+    # If True, numpy arrays and other large buffers are saved next to
+    # the pickle and are memory mapped on load instead of being read
+    memory_map: bool = False
+
     def fit(self, x: Any, y: Any, *args: Any, **kwargs: Any) -> None:
         raise_not_implemented("cascade.models.BasicModel", "fit")
 
@@ -103,6 +109,9 @@ class BasicModel(Model):
     def load(cls, path: str, check_hash: bool = True) -> "BasicModel":
         """
         Loads the model from path provided. Path should be a folder
+
+        If the model was saved with ``memory_map=True``, its buffers are
+        mapped into memory and are read lazily when accessed
         """
         if not os.path.isdir(path):
             raise ValueError(f"Error when loading a model - {path} is not a folder")
@@ -112,6 +121,9 @@ class BasicModel(Model):
         # if check_hash:
         #     cls._check_model_hash(path)
 
+        if os.path.exists(path + BUFFERS_SUFFIX):
+            return load_with_buffers(path)
+
         with open(path, "rb") as f:
             model = pickle.load(f)
         return model
@@ -125,11 +137,21 @@ class BasicModel(Model):
         if not exists and saves there as ``model.pkl``
         """
         super().save(path)
+        self._dump(self, os.path.join(path, "model.pkl"))
 
-        path = os.path.join(path, "model.pkl")
+    def _dump(self, obj: Any, path: str) -> None:
+        """
+        Pickles the object taking ``memory_map`` into account
+        """
+        if self.memory_map:
+            dump_with_buffers(obj, path)
+            return
 
         with open(path, "wb") as f:
-            pickle.dump(self, f)
+            pickle.dump(obj, f)
+        # Buffers of the previous save would be used on load
+        if os.path.exists(path + BUFFERS_SUFFIX):
+            os.remove(path + BUFFERS_SUFFIX)
 
     def save_artifact(self, path: str, *args: Any, **kwargs: Any) -> None:
         """
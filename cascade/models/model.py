@@ -22,6 +22,7 @@ from typing import Any, Callable, Optional, Union
 import pendulum
 
 from ..base import Meta, Traceable, raise_not_implemented
+from ..base.blob_store import current_blob_store
 from ..data import Dataset
 from ..metrics import Metric, MetricType
 
@@ -135,7 +136,12 @@ class Model(Traceable):
             files_folder = os.path.join(path, "files")
             os.makedirs(files_folder, exist_ok=True)
 
-            copyfile(filepath, os.path.join(files_folder, filename))
+            # Lines that deduplicate files set the store to copy through
+            store = current_blob_store()
+            if store is not None:
+                store.copy(filepath, os.path.join(files_folder, filename))
+            else:
+                copyfile(filepath, os.path.join(files_folder, filename))
 
     def load_artifact(self, path: str, *args: Any, **kwargs: Any) -> None:
         """
@@ -15,17 +15,16 @@ limitations under the License.
 """
 
 import os
-import socket
 import traceback
-from getpass import getuser
 from typing import Any, Dict, List, Optional, Type, Union
 
 import pendulum
 from typing_extensions import Literal, deprecated
 
-from ..base import Meta, MetaHandler, TraceableOnDisk
-from ..base.utils import (generate_slug, get_latest_commit_hash,
-                          get_python_version, get_uncommitted_changes)
+from ..base import Meta, MetaHandler, SlugIndex, TraceableOnDisk
+from ..base.utils import (generate_slug, get_hostname, get_latest_commit_hash,
+                          get_python_version, get_uncommitted_changes,
+                          get_user)
 from ..version import __version__
 from .model import Model
 
@@ -44,7 +43,7 @@ class ModelLine(TraceableOnDisk):
         self,
         folder: str,
         model_cls: Type[Any] = Model,
-        meta_fmt: Literal[".json", ".yml", ".yaml", None] = None,
+        meta_fmt: Literal[".json", ".yml", ".yaml", ".msgpack", None] = None,
         **kwargs: Any,
     ) -> None:
         """
@@ -57,7 +56,7 @@ class ModelLine(TraceableOnDisk):
             If folder does not exist, creates it
         model_cls: type, optional
             A class of models in line. ModelLine uses this class to reconstruct a model
-        meta_fmt: Literal[".json", ".yml", ".yaml", None], optional
+        meta_fmt: Literal[".json", ".yml", ".yaml", ".msgpack", None], optional
             Format in which to store meta data.
         See also
         --------
@@ -272,8 +271,8 @@ class ModelLine(TraceableOnDisk):
         meta[0]["slug"] = slug
         meta[0]["saved_at"] = pendulum.now(tz="UTC")
         meta[0]["python_version"] = get_python_version()
-        meta[0]["user"] = getuser()
-        meta[0]["host"] = socket.gethostname()
+        meta[0]["user"] = get_user()
+        meta[0]["host"] = get_hostname()
 
         git_commit = get_latest_commit_hash()
         if git_commit is not None:
@@ -314,6 +313,7 @@ class ModelLine(TraceableOnDisk):
 
         MetaHandler.write(os.path.join(full_path, "meta" + self._meta_fmt), meta)
         self._model_names.append(folder_name)
+        SlugIndex.notify(full_path, slug)
         self.sync_meta()
 
     def __repr__(self) -> str:
@@ -13,11 +13,12 @@ limitations under the License.
 
 import os
 import shutil
+import sqlite3
 from typing import Any, Dict, Iterable, Iterator, List, Type, Union
 
 from typing_extensions import Literal, deprecated
 
-from ..base import Meta, Traceable, TraceableOnDisk
+from ..base import Meta, MetaHandler, SlugIndex, Traceable, TraceableOnDisk
 from ..data import T
 from ..version import __version__
 from .model import Model
@@ -152,7 +153,7 @@ class ModelRepo(Repo, TraceableOnDisk):
         *args: Any,
         lines: Union[Iterable[ModelLine], None] = None,
         overwrite: bool = False,
-        meta_fmt: Literal[".json", ".yml", ".yaml"] = ".json",
+        meta_fmt: Literal[".json", ".yml", ".yaml", ".msgpack"] = ".json",
         model_cls: Union[Type, Dict[str, Type]] = Model,
         **kwargs: Any,
     ) -> None:
@@ -168,9 +169,9 @@ class ModelRepo(Repo, TraceableOnDisk):
         overwrite: bool
             if True will remove folder that is passed in first argument and start a new repo
             in that place
-        meta_fmt: Literal['.json', '.yml', '.yaml']
+        meta_fmt: Literal['.json', '.yml', '.yaml', '.msgpack']
             extension of repo's metadata files and that will be assigned to the lines by default
-            ``.json`` and ``.yml`` or ``.yaml`` are supported
+            ``.json``, ``.yml`` or ``.yaml`` and ``.msgpack`` are supported
         model_cls:
             Default class for any ModelLine in repo
         See also
@@ -298,6 +299,12 @@ class ModelRepo(Repo, TraceableOnDisk):
         FileNotFoundError
             Raises if failed to find the model with slug specified
         """
+        try:
+            path = SlugIndex.find(self._root, model)
+        except (sqlite3.Error, OSError):
+            path = None
+        if path is not None:
+            return MetaHandler.read_dir(path)
 
         for name in self._lines:
             try:
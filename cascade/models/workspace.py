@@ -33,7 +33,7 @@ class Workspace(TraceableOnDisk):
     def __init__(
         self,
         path: str,
-        meta_fmt: Literal[".json", ".yml", ".yaml"] = ".json",
+        meta_fmt: Literal[".json", ".yml", ".yaml", ".msgpack"] = ".json",
         default_repo: Optional[str] = None,
         *args: Any,
         **kwargs: Any,
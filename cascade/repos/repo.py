@@ -16,12 +16,15 @@ limitations under the License.
 
 import os
 import shutil
-from typing import Any, List, Optional, Union
+import sqlite3
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from typing_extensions import Literal
 
-from ..base import Meta, TraceableOnDisk, ZeroMetaError
+from ..base import Meta, MetaHandler, SlugIndex, TraceableOnDisk, ZeroMetaError
+from ..base.utils import dir_state
 from ..lines import Line
+from ..version import __version__
 from .base_repo import BaseRepo
 from .line_factory import LineFactory
 
@@ -48,7 +51,7 @@ class Repo(BaseRepo, TraceableOnDisk):
         folder: str,
         *args: Any,
         overwrite: bool = False,
-        meta_fmt: Literal[".json", ".yml", ".yaml"] = ".json",
+        meta_fmt: Literal[".json", ".yml", ".yaml", ".msgpack"] = ".json",
         **kwargs: Any,
     ) -> None:
         """
@@ -60,9 +63,11 @@ class Repo(BaseRepo, TraceableOnDisk):
         overwrite: bool
             if True will remove folder that is passed in first argument and start a new repo
             in that place
-        meta_fmt: Literal['.json', '.yml', '.yaml']
+        readonly: bool
+            if True, the repo and the lines opened from it never write on disk
+        meta_fmt: Literal['.json', '.yml', '.yaml', '.msgpack']
             extension of repo's metadata files and that will be assigned to the lines by default
-            ``.json`` and ``.yml`` or ``.yaml`` are supported
+            ``.json``, ``.yml`` or ``.yaml`` and ``.msgpack`` are supported
 
         See also
         --------
@@ -72,20 +77,33 @@ class Repo(BaseRepo, TraceableOnDisk):
         """
         super().__init__(path=folder, root=folder, meta_fmt=meta_fmt, *args, **kwargs)
 
+        if self._readonly:
+            if overwrite:
+                raise ValueError("Cannot overwrite the repo opened with readonly=True")
+            if not os.path.isdir(self._root):
+                raise FileNotFoundError(f"Repo {self._root} does not exist")
+
         if overwrite and os.path.exists(self._root):
             shutil.rmtree(self._root)
+            self._disk_meta = None
 
         os.makedirs(self._root, exist_ok=True)
+        # Lines that were already opened with the state
+        # of their folders at the time of opening
+        self._line_cache: Dict[str, Tuple[Any, Line]] = {}
         self._lines = {
             name: {"args": [], "kwargs": dict()}
             for name in sorted(os.listdir(self._root))
-            if os.path.isdir(os.path.join(self._root, name))
+            # Hidden folders are service ones like the blob store
+            if os.path.isdir(os.path.join(self._root, name)) and not name.startswith(".")
         }
 
         if "lines" in kwargs:
             raise ValueError("lines was removed in 0.14.0, consider using add_line method instead")
 
-        self.sync_meta()
+        self._sync_meta_on_open(
+            {"root": self._root, "len": len(self), "cascade_version": __version__}
+        )
 
     def _new_line_name(self):
         n = len(self)
@@ -114,7 +132,7 @@ class Repo(BaseRepo, TraceableOnDisk):
         name: Optional[str] = None,
         line_type: Literal["data", "model", None] = "model",
         *args: Any,
-        meta_fmt: Literal[".json", ".yml", ".yaml", None] = None,
+        meta_fmt: Literal[".json", ".yml", ".yaml", ".msgpack", None] = None,
         **kwargs: Any,
     ) -> Line:
         """
@@ -140,7 +158,7 @@ class Repo(BaseRepo, TraceableOnDisk):
             using f'{len(self):0>5d}', by default None
         line_type : Literal["data", "model"]], by default "model"
             The type of model line to create, by default None
-        meta_fmt : Literal[".json", ".yml", ".yaml", None], by default None
+        meta_fmt : Literal[".json", ".yml", ".yaml", ".msgpack", None], by default None
             Format of meta files. Supported values are the same as for repo.
             If omitted, inherits format from repo., by default None
 
@@ -153,11 +171,14 @@ class Repo(BaseRepo, TraceableOnDisk):
         ------
         RuntimeError
             If line with the computed name already exists
+        ReadOnlyError
+            If the repo was opened with ``readonly=True``
         TypeError
             If type passed is not compatible with line
         IOError
             If no meta was found and no line_type was passed
         """
+        self._check_writable()
         if name is None:
             name = self._new_line_name()
             assert name not in self._lines, (
@@ -170,6 +191,7 @@ class Repo(BaseRepo, TraceableOnDisk):
             meta_fmt = self._meta_fmt
 
         self._lines[name] = {"args": args, "kwargs": {"meta_fmt": meta_fmt, **kwargs}}
+        self._line_cache.pop(name, None)
         self.sync_meta()
 
         if line_type is None:
@@ -192,6 +214,9 @@ class Repo(BaseRepo, TraceableOnDisk):
 
     def __getitem__(self, key: Union[str, int]):
         """
+        Lines are cached and the same object is returned again while
+        the folder of the line stays unchanged on disk.
+
         Returns
         -------
         line: Line
@@ -202,15 +227,26 @@ class Repo(BaseRepo, TraceableOnDisk):
         elif not isinstance(key, str):
             raise TypeError(f"{type(key)} is not supported as key")
 
-        if key in self._lines:
-            return LineFactory.read(
-                os.path.join(self._root, key),
-                *self._lines[key]["args"],
-                **self._lines[key]["kwargs"],
-            )
-        else:
+        if key not in self._lines:
             raise KeyError(f"Line {key} does not exist in {self}")
 
+        path = os.path.join(self._root, key)
+        state = dir_state(path)
+        cached = self._line_cache.get(key)
+        if state is not None and cached is not None and cached[0] == state:
+            return cached[1]
+
+        line = LineFactory.read(
+            path,
+            *self._lines[key]["args"],
+            **self._lines[key]["kwargs"],
+            readonly=self._readonly,
+        )
+        # The state before opening is stored, so if opening
+        # wrote anything, the line is reopened once more next time
+        self._line_cache[key] = (state, line)
+        return line
+
     def __repr__(self) -> str:
         return f"Repo in {self._root} of {len(self)} lines"
 
@@ -219,7 +255,8 @@ class Repo(BaseRepo, TraceableOnDisk):
         Updates internal state
         """
         self._update_lines()
-        self.sync_meta()
+        if not self._readonly:
+            self.sync_meta()
 
     def load_obj_meta(self, obj: str) -> Meta:
         """
@@ -240,14 +277,17 @@ class Repo(BaseRepo, TraceableOnDisk):
         FileNotFoundError
             Raises if failed to find the obj with slug specified
         """
+        if isinstance(obj, str):
+            try:
+                path = SlugIndex.find(self._root, obj, create=not self._readonly)
+            except (sqlite3.Error, OSError):
+                path = None
+            if path is not None:
+                return MetaHandler.read_dir(path)
 
         for name in self._lines:
             try:
-                line = LineFactory.read(
-                    os.path.join(self._root, name),
-                    *self._lines[name]["args"],
-                    **self._lines[name]["kwargs"],
-                )
+                line = self[name]
                 meta = line.load_obj_meta(obj)
             except FileNotFoundError:
                 continue
@@ -259,6 +299,7 @@ class Repo(BaseRepo, TraceableOnDisk):
         for name in sorted(os.listdir(self._root)):
             if (
                 os.path.isdir(os.path.join(self._root, name))
+                and not name.startswith(".")  # noqa: W503
                 and name not in self._lines  # noqa: W503
             ):
                 self._lines[name] = {"args": [], "kwargs": dict()}
@@ -277,3 +318,35 @@ class Repo(BaseRepo, TraceableOnDisk):
         Returns list of line names.
         """
         return list(self._lines.keys())
+
+    def export(
+        self,
+        path: str,
+        fmt: Literal["parquet", "arrow"] = "parquet",
+        append: bool = False,
+        batch_size: int = 1000,
+    ) -> int:
+        """
+        Exports meta of all objects in the repo into a columnar format.
+        See ``cascade.meta.MetaExporter`` for details.
+
+        Parameters
+        ----------
+        path : str
+            Directory where to write the files
+        fmt : Literal["parquet", "arrow"], optional
+            Format of the files, by default "parquet"
+        append : bool, optional
+            If True, exports only the objects that were not exported
+            into this directory before, by default False
+        batch_size : int, optional
+            The number of objects in one file, by default 1000
+
+        Returns
+        -------
+        int
+            The number of exported objects
+        """
+        from ..meta import MetaExporter
+
+        return MetaExporter(self, batch_size=batch_size).export(path, fmt=fmt, append=append)
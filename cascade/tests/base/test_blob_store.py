@@ -0,0 +1,217 @@
+"""
+Copyright 2022-2025 Ilia Moiseev
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+import shutil
+import stat
+import sys
+
+MODULE_PATH = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.dirname(MODULE_PATH))
+
+from cascade.base import BlobStore, blob_store
+from cascade.lines import ModelLine
+from cascade.models import BasicModel
+from cascade.repos import Repo
+
+
+class ArtifactModel(BasicModel):
+    def save_artifact(self, path: str) -> None:
+        with open(os.path.join(path, "backbone.bin"), "wb") as f:
+            f.write(b"frozen" * 1000)
+
+
+def write(path, data):
+    with open(path, "w") as f:
+        f.write(data)
+
+
+def test_put(tmp_path_str):
+    store = BlobStore(os.path.join(tmp_path_str, ".blobs"))
+    a = os.path.join(tmp_path_str, "a")
+    b = os.path.join(tmp_path_str, "b")
+    c = os.path.join(tmp_path_str, "c")
+    write(a, "same")
+    write(b, "same")
+    write(c, "other")
+
+    assert store.put(a) == 0
+    assert store.put(b) == 4
+    assert store.put(c) == 0
+    # Already in the store
+    assert store.put(b) == 0
+
+    assert os.path.samefile(a, b)
+    assert not os.path.samefile(a, c)
+    assert not os.access(a, os.W_OK) or os.geteuid() == 0
+
+    stats = store.stats()
+    assert stats["blobs"] == 2
+    assert stats["links"] == 3
+    assert stats["saved"] == 4
+    assert stats["garbage"] == 0
+
+
+def test_put_does_not_change_file(tmp_path_str):
+    store = BlobStore(os.path.join(tmp_path_str, ".blobs"))
+    a = os.path.join(tmp_path_str, "a")
+    b = os.path.join(tmp_path_str, "b")
+    write(a, "same")
+    write(b, "same")
+    # The other name of the file that was put
+    other = os.path.join(tmp_path_str, "other")
+    os.link(a, other)
+
+    store.put(a)
+    store.put(b)
+    assert os.path.samefile(a, b)
+    assert not os.path.samefile(a, other)
+    assert os.stat(other).st_mode & stat.S_IWUSR
+
+    # Changing a detached file does not change others
+    store.detach(a)
+    assert not os.path.samefile(a, b)
+    write(a, "changed")
+    with open(b) as f:
+        assert f.read() == "same"
+    assert store.stats()["links"] == 1
+
+
+def test_put_clone(tmp_path_str, monkeypatch):
+    # Copy-on-write clones are independent files
+    monkeypatch.setattr(blob_store, "_clone", lambda src, dst: shutil.copyfile(src, dst) or True)
+
+    store = BlobStore(os.path.join(tmp_path_str, ".blobs"))
+    a = os.path.join(tmp_path_str, "a")
+    b = os.path.join(tmp_path_str, "b")
+    write(a, "same")
+    write(b, "same")
+    os.chmod(b, 0o640)
+
+    assert store.put(a) == 0
+    assert store.put(b) == 4
+    assert not os.path.samefile(a, b)
+    assert stat.S_IMODE(os.stat(b).st_mode) == 0o640
+
+    write(a, "changed")
+    with open(b) as f:
+        assert f.read() == "same"
+
+
+def test_gc_clone(tmp_path_str, monkeypatch):
+    # Clones do not change the number of links of blobs
+    monkeypatch.setattr(blob_store, "_clone", lambda src, dst: shutil.copyfile(src, dst) or True)
+
+    store = BlobStore(os.path.join(tmp_path_str, ".blobs"))
+    paths = [os.path.join(tmp_path_str, name) for name in "abc"]
+    for path in paths[:2]:
+        write(path, "same")
+        store.put(path)
+
+    stats = store.stats()
+    assert stats["blobs"] == 1
+    assert stats["links"] == 2
+    assert stats["saved"] == 4
+    assert stats["garbage"] == 0
+    assert store.gc() == (0, 0)
+
+    # The store still deduplicates after gc
+    write(paths[2], "same")
+    assert store.put(paths[2]) == 4
+
+    for path in paths:
+        os.remove(path)
+    assert store.stats()["garbage"] == 4
+    assert store.gc() == (1, 4)
+    assert os.listdir(os.path.join(tmp_path_str, ".blobs", ".refs")) == []
+
+
+def test_copy(tmp_path_str):
+    store = BlobStore(os.path.join(tmp_path_str, ".blobs"))
+    src = os.path.join(tmp_path_str, "config.yml")
+    write(src, "lr: 0.1")
+
+    dst1 = os.path.join(tmp_path_str, "1.yml")
+    dst2 = os.path.join(tmp_path_str, "2.yml")
+    assert store.copy(src, dst1) == 0
+    assert store.copy(src, dst2) == 7
+
+    assert os.path.samefile(dst1, dst2)
+    # The source is not linked to the store
+    assert not os.path.samefile(src, dst1)
+    with open(dst2) as f:
+        assert f.read() == "lr: 0.1"
+
+
+def test_gc(tmp_path_str):
+    store = BlobStore(os.path.join(tmp_path_str, ".blobs"))
+    a = os.path.join(tmp_path_str, "a")
+    b = os.path.join(tmp_path_str, "b")
+    write(a, "aaa")
+    write(b, "bb")
+    store.put(a)
+    store.put(b)
+
+    os.remove(a)
+    assert store.stats()["garbage"] == 3
+    assert store.gc() == (1, 3)
+    assert store.gc() == (0, 0)
+    assert store.stats()["blobs"] == 1
+
+    with open(b) as f:
+        assert f.read() == "bb"
+
+
+def test_line_dedup(tmp_path_str):
+    config = os.path.join(tmp_path_str, "config.yml")
+    write(config, "lr: 0.1")
+
+    line = ModelLine(os.path.join(tmp_path_str, "line"), model_cls=ArtifactModel, dedup=True)
+    for _ in range(3):
+        model = ArtifactModel()
+        model.add_file(config)
+        line.save(model)
+
+    names = line.get_item_names()
+    for name in names[1:]:
+        for file in ("files/config.yml", "artifacts/backbone.bin"):
+            assert os.path.samefile(
+                os.path.join(line.get_root(), names[0], file),
+                os.path.join(line.get_root(), name, file),
+            )
+
+    store = BlobStore(os.path.join(line.get_root(), ".blobs"))
+    assert store.stats()["blobs"] == 2
+    assert len(ModelLine(line.get_root(), model_cls=ArtifactModel)) == 3
+
+    shutil.rmtree(os.path.join(line.get_root(), names[0]))
+    shutil.rmtree(os.path.join(line.get_root(), names[1]))
+    assert store.gc() == (0, 0)
+
+
+def test_repo_dedup(tmp_path_str):
+    repo = Repo(os.path.join(tmp_path_str, "repo"))
+    for name in ("a", "b"):
+        line = repo.add_line(name, model_cls=ArtifactModel, dedup=True)
+        line.save(ArtifactModel())
+
+    # Lines share the store of the repo
+    assert os.path.samefile(
+        os.path.join(repo.get_root(), "a", "00000", "artifacts", "backbone.bin"),
+        os.path.join(repo.get_root(), "b", "00000", "artifacts", "backbone.bin"),
+    )
+    assert BlobStore(os.path.join(repo.get_root(), ".blobs")).stats()["blobs"] == 1
+    assert Repo(repo.get_root()).get_line_names() == ["a", "b"]
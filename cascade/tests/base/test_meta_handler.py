@@ -14,8 +14,12 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import datetime
+import importlib.util
+import math
 import os
 import sys
+from dataclasses import dataclass
 
 import numpy as np
 import pendulum
@@ -24,11 +28,17 @@ import pytest
 MODULE_PATH = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
 sys.path.append(os.path.dirname(MODULE_PATH))
 
-from cascade.base import (MetaHandler, MetaIOError, MultipleMetaError,
-                          ZeroMetaError, default_meta_format)
+from cascade.base import (JSONEncoder, MetaHandler, MetaIOError,
+                          MultipleMetaError, ZeroMetaError,
+                          default_meta_format, get_json_backend,
+                          set_json_backend)
 
+meta_formats = [".json", ".yml", ".yaml"]
+if importlib.util.find_spec("msgpack") is not None:
+    meta_formats.append(".msgpack")
 
-@pytest.mark.parametrize("ext", [".json", ".yml", ".yaml"])
+
+@pytest.mark.parametrize("ext", meta_formats)
 def test(tmp_path_str, ext):
     MetaHandler.write(
         os.path.join(tmp_path_str, "meta" + ext),
@@ -47,7 +57,7 @@ def test(tmp_path_str, ext):
     assert obj["none"] is None
 
 
-@pytest.mark.parametrize("ext", [".json", ".yml", ".yaml"])
+@pytest.mark.parametrize("ext", meta_formats)
 def test_overwrite(tmp_path_str, ext):
     tmp_path = os.path.join(tmp_path_str, "test_mh_ow" + ext)
 
@@ -72,14 +82,14 @@ def test_text(tmp_path_str, ext):
     assert obj[tmp_path] == info
 
 
-@pytest.mark.parametrize("ext", [".json", ".yml", ".yaml", ".txt", ".md"])
+@pytest.mark.parametrize("ext", [*meta_formats, ".txt", ".md"])
 def test_not_exist(ext):
     with pytest.raises(FileNotFoundError) as e:
         MetaHandler.read("this_file_does_not_exist" + ext)
     assert e.typename == "FileNotFoundError"
 
 
-@pytest.mark.parametrize("ext", [".json", ".yml", ".yaml"])
+@pytest.mark.parametrize("ext", meta_formats)
 def test_read_fail(tmp_path_str, ext):
     # Simulate broken syntax in file
     filename = os.path.join(tmp_path_str, "meta" + ext)
@@ -92,7 +102,7 @@ def test_read_fail(tmp_path_str, ext):
     assert filename in e.value.args[0]
 
 
-@pytest.mark.parametrize("ext", [".json", ".yml", ".yaml"])
+@pytest.mark.parametrize("ext", meta_formats)
 def test_empty_file(tmp_path_str, ext):
     # Simulate empty file
     filename = os.path.join(tmp_path_str, "meta" + ext)
@@ -105,7 +115,7 @@ def test_empty_file(tmp_path_str, ext):
     assert filename in e.value.args[0]
 
 
-@pytest.mark.parametrize("ext", [".json", ".yml", ".yaml"])
+@pytest.mark.parametrize("ext", meta_formats)
 def test_random_pipeline_meta(tmp_path_str, dataset, ext):
     filename = os.path.join(tmp_path_str, "meta" + ext)
 
@@ -113,7 +123,7 @@ def test_random_pipeline_meta(tmp_path_str, dataset, ext):
     MetaHandler.write(filename, meta)
 
 
-@pytest.mark.parametrize("ext", [".json", ".yml", ".yaml"])
+@pytest.mark.parametrize("ext", meta_formats)
 def test_directory_reading(tmp_path_str, ext):
     meta = [{"type": "model"}]
 
@@ -138,6 +148,37 @@ def test_multiple_meta(tmp_path_str):
         MetaHandler.read_dir(tmp_path_str)
 
 
+@pytest.mark.parametrize("ext", meta_formats)
+def test_directory_reading_known_fmt(tmp_path_str, ext):
+    meta = [{"type": "model"}]
+    MetaHandler.write(os.path.join(tmp_path_str, "meta" + ext), meta)
+
+    assert MetaHandler.read_dir(tmp_path_str, meta_fmt=ext) == meta
+    # Wrong guess falls back to the search
+    other = ".yml" if ext == ".json" else ".json"
+    assert MetaHandler.read_dir(tmp_path_str, meta_fmt=other) == meta
+
+
+def test_find_meta_path_cache(tmp_path_str):
+    meta = [{"type": "model"}]
+    MetaHandler.write(os.path.join(tmp_path_str, "meta.json"), meta)
+
+    assert MetaHandler.find_meta_path(tmp_path_str) == os.path.join(tmp_path_str, "meta.json")
+
+    # The cache should see files created and removed after the first search
+    MetaHandler.write(os.path.join(tmp_path_str, "meta.yml"), meta)
+    with pytest.raises(MultipleMetaError):
+        MetaHandler.find_meta_path(tmp_path_str)
+
+    os.remove(os.path.join(tmp_path_str, "meta.json"))
+    assert MetaHandler.find_meta_path(tmp_path_str) == os.path.join(tmp_path_str, "meta.yml")
+    assert MetaHandler.read_dir(tmp_path_str) == meta
+
+    os.remove(os.path.join(tmp_path_str, "meta.yml"))
+    with pytest.raises(ZeroMetaError):
+        MetaHandler.read_dir(tmp_path_str)
+
+
 def test_directory_writing(tmp_path_str):
     meta = [{"type": "model"}]
 
@@ -153,3 +194,111 @@ def test_directory_writing(tmp_path_str):
         os.path.join(tmp_path_str, "meta" + default_meta_format)
     )
     assert from_file == meta
+
+
+@dataclass
+class Point:
+    x: int
+    y: float
+
+
+def complex_meta():
+    return {
+        "int": np.int64(1),
+        "float": np.float32(0.5),
+        "array": np.arange(3),
+        "date": datetime.datetime(2024, 1, 2, 3, 4, 5),
+        "delta": datetime.timedelta(seconds=61),
+        "set": {1},
+        "tuple": (1, "a"),
+        "point": Point(1, np.float64(2.0)),
+        "type": int,
+        "nested": [{1: True, None: np.bool_(False)}],
+        "big": 2**70,
+        "path": "a/b",
+    }
+
+
+@pytest.fixture(params=["ujson", "orjson", "json"])
+def json_backend(request):
+    pytest.importorskip(request.param)
+    default = get_json_backend()
+    set_json_backend(request.param)
+    yield request.param
+    set_json_backend(default)
+
+
+def test_json_backends(tmp_path_str, json_backend):
+    path = os.path.join(tmp_path_str, "meta.json")
+    meta = complex_meta()
+    MetaHandler.write(path, meta)
+
+    assert MetaHandler.read(path) == JSONEncoder().obj_to_dict(meta)
+
+
+def test_json_backends_nan(tmp_path_str, json_backend):
+    path = os.path.join(tmp_path_str, "meta.json")
+    MetaHandler.write(path, {"value": float("nan")})
+
+    value = MetaHandler.read(path)["value"]
+    if json_backend == "orjson":
+        assert value is None
+    else:
+        assert math.isnan(value)
+
+
+def test_json_backends_read_nan(tmp_path_str, json_backend):
+    path = os.path.join(tmp_path_str, "meta.json")
+    with open(path, "w") as f:
+        f.write('{"value": NaN}')
+
+    assert math.isnan(MetaHandler.read(path)["value"])
+
+
+def test_json_backends_not_serializable(tmp_path_str, json_backend):
+    path = os.path.join(tmp_path_str, "meta.json")
+    with pytest.raises(TypeError):
+        MetaHandler.write(path, {"value": object()})
+
+
+def test_default_json_backend(tmp_path_str):
+    default = get_json_backend()
+    try:
+        assert set_json_backend() == "json"
+
+        path = os.path.join(tmp_path_str, "meta.json")
+        MetaHandler.write(path, {"lr": 1e-7})
+        with open(path) as f:
+            assert "1e-07" in f.read()
+    finally:
+        set_json_backend(default)
+
+
+def test_unknown_json_backend():
+    with pytest.raises(ValueError):
+        set_json_backend("simplejson")
+
+
+def test_to_builtin():
+    meta = complex_meta()
+    meta["float_key"] = {1.5: 1, False: 2}
+    meta["nan"] = float("nan")
+    encoder = JSONEncoder()
+
+    converted = encoder.to_builtin(meta)
+    expected = encoder.obj_to_dict(meta)
+    assert math.isnan(converted.pop("nan"))
+    assert math.isnan(expected.pop("nan"))
+    assert converted == expected
+
+
+def test_msgpack_same_as_json(tmp_path_str):
+    pytest.importorskip("msgpack")
+    meta = complex_meta()
+    MetaHandler.write(os.path.join(tmp_path_str, "meta.json"), meta)
+    MetaHandler.write(os.path.join(tmp_path_str, "meta.msgpack"), meta)
+
+    from_msgpack = MetaHandler.read(os.path.join(tmp_path_str, "meta.msgpack"))
+    from_json = MetaHandler.read(os.path.join(tmp_path_str, "meta.json"))
+    assert from_msgpack.pop("big") == str(from_json.pop("big"))
+    assert from_msgpack == from_json
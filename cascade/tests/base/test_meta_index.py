@@ -0,0 +1,211 @@
+"""
+Copyright 2022-2025 Ilia Moiseev
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+import pickle
+import sqlite3
+import sys
+
+import pytest
+
+MODULE_PATH = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.dirname(MODULE_PATH))
+
+from cascade.base import MetaHandler, MetaIndex, ZeroMetaError
+from cascade.base.meta_index import INDEX_FILENAME
+from cascade.models import BasicModel
+from cascade.meta import MetricViewer
+from cascade.repos import Repo
+
+
+def init_repo(path):
+    repo = Repo(path)
+    line = repo.add_line()
+    for i in range(3):
+        model = BasicModel(a=i)
+        line.save(model)
+    return repo, line
+
+
+def test_refresh(tmp_path_str):
+    init_repo(tmp_path_str)
+
+    with MetaIndex(tmp_path_str) as index:
+        index.refresh()
+        # repo + line + 3 models
+        assert len(index) == 5
+
+        meta = index.read_dir(os.path.join(tmp_path_str, "00000", "00001"))
+        assert meta[0]["params"] == {"a": 1}
+
+
+def test_read_only_changed(tmp_path_str, monkeypatch):
+    init_repo(tmp_path_str)
+    model_path = os.path.join(tmp_path_str, "00000", "00000")
+
+    with MetaIndex(tmp_path_str) as index:
+        index.refresh()
+
+        calls = []
+        read = MetaHandler.read
+
+        def counting_read(path):
+            calls.append(path)
+            return read(path)
+
+        monkeypatch.setattr(MetaHandler, "read", counting_read)
+
+        index.read_dir(model_path)
+        assert len(calls) == 0
+
+        meta = MetaHandler.read_dir(model_path)
+        meta[0]["params"]["a"] = 100
+        MetaHandler.write_dir(model_path, meta)
+        calls.clear()
+
+        meta = index.read_dir(model_path)
+        assert len(calls) == 1
+        assert meta[0]["params"]["a"] == 100
+
+
+def test_save_updates_index(tmp_path_str):
+    repo, line = init_repo(tmp_path_str)
+    with MetaIndex(tmp_path_str) as index:
+        index.refresh()
+
+    line.save(BasicModel(a=3))
+    line.tag("tag")
+
+    with MetaIndex(tmp_path_str) as index:
+        assert len(index) == 6
+
+        paths = dict(index.items())
+        line_meta = paths[os.path.join(line.get_root(), "meta.json")]
+        assert line_meta[0]["tags"] == ["tag"]
+        assert line_meta[0]["len"] == 4
+
+
+def test_removed(tmp_path_str):
+    init_repo(tmp_path_str)
+    model_path = os.path.join(tmp_path_str, "00000", "00002")
+
+    with MetaIndex(tmp_path_str) as index:
+        index.refresh()
+        os.remove(os.path.join(model_path, "meta.json"))
+        index.refresh()
+        assert len(index) == 4
+
+        with pytest.raises(ZeroMetaError):
+            index.read_dir(model_path)
+
+
+def test_no_index_created_on_save(tmp_path_str):
+    init_repo(tmp_path_str)
+    assert MetaIndex.find(tmp_path_str) is None
+
+
+def test_refresh_sharded(tmp_path_str):
+    repo = Repo(tmp_path_str)
+    line = repo.add_line(layout="sharded")
+    for i in range(3):
+        line.save(BasicModel(a=i))
+
+    with MetaIndex(tmp_path_str) as index:
+        index.refresh()
+        assert len(index) == 5
+
+        meta = index.read_dir(os.path.join(tmp_path_str, "00000", "0000", "00000001"))
+        assert meta[0]["params"] == {"a": 1}
+
+
+def test_open(tmp_path_str):
+    init_repo(tmp_path_str)
+    assert MetaIndex.open(tmp_path_str) is None
+    assert not os.path.exists(os.path.join(tmp_path_str, INDEX_FILENAME))
+
+    with MetaIndex(tmp_path_str) as index:
+        index.refresh()
+
+    model_path = os.path.join(tmp_path_str, "00000", "00001")
+    index = MetaIndex.open(tmp_path_str)
+    try:
+        assert index.is_readonly()
+        assert index.read_dir(model_path)[0]["params"] == {"a": 1}
+        with pytest.raises(sqlite3.Error):
+            index._conn.execute("DELETE FROM meta")
+    finally:
+        index.close()
+
+    # Not an index
+    with open(os.path.join(tmp_path_str, INDEX_FILENAME), "w") as f:
+        f.write("garbage")
+    assert MetaIndex.open(tmp_path_str) is None
+
+
+def test_readonly_does_not_write(tmp_path_str):
+    _, line = init_repo(tmp_path_str)
+    with MetaIndex(tmp_path_str) as index:
+        index.refresh()
+    with open(os.path.join(tmp_path_str, INDEX_FILENAME), "rb") as f:
+        before = f.read()
+
+    line.save(BasicModel(a=3))
+    # Written without the index
+    os.remove(os.path.join(tmp_path_str, INDEX_FILENAME))
+    with open(os.path.join(tmp_path_str, INDEX_FILENAME), "wb") as f:
+        f.write(before)
+
+    index = MetaIndex.open(tmp_path_str)
+    try:
+        meta = index.read_dir(os.path.join(tmp_path_str, "00000", "00003"))
+        assert meta[0]["params"] == {"a": 3}
+        index.refresh()
+    finally:
+        index.close()
+
+    with open(os.path.join(tmp_path_str, INDEX_FILENAME), "rb") as f:
+        assert f.read() == before
+
+
+def test_viewer_does_not_create_index(tmp_path_str):
+    repo, _ = init_repo(tmp_path_str)
+    MetricViewer(repo)
+    assert not os.path.exists(os.path.join(tmp_path_str, INDEX_FILENAME))
+
+
+class Payload:
+    def __reduce__(self):
+        return (os.mkdir, (os.path.join(os.environ["CASCADE_PAYLOAD_DIR"], "pwned"),))
+
+
+def test_meta_stored_as_json(tmp_path_str, monkeypatch):
+    init_repo(tmp_path_str)
+    model_path = os.path.join(tmp_path_str, "00000", "00000")
+    with MetaIndex(tmp_path_str) as index:
+        index.refresh()
+        (stored,) = index._conn.execute(
+            "SELECT meta FROM meta WHERE dir = ?", (os.path.join("00000", "00000"),)
+        ).fetchone()
+        assert isinstance(stored, str)
+
+        # Planted pickle is never loaded
+        monkeypatch.setenv("CASCADE_PAYLOAD_DIR", tmp_path_str)
+        index._conn.execute("UPDATE meta SET meta = ?", (pickle.dumps(Payload()),))
+        index._conn.commit()
+
+        assert index.read_dir(model_path)[0]["params"] == {"a": 0}
+        assert len(list(index.items())) == 5
+    assert not os.path.exists(os.path.join(tmp_path_str, "pwned"))
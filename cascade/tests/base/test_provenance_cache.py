@@ -0,0 +1,155 @@
+"""
+Copyright 2022-2025 Ilia Moiseev
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+MODULE_PATH = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.dirname(MODULE_PATH))
+
+from cascade.base import utils
+from cascade.base.utils import (clear_provenance_cache, get_latest_commit_hash,
+                                get_uncommitted_changes)
+from cascade.lines import ModelLine
+from cascade.models import BasicModel
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+
+def git(*args):
+    subprocess.run(
+        [
+            "git",
+            "-c",
+            "user.name=test",
+            "-c",
+            "user.email=test@test",
+            "-c",
+            "commit.gpgsign=false",
+            *args,
+        ],
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture
+def git_repo(tmp_path_str, monkeypatch):
+    monkeypatch.chdir(tmp_path_str)
+    monkeypatch.delenv("GIT_DIR", raising=False)
+    git("init")
+    with open("file.txt", "w") as f:
+        f.write("1")
+    git("add", "file.txt")
+    git("commit", "-m", "first")
+
+    clear_provenance_cache()
+    calls = []
+    run = subprocess.run
+
+    def counting_run(*args, **kwargs):
+        calls.append(args[0])
+        return run(*args, **kwargs)
+
+    monkeypatch.setattr(utils.subprocess, "run", counting_run)
+    yield tmp_path_str, calls
+    clear_provenance_cache()
+
+
+def test_commit_cached(git_repo):
+    path, calls = git_repo
+
+    commit = get_latest_commit_hash()
+    assert commit
+    assert get_latest_commit_hash() == commit
+    assert len(calls) == 1
+
+    with open("file.txt", "w") as f:
+        f.write("2")
+    git("commit", "-am", "second")
+    calls.clear()
+
+    new_commit = get_latest_commit_hash()
+    assert new_commit != commit
+    assert len(calls) == 1
+
+
+def test_commit_in_worktree(git_repo, monkeypatch):
+    path, calls = git_repo
+    git("worktree", "add", "-b", "feature", "wt")
+    monkeypatch.chdir(os.path.join(path, "wt"))
+
+    commit = get_latest_commit_hash()
+    assert get_latest_commit_hash() == commit
+
+    # The branch is updated in the git dir of the main repository
+    with open("file.txt", "w") as f:
+        f.write("2")
+    git("commit", "-am", "second")
+    new_commit = get_latest_commit_hash()
+    assert new_commit != commit
+    assert new_commit == subprocess.run(
+        ["git", "rev-parse", "HEAD"], capture_output=True, text=True
+    ).stdout.strip()
+
+
+def test_uncommitted_ttl(git_repo, monkeypatch):
+    path, calls = git_repo
+
+    assert get_uncommitted_changes() is None
+    with open("file.txt", "w") as f:
+        f.write("2")
+
+    # Changes of the working tree are seen only after TTL
+    assert get_uncommitted_changes() is None
+    assert len(calls) == 1
+
+    monkeypatch.setattr(utils, "UNCOMMITTED_CHANGES_TTL", 0)
+    assert get_uncommitted_changes() == ["M file.txt"]
+
+    # Staging changes the index and is seen immediately
+    monkeypatch.setattr(utils, "UNCOMMITTED_CHANGES_TTL", 1000)
+    git("add", "file.txt")
+    assert get_uncommitted_changes() == ["M  file.txt"]
+
+
+def test_no_calls_outside_repo(tmp_path_str, monkeypatch):
+    if utils._find_git_dir(tmp_path_str) is not None:
+        pytest.skip("Temporary folder is inside of a git repository")
+
+    monkeypatch.chdir(tmp_path_str)
+    monkeypatch.delenv("GIT_DIR", raising=False)
+
+    def failing_run(*args, **kwargs):
+        raise AssertionError("git should not be called")
+
+    monkeypatch.setattr(utils.subprocess, "run", failing_run)
+    assert get_latest_commit_hash() == ""
+    assert get_uncommitted_changes() is None
+
+
+def test_save_does_not_call_git_each_time(git_repo):
+    path, calls = git_repo
+    line = ModelLine(os.path.join(path, "line"))
+    for _ in range(5):
+        line.save(BasicModel(), only_meta=True)
+
+    assert len(calls) == 2
+    assert line.load_model_meta(4)[0]["git_commit"] == get_latest_commit_hash()
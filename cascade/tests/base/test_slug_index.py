@@ -0,0 +1,85 @@
+"""
+Copyright 2022-2025 Ilia Moiseev
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+import shutil
+import sys
+
+import pytest
+
+MODULE_PATH = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.dirname(MODULE_PATH))
+
+from cascade.base import SlugIndex
+from cascade.lines import ModelLine
+from cascade.models import BasicModel
+from cascade.repos import Repo
+from cascade.workspaces import Workspace
+
+
+def save_models(line, n):
+    slugs = []
+    for i in range(n):
+        line.save(BasicModel(a=i))
+        slugs.append(line.load_model_meta(len(line) - 1)[0]["slug"])
+    return slugs
+
+
+def test_repo_lookup(tmp_path_str, monkeypatch):
+    repo = Repo(tmp_path_str)
+    slugs = save_models(repo.add_line(), 3) + save_models(repo.add_line(), 3)
+
+    assert not SlugIndex.exists(tmp_path_str)
+    assert repo.load_obj_meta(slugs[4])[0]["params"] == {"a": 1}
+    assert SlugIndex.exists(tmp_path_str)
+
+    # Now lines are not opened at all
+    def failing(*args, **kwargs):
+        raise AssertionError("Lines should not be opened")
+
+    monkeypatch.setattr(ModelLine, "__init__", failing)
+    for slug in slugs:
+        assert repo.load_obj_meta(slug)[0]["slug"] == slug
+
+
+def test_updated_on_save(tmp_path_str):
+    ws = Workspace(tmp_path_str)
+    line = ws.add_repo("repo").add_line()
+    save_models(line, 1)
+    with SlugIndex(tmp_path_str) as index:
+        index.rebuild()
+        assert len(index) == 1
+
+    slug = save_models(line, 1)[0]
+    with SlugIndex(tmp_path_str) as index:
+        assert len(index) == 2
+        assert index.get(slug) == os.path.join(line.get_root(), "00001")
+
+    assert ws.load_obj_meta(slug)[0]["slug"] == slug
+
+
+def test_moved_model(tmp_path_str):
+    repo = Repo(tmp_path_str)
+    line = repo.add_line()
+    slugs = save_models(line, 2)
+    repo.load_obj_meta(slugs[0])
+
+    # The index is stale, but the model is found by scan
+    shutil.move(os.path.join(line.get_root(), "00001"), os.path.join(line.get_root(), "00005"))
+    assert repo.load_obj_meta(slugs[1])[0]["slug"] == slugs[1]
+
+    with pytest.raises(FileNotFoundError):
+        repo.load_obj_meta("not_existing_slug")
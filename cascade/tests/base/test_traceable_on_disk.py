@@ -22,8 +22,8 @@ import pytest
 MODULE_PATH = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
 sys.path.append(os.path.dirname(MODULE_PATH))
 
-from cascade.base import (MetaHandler, Traceable, TraceableOnDisk,
-                          default_meta_format)
+from cascade.base import (MetaHandler, ReadOnlyError, Traceable,
+                          TraceableOnDisk, default_meta_format)
 
 
 @pytest.mark.parametrize("ext", [".json", ".yml", ".yaml"])
@@ -218,3 +218,71 @@ def test_comments(tmp_path_str):
     disk_meta = MetaHandler.read_dir(tmp_path_str)
     assert len(disk_meta[0]["comments"]) == 3
     assert disk_meta[0]["comments"][2]["id"] == "3"
+
+
+def test_batch_meta(tmp_path_str, monkeypatch):
+    trd = TraceableOnDisk(tmp_path_str, ".json")
+    trd.sync_meta()
+
+    syncs = []
+    sync_meta = trd.sync_meta
+    monkeypatch.setattr(trd, "sync_meta", lambda: syncs.append(sync_meta()))
+
+    with trd.batch_meta():
+        for i in range(10):
+            trd.tag(f"tag_{i}")
+        trd.comment("comment")
+        trd.link(name="link", uri="uri")
+
+        with trd.batch_meta():
+            trd.describe("description")
+
+        assert len(syncs) == 0
+        assert MetaHandler.read_dir(tmp_path_str)[0]["tags"] == []
+
+    assert len(syncs) == 1
+    meta = MetaHandler.read_dir(tmp_path_str)[0]
+    assert len(meta["tags"]) == 10
+    assert meta["comments"][0]["message"] == "comment"
+    assert meta["links"][0]["name"] == "link"
+    assert meta["description"] == "description"
+
+    trd.tag("after")
+    assert len(syncs) == 2
+
+
+def test_batch_meta_flush(tmp_path_str):
+    trd = TraceableOnDisk(tmp_path_str, ".json")
+    trd.sync_meta()
+
+    with pytest.raises(RuntimeError):
+        with trd.batch_meta():
+            trd.tag("first")
+            trd.flush()
+            assert MetaHandler.read_dir(tmp_path_str)[0]["tags"] == ["first"]
+
+            trd.tag("second")
+            raise RuntimeError()
+
+    assert set(MetaHandler.read_dir(tmp_path_str)[0]["tags"]) == {"first", "second"}
+
+
+def test_readonly(tmp_path_str):
+    trd = TraceableOnDisk(tmp_path_str, ".json")
+    trd.tag("a")
+
+    meta_path = os.path.join(tmp_path_str, "meta.json")
+    mtime = os.stat(meta_path).st_mtime_ns
+
+    trd = TraceableOnDisk(tmp_path_str, ".json", readonly=True)
+    assert trd.is_readonly()
+    assert trd.tags == {"a"}
+
+    with pytest.raises(ReadOnlyError):
+        trd.tag("b")
+    with pytest.raises(ReadOnlyError):
+        trd.sync_meta()
+
+    # The object is not changed if writing failed
+    assert trd.tags == {"a"}
+    assert os.stat(meta_path).st_mtime_ns == mtime
@@ -88,3 +88,23 @@ def test_rm_model_error(tmp_path_str):
             mocked_remove.assert_called_once_with(os.path.join(td, "artifacts", "artifact.txt"))
 
             assert os.path.exists(os.path.join(td, "artifacts", "artifact.txt"))
+
+
+def test_rm_line_dedup(tmp_path_str):
+    runner = CliRunner()
+    with runner.isolated_filesystem(temp_dir=tmp_path_str) as td:
+        line = ModelLine(td, dedup=True)
+        for i in range(3):
+            line.save(TestModel())
+
+        result = runner.invoke(cli, args=["artifact", "stats"])
+        assert result.exit_code == 0
+        assert "Blobs: 1" in result.output
+        assert "Linked files: 3" in result.output
+
+        result = runner.invoke(cli, args=["artifact", "rm", "-y"])
+        assert result.exit_code == 0
+        assert "Removed unused blobs: 1" in result.output
+
+        blobs = os.path.join(td, ".blobs")
+        assert sum(len(files) for _, _, files in os.walk(blobs)) == 0
@@ -41,3 +41,19 @@ def test(tmp_path_str):
         assert result.exit_code == 0
 
         assert meta[0]["slug"] in result.output
+
+
+def test_does_not_write(tmp_path_str):
+    runner = CliRunner()
+    with runner.isolated_filesystem(temp_dir=tmp_path_str) as td:
+        repo = Repo(td)
+        line = repo.add_line(model_cls=BasicModel)
+        line.save(line.create_model())
+
+        meta_path = os.path.join(line.get_root(), "meta.json")
+        mtime = os.stat(meta_path).st_mtime_ns
+
+        result = runner.invoke(cli, args=["cat", "-p", "0"])
+        assert result.exit_code == 0
+
+        assert os.stat(meta_path).st_mtime_ns == mtime
@@ -0,0 +1,57 @@
+"""
+Copyright 2022-2025 Ilia Moiseev
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import glob
+import os
+import sys
+
+import pytest
+from click.testing import CliRunner
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.dirname(SCRIPT_DIR))
+from cascade.cli.cli import cli
+from cascade.models import BasicModel
+from cascade.repos import Repo
+
+pytest.importorskip("msgpack")
+
+
+def test_convert(tmp_path_str):
+    runner = CliRunner()
+    with runner.isolated_filesystem(temp_dir=tmp_path_str) as td:
+        repo = Repo(td, meta_fmt=".yml")
+        line = repo.add_line()
+        for i in range(3):
+            line.save(BasicModel(a=i))
+        model_meta = repo.load_obj_meta(line.load_model_meta(0)[0]["slug"])
+
+        result = runner.invoke(cli, args=["convert", ".msgpack"])
+        assert result.exit_code == 0
+        assert "Converted 5 meta files" in result.output
+
+        assert glob.glob(os.path.join(td, "**", "meta.yml"), recursive=True) == []
+        assert len(glob.glob(os.path.join(td, "**", "meta.msgpack"), recursive=True)) == 5
+
+        repo = Repo(td)
+        line = repo[repo.get_line_names()[0]]
+        assert line.load_model_meta(0) == model_meta
+
+        # Meta of converted objects continues to be written in the new format
+        line.save(BasicModel(a=3))
+        line.tag("tag")
+        assert len(glob.glob(os.path.join(td, "**", "meta.msgpack"), recursive=True)) == 6
+        assert glob.glob(os.path.join(td, "**", "meta.json"), recursive=True) == []
@@ -0,0 +1,40 @@
+"""
+Copyright 2022-2025 Ilia Moiseev
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+import sys
+
+from click.testing import CliRunner
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.dirname(SCRIPT_DIR))
+from cascade.cli.cli import cli
+from cascade.lines import ModelLine
+from cascade.models import BasicModel
+
+
+def test_layout(tmp_path_str):
+    runner = CliRunner()
+    with runner.isolated_filesystem(temp_dir=tmp_path_str) as td:
+        line = ModelLine(td)
+        for _ in range(2):
+            line.save(BasicModel())
+
+        result = runner.invoke(cli, args=["layout", "sharded"])
+        assert result.exit_code == 0
+        assert "Moved 2 models into sharded layout" in result.output
+
+        assert ModelLine(td).get_model_names() == ["0000/00000000", "0000/00000001"]
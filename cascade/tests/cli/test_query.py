@@ -18,11 +18,15 @@ import os
 import re
 import sys
 
+import pytest
 from click.testing import CliRunner
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
 sys.path.append(os.path.dirname(SCRIPT_DIR))
+from cascade.base import MetaHandler, MetaIndex, ReadOnlyError
+from cascade.base.meta_index import INDEX_FILENAME
 from cascade.cli.cli import cli
+from cascade.lines import ModelLine
 from cascade.cli.query import Field, QueryParsingError, empty_field
 from cascade.tests.cli.common import init_repo
 
@@ -281,3 +285,60 @@ def test_field():
     assert f.params.a == 0
     assert f.l[0] == 1
     assert f.no is None
+
+
+def test_does_not_create_index(tmp_path_str):
+    runner = CliRunner()
+    with runner.isolated_filesystem(temp_dir=tmp_path_str) as td:
+        init_repo(td, PARAMS)
+
+        result = runner.invoke(cli, args=["query", "params.ord"])
+        assert result.exit_code == 0
+        assert not os.path.exists(os.path.join(td, INDEX_FILENAME))
+
+
+def test_does_not_update_index(tmp_path_str):
+    runner = CliRunner()
+    with runner.isolated_filesystem(temp_dir=tmp_path_str) as td:
+        init_repo(td, PARAMS)
+        with MetaIndex(td) as index:
+            index.refresh()
+        index_path = os.path.join(td, INDEX_FILENAME)
+
+        # Changed behind the index
+        meta_path = os.path.join(td, "00000", "00000", "meta.json")
+        meta = MetaHandler.read(meta_path)
+        meta[0]["params"]["ord"] = 100
+        MetaHandler.write(meta_path, meta)
+        with open(index_path, "rb") as f:
+            before = f.read()
+
+        result = runner.invoke(cli, args=["query", "params.ord", "filter", "params.ord == 100"])
+        assert result.exit_code == 0
+        assert "100" in result.output
+        with open(index_path, "rb") as f:
+            assert f.read() == before
+
+
+def test_broken_index(tmp_path_str):
+    runner = CliRunner()
+    with runner.isolated_filesystem(temp_dir=tmp_path_str) as td:
+        init_repo(td, PARAMS)
+        with open(os.path.join(td, INDEX_FILENAME), "w") as f:
+            f.write("not a database")
+
+        result = runner.invoke(cli, args=["query", "params.ord"])
+        assert result.exit_code == 0
+        assert "6" in result.output
+
+
+def test_readonly_line_rejects_writable_index(tmp_path_str):
+    init_repo(tmp_path_str, PARAMS)
+    line = ModelLine(os.path.join(tmp_path_str, "00000"), readonly=True)
+    with MetaIndex(tmp_path_str) as index:
+        with pytest.raises(ReadOnlyError):
+            line.set_index(index)
+    index = MetaIndex.open(tmp_path_str)
+    line.set_index(index)
+    assert len(list(line.iter_meta())) == len(PARAMS)
+    index.close()
@@ -16,6 +16,7 @@ limitations under the License.
 
 import os
 import sys
+import threading
 from typing import List
 
 import pytest
@@ -23,6 +24,7 @@ import pytest
 SCRIPT_DIR = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
 sys.path.append(os.path.dirname(SCRIPT_DIR))
 from cascade.cli.query import Executor, Query, QueryExecutionError, Result
+from cascade.lines.disk_line import DiskLine
 from cascade.tests.cli.common import init_repo
 
 
@@ -220,3 +222,114 @@ def test_dangerous_builtins(tmp_path_str: str, params: List[dict], query: Query)
     executor = Executor(tmp_path_str, "repo")
     with pytest.raises(QueryExecutionError):
         executor.execute(query)
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        Query(columns=["params.a"]),
+        Query(columns=["params.a"], filter_expr="params.a % 2 == 0"),
+        Query(columns=["params.a"], sort_expr="params.b", desc=True),
+        Query(columns=["params.a"], sort_expr="params.b", offset=3, limit=5),
+    ],
+)
+def test_parallel(tmp_path_str, query):
+    init_repo(tmp_path_str, [{"a": i, "b": (i * 7) % 5} for i in range(20)])
+
+    serial = Executor(tmp_path_str, "repo").execute(query)
+    parallel = Executor(tmp_path_str, "repo", jobs=4).execute(query)
+
+    assert serial.data == parallel.data
+
+
+def test_parallel_evaluation(tmp_path_str, monkeypatch):
+    init_repo(tmp_path_str, [{"a": i} for i in range(20)])
+
+    executor = Executor(tmp_path_str, "repo", jobs=4)
+    threads = set()
+    process_meta = executor.process_meta
+
+    def recording_process(cq, meta):
+        threads.add(threading.get_ident())
+        return process_meta(cq, meta)
+
+    monkeypatch.setattr(executor, "process_meta", recording_process)
+
+    result = executor.execute(Query(columns=["params.a"], filter_expr="params.a % 3 == 0"))
+    assert result.data == [{"params.a": a} for a in range(0, 20, 3)]
+    # Filter and columns are evaluated in the worker threads
+    assert threading.get_ident() not in threads
+
+
+def test_compiled_once(tmp_path_str, monkeypatch):
+    init_repo(tmp_path_str, [{"a": i} for i in range(5)])
+
+    executor = Executor(tmp_path_str, "repo")
+    calls = []
+    validate_eval = executor.validate_eval
+
+    def counting_validate(expr):
+        calls.append(expr)
+        validate_eval(expr)
+
+    monkeypatch.setattr(executor, "validate_eval", counting_validate)
+
+    result = executor.execute(
+        Query(columns=["params.a", "slug"], filter_expr="params.a > 1", sort_expr="params.a")
+    )
+    assert result.rows == 3
+    assert len(calls) == 4
+    assert set(result.timings) == {"compile", "scan", "sort"}
+
+
+def test_statement_column(tmp_path_str):
+    init_repo(tmp_path_str, [{"a": 0}])
+
+    result = Executor(tmp_path_str, "repo").execute(Query(columns=["a = 1"]))
+    assert result.data == [{"a = 1": None}]
+
+
+def test_dangerous_method(tmp_path_str):
+    init_repo(tmp_path_str, [{}])
+
+    executor = Executor(tmp_path_str, "repo")
+    with pytest.raises(QueryExecutionError):
+        executor.execute(Query(columns=["subprocess.run('ls')"]))
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_early_stop(tmp_path_str, monkeypatch, jobs):
+    init_repo(tmp_path_str, [{"a": i} for i in range(50)])
+
+    executor = Executor(tmp_path_str, "repo", jobs=jobs)
+    calls = []
+    read_meta = DiskLine._read_meta_by_name
+
+    def counting_read(line, name):
+        calls.append(name)
+        return read_meta(line, name)
+
+    monkeypatch.setattr(DiskLine, "_read_meta_by_name", counting_read)
+
+    result = executor.execute(
+        Query(columns=["params.a"], filter_expr="params.a % 2 == 1", offset=2, limit=3)
+    )
+    assert result.data == [{"params.a": 5}, {"params.a": 7}, {"params.a": 9}]
+    assert len(calls) < 50
+
+
+@pytest.mark.parametrize("desc", [False, True])
+@pytest.mark.parametrize("offset, limit", [(None, 3), (2, 4), (5, 100), (None, 0)])
+def test_top_k_same_as_sort(tmp_path_str, desc, offset, limit):
+    # Many equal keys and Nones to check the stability
+    params = [{"a": i, "b": i % 3 if i % 4 else None} for i in range(20)]
+    init_repo(tmp_path_str, params)
+
+    executor = Executor(tmp_path_str, "repo")
+    full = executor.execute(Query(columns=["params.a"], sort_expr="params.b", desc=desc))
+    top = executor.execute(
+        Query(columns=["params.a"], sort_expr="params.b", desc=desc, offset=offset, limit=limit)
+    )
+
+    start = offset if offset is not None else 0
+    assert top.data == full.data[start:start + limit]
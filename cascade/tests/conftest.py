@@ -15,6 +15,7 @@ limitations under the License.
 """
 
 import datetime
+import importlib.util
 import os
 import random
 import sys
@@ -133,6 +134,12 @@ def empty_model():
     params=[
         {"model_cls": DummyModel, "meta_fmt": ".json"},
         {"model_cls": DummyModel, "meta_fmt": ".yml"},
+        pytest.param(
+            {"model_cls": DummyModel, "meta_fmt": ".msgpack"},
+            marks=pytest.mark.skipif(
+                importlib.util.find_spec("msgpack") is None, reason="msgpack is not installed"
+            ),
+        ),
     ]
 )
 def model_line(request, tmp_path_factory):
@@ -15,11 +15,14 @@ limitations under the License.
 """
 
 import os
+import random
 import sys
 
+import numpy as np
+import pandas as pd
 import pytest
 
-from cascade.data import ApplyModifier, IteratorWrapper, Wrapper
+from cascade.data import ApplyModifier, IteratorWrapper, RangeSampler, Wrapper
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
 sys.path.append(os.path.dirname(SCRIPT_DIR))
@@ -79,3 +82,133 @@ def test_p_get():
     ds = ApplyModifier(ds, lambda x: x + 1, 0.5, seed=42)
 
     assert [ds[i] for i in range(len(ds))] == [0, 2, 3, 4]
+
+
+def test_p_does_not_reseed_global():
+    random.seed(0)
+    expected = [random.random() for _ in range(3)]
+
+    random.seed(0)
+    ds = ApplyModifier(Wrapper([0, 1]), lambda x: x, 0.5, seed=42)
+    ds[0]
+    ds[1]
+    assert [random.random() for _ in range(3)] == expected
+
+
+def test_get_batch():
+    ds = ApplyModifier(Wrapper([0, 1, 2, 3]), lambda x: x + 1, 0.5, seed=42)
+    assert ds.get_batch([0, 1, 2, 3]) == [0, 2, 3, 4]
+
+
+def test_batched():
+    calls = []
+
+    def double(x):
+        calls.append(x)
+        return x * 2
+
+    data = np.arange(20).reshape(10, 2)
+    ds = ApplyModifier(Wrapper(data), double, batched=True)
+
+    batch = ds.get_batch([0, 5, 9])
+    assert isinstance(batch, np.ndarray)
+    assert batch.tolist() == (data[[0, 5, 9]] * 2).tolist()
+    assert len(calls) == 1
+
+    assert ds[3].tolist() == [12, 14]
+    assert np.stack(list(ds)).tolist() == (data * 2).tolist()
+
+    ds = ApplyModifier(Wrapper([1, 2, 3]), lambda xs: [x * 10 for x in xs], batched=True)
+    assert ds.get_batch([2, 0]) == [30, 10]
+    assert list(ds) == [10, 20, 30]
+
+
+@pytest.mark.parametrize("p", [0.0, 0.3, 1.0])
+def test_batched_p(p):
+    selected = []
+
+    def negate(x):
+        selected.append(len(x))
+        return -x
+
+    data = np.arange(1, 1001, dtype=np.float64)
+    ds = ApplyModifier(Wrapper(data), negate, p, seed=0, batched=True)
+    batch = ds.get_batch(np.arange(1000))
+
+    changed = batch < 0
+    assert np.abs(batch).tolist() == data.tolist()
+    assert changed.sum() == sum(selected)
+    # Only selected rows are passed
+    assert all(n < 1000 for n in selected) or p == 1.0
+    if p == 0.0:
+        assert not selected
+    elif p == 1.0:
+        assert changed.all()
+    else:
+        assert 200 < changed.sum() < 400
+
+    # The same seed gives the same mask
+    same = ApplyModifier(Wrapper(data), negate, p, seed=0, batched=True)
+    assert same.get_batch(np.arange(1000)).tolist() == batch.tolist()
+
+
+def test_batched_p_changes_type():
+    ds = ApplyModifier(
+        Wrapper(np.zeros((100, 2), dtype=np.int64)), lambda x: x + 0.5, 0.5, seed=0, batched=True
+    )
+    batch = ds.get_batch(list(range(100)))
+    assert batch.dtype == np.float64
+    assert set(batch[:, 0].tolist()) == {0.0, 0.5}
+
+    ds = ApplyModifier(Wrapper([0] * 100), lambda xs: ["a"] * len(xs), 0.5, seed=0, batched=True)
+    assert set(ds.get_batch(list(range(100)))) == {0, "a"}
+
+
+def test_batched_table():
+    from cascade.utils.tables import TableDataset
+
+    table = TableDataset(t=pd.DataFrame({"a": np.arange(100.0), "b": np.ones(100)}))
+    ds = ApplyModifier(table, lambda t: t * -1, 0.5, seed=0, batched=True)
+    batch = ds.get_batch(list(range(100)))
+    assert isinstance(batch, pd.DataFrame)
+    assert (batch["a"].abs() == np.arange(100.0)).all()
+    assert ((batch["a"] < 0) == (batch["b"] < 0))[1:].all()
+
+
+def test_batched_wrong_length():
+    # Per-item modifier in front turns the array batch into a list
+    # and x * 2 repeats the list instead of doubling the items
+    ds = ApplyModifier(Wrapper(np.arange(6)), lambda x: x + 1)
+    ds = ApplyModifier(ds, lambda x: x * 2, batched=True)
+    with pytest.raises(ValueError, match="one result per item"):
+        ds.get_batch([0, 1, 2])
+    with pytest.raises(ValueError):
+        list(ds)
+
+    ds = ApplyModifier(Wrapper([1, 2, 3]), lambda xs: sum(xs), batched=True)
+    with pytest.raises(ValueError):
+        ds.get_batch([0, 1])
+
+
+def test_batched_p_same_as_items(monkeypatch):
+    # The draw equal to p applies func in both modes
+    ds = ApplyModifier(Wrapper(np.arange(10)), lambda x: -x, 0.5, seed=0)
+    monkeypatch.setattr(ds._random, "random", lambda: 0.5)
+    assert ds.get_batch([1, 2]) == [-1, -2]
+
+    ds = ApplyModifier(Wrapper(np.arange(10)), lambda x: -x, 0.5, seed=0, batched=True)
+    monkeypatch.setattr(ds, "_rng", type("Rng", (), {"random": lambda self, n: np.full(n, 0.5)})())
+    assert ds.get_batch([1, 2]).tolist() == [-1, -2]
+
+
+def test_batched_iter_modifier():
+    # Batches are read with get_batch of the previous modifier too
+    data = np.arange(20).reshape(10, 2)
+    ds = ApplyModifier(RangeSampler(Wrapper(data), 0, 10), lambda x: x * 2, batched=True)
+    assert np.stack(list(ds)).tolist() == (data * 2).tolist()
+
+
+@pytest.mark.parametrize("n", [1, 300, 600])
+def test_batched_iterator(n):
+    ds = ApplyModifier(IteratorWrapper(range(n)), lambda xs: [x * 2 for x in xs], batched=True)
+    assert list(ds) == [x * 2 for x in range(n)]
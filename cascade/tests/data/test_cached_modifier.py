@@ -0,0 +1,194 @@
+"""
+Copyright 2022-2025 Ilia Moiseev
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+import pickle
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+MODULE_PATH = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.dirname(MODULE_PATH))
+
+from cascade.data import (ApplyModifier, CachedModifier, Dataset, Wrapper,
+                          sizeof)
+
+
+class CountingDataset(Dataset):
+    def __init__(self, data, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._data = data
+        self.calls = []
+
+    def __getitem__(self, index):
+        self.calls.append(index)
+        return self._data[index]
+
+    def __len__(self):
+        return len(self._data)
+
+
+def test_unbounded():
+    upstream = CountingDataset(list(range(10)))
+    ds = CachedModifier(upstream)
+    assert [ds[i] for i in range(10)] == list(range(10))
+    assert [ds[i] for i in range(10)] == list(range(10))
+    assert ds[-1] == 9
+    assert len(upstream.calls) == 10
+
+    meta = ds.get_meta()
+    assert meta[0]["hits"] == 11
+    assert meta[0]["misses"] == 10
+    assert meta[0]["evictions"] == 0
+    assert meta[0]["hit_rate"] == 11 / 21
+    assert meta[1]["len"] == 10
+
+
+def test_lru():
+    upstream = CountingDataset(list(range(10)))
+    ds = CachedModifier(upstream, max_items=2)
+    ds[0]
+    ds[1]
+    ds[0]
+    # Evicts 1 as the least recently used
+    ds[2]
+    upstream.calls.clear()
+    ds[0]
+    ds[2]
+    assert upstream.calls == []
+    ds[1]
+    assert upstream.calls == [1]
+
+    meta = ds.get_meta()
+    assert meta[0]["cached_items"] == 2
+    assert meta[0]["evictions"] == 2
+
+
+def test_lfu():
+    upstream = CountingDataset(list(range(10)))
+    ds = CachedModifier(upstream, max_items=2, policy="lfu")
+    ds[0]
+    ds[0]
+    ds[0]
+    ds[1]
+    # Evicts 1 as the least frequently used although 0 was used earlier
+    ds[2]
+    upstream.calls.clear()
+    ds[0]
+    assert upstream.calls == []
+    ds[1]
+    assert upstream.calls == [1]
+
+
+def test_bytes():
+    data = [np.zeros(100, dtype=np.uint8) for _ in range(10)]
+    upstream = CountingDataset(data)
+    ds = CachedModifier(upstream, max_bytes=250)
+    for i in range(10):
+        ds[i]
+    meta = ds.get_meta()
+    assert meta[0]["cached_items"] == 2
+    assert meta[0]["cached_bytes"] == 200
+    assert meta[0]["evictions"] == 8
+
+    # Items bigger than the cache are not cached
+    ds = CachedModifier(Wrapper([np.zeros(1000, dtype=np.uint8)]), max_bytes=250)
+    ds[0]
+    assert ds.get_meta()[0]["cached_items"] == 0
+
+
+def test_size_fn():
+    ds = CachedModifier(Wrapper(["a", "bb", "ccc"]), max_bytes=5, size_fn=len)
+    for i in range(3):
+        ds[i]
+    assert ds.get_meta()[0]["cached_bytes"] == 5
+    assert sizeof(np.zeros(10)) == 80
+
+
+def test_get_batch():
+    upstream = CountingDataset(list(range(10)))
+    ds = CachedModifier(upstream, max_items=5)
+    assert ds.get_batch([1, 2, 3]) == [1, 2, 3]
+    upstream.calls.clear()
+    assert ds.get_batch([3, 4, -9]) == [3, 4, 1]
+    assert upstream.calls == [4]
+
+    with pytest.raises(IndexError):
+        ds.get_batch([10])
+
+
+def test_get_batch_type():
+    data = np.arange(20).reshape(10, 2)
+    ds = CachedModifier(Wrapper(data))
+    assert ds[1].tolist() == [2, 3]
+    # All cached, partly cached and not cached
+    for indices in ([1], [1, 2, 3], [5, 6]):
+        batch = ds.get_batch(indices)
+        assert isinstance(batch, np.ndarray)
+        assert batch.tolist() == data[indices].tolist()
+
+    # Batched consumer gets an array and not a list
+    ds = ApplyModifier(
+        CachedModifier(Wrapper(data)), lambda x: x * 2, batched=True
+    )
+    ds.get_batch([0, 1])
+    assert ds.get_batch([0, 1, 2]).tolist() == (data[:3] * 2).tolist()
+    assert len(list(ds)) == len(ds)
+
+
+def test_get_batch_table():
+    pd = pytest.importorskip("pandas")
+    from cascade.utils.tables import TableDataset
+
+    table = pd.DataFrame({"a": np.arange(5), "b": np.arange(5.0), "c": list("abcde")})
+    ds = CachedModifier(TableDataset(t=table))
+    ds.get_batch([3, 1])
+    batch = ds.get_batch([0, 1, 2, 3])
+    assert isinstance(batch, pd.DataFrame)
+    assert batch.equals(table.iloc[[0, 1, 2, 3]])
+
+
+def test_threads():
+    upstream = CountingDataset(list(range(100)))
+    ds = CachedModifier(upstream, max_items=50)
+    indices = np.random.default_rng(0).integers(0, 100, 5000).tolist()
+    with ThreadPoolExecutor(8) as pool:
+        result = list(pool.map(ds.__getitem__, indices))
+    assert result == indices
+
+    meta = ds.get_meta()
+    assert meta[0]["hits"] + meta[0]["misses"] == 5000
+    assert meta[0]["cached_items"] <= 50
+
+
+def test_clear_and_pickle():
+    ds = CachedModifier(Wrapper([1, 2, 3]))
+    ds[0]
+    ds = pickle.loads(pickle.dumps(ds))
+    assert ds.get_meta()[0]["cached_items"] == 1
+    ds.clear()
+    assert ds.get_meta()[0]["cached_items"] == 0
+    assert ds[1] == 2
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"max_items": 0}, {"max_bytes": 0}, {"policy": "fifo"}]
+)
+def test_illegal(kwargs):
+    with pytest.raises(ValueError):
+        CachedModifier(Wrapper([1]), **kwargs)
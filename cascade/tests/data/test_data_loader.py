@@ -0,0 +1,148 @@
+"""
+Copyright 2022-2025 Ilia Moiseev
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pytest
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.dirname(SCRIPT_DIR))
+
+from cascade.data import ApplyModifier, DataLoader, Wrapper, default_collate
+
+
+def square(x):
+    return x * x
+
+
+class SlowDataset(Wrapper):
+    def __getitem__(self, index):
+        # Reads in the order that is not the order of indices
+        time.sleep(0.001 * (index % 3))
+        return super().__getitem__(index)
+
+
+@pytest.mark.parametrize(
+    "arr, bs, drop_last, result",
+    [
+        ([1], 1, False, [[1]]),
+        ([1, 2, 3], 2, False, [[1, 2], [3]]),
+        ([1, 2, 3], 2, True, [[1, 2]]),
+        ([1, 2, 3, 4], 2, True, [[1, 2], [3, 4]]),
+        ([1, 2, 3, 4], 5, False, [[1, 2, 3, 4]]),
+        ([1, 2, 3, 4], 5, True, []),
+    ],
+)
+def test_batches(arr, bs, drop_last, result):
+    dl = DataLoader(arr, batch_size=bs, drop_last=drop_last)
+    assert len(dl) == len(result)
+    assert [batch.tolist() for batch in dl] == result
+    assert [dl[i].tolist() for i in range(len(dl))] == result
+
+
+@pytest.mark.parametrize("workers", [0, 1, 4])
+@pytest.mark.parametrize("backend", ["thread", "process"])
+def test_workers(workers, backend):
+    ds = ApplyModifier(Wrapper(list(range(50))), square)
+    dl = DataLoader(ds, batch_size=8, workers=workers, backend=backend, prefetch=1)
+    assert [batch.tolist() for batch in dl] == [
+        [x * x for x in range(i, min(i + 8, 50))] for i in range(0, 50, 8)
+    ]
+
+
+def test_unordered():
+    dl = DataLoader(SlowDataset(list(range(30))), batch_size=1, workers=4, ordered=False)
+    assert sorted(batch[0] for batch in dl) == list(range(30))
+
+
+def test_break_early():
+    dl = DataLoader(list(range(100)), batch_size=1, workers=2)
+    for i, batch in enumerate(dl):
+        if i == 3:
+            break
+    # Can be iterated again
+    assert len(list(dl)) == 100
+
+
+def test_shuffle():
+    dl = DataLoader(list(range(20)), batch_size=4, shuffle=True, seed=0)
+    first = np.concatenate(list(dl))
+    second = np.concatenate(list(dl))
+    assert sorted(first) == list(range(20))
+    assert sorted(second) == list(range(20))
+    assert first.tolist() != second.tolist()
+
+    # The batch by index is from the last order
+    assert dl[0].tolist() == second[:4].tolist()
+
+    same = DataLoader(list(range(20)), batch_size=4, shuffle=True, seed=0)
+    assert np.concatenate(list(same)).tolist() == first.tolist()
+
+
+def test_sampler():
+    dl = DataLoader(list(range(10)), batch_size=2, sampler=[9, 7, 5])
+    assert [batch.tolist() for batch in dl] == [[9, 7], [5]]
+
+    with pytest.raises(ValueError):
+        DataLoader(list(range(10)), sampler=[0], shuffle=True)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"batch_size": 0},
+        {"workers": -1},
+        {"prefetch": 0},
+        {"backend": "fiber"},
+    ],
+)
+def test_illegal(kwargs):
+    with pytest.raises(ValueError):
+        DataLoader([1, 2], **kwargs)
+
+
+def test_collate():
+    batch = default_collate([np.zeros((2, 3)), np.ones((2, 3))])
+    assert batch.shape == (2, 2, 3)
+    assert batch.flags["C_CONTIGUOUS"]
+
+    # Different shapes are left as is
+    batch = default_collate([np.zeros(2), np.zeros(3)])
+    assert isinstance(batch, list)
+
+    x, y = default_collate([(np.zeros(2), 0), (np.ones(2), 1)])
+    assert x.shape == (2, 2)
+    assert y.tolist() == [0, 1]
+
+    batch = default_collate([{"x": 1, "name": "a"}, {"x": 2, "name": "b"}])
+    assert batch["x"].tolist() == [1, 2]
+    assert batch["name"] == ["a", "b"]
+
+    dl = DataLoader([1, 2, 3], batch_size=2, collate_fn=list)
+    assert list(dl) == [[1, 2], [3]]
+
+
+def test_meta():
+    dl = DataLoader(ApplyModifier(Wrapper([1, 2, 3]), square), batch_size=2, workers=2)
+    meta = dl.get_meta()
+    assert len(meta) == 3
+    assert meta[0]["batch_size"] == 2
+    assert meta[0]["workers"] == 2
+    assert meta[0]["collate_fn"] == "default_collate"
+    assert meta[2]["len"] == 3
@@ -0,0 +1,147 @@
+"""
+Copyright 2022-2025 Ilia Moiseev
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+MODULE_PATH = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.dirname(MODULE_PATH))
+
+from cascade.data import (ApplyModifier, Composer, Concatenator, CyclicSampler,
+                          Dataset, Filter, Modifier, RandomSampler,
+                          RangeSampler, Sampler, Wrapper, batch_items)
+
+
+class ItemDataset(Dataset):
+    """Has no native get_batch"""
+
+    def __init__(self, n, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._n = n
+
+    def __getitem__(self, index):
+        return index * 10
+
+    def __len__(self):
+        return self._n
+
+
+class StrictDataset(Dataset):
+    """Accepts only Python ints like TimeSeriesDataset"""
+
+    def __init__(self, n, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._n = n
+
+    def __getitem__(self, index):
+        if not isinstance(index, int):
+            raise NotImplementedError(f"__getitem__ is not implemented for {type(index)}")
+        return index
+
+    def __len__(self):
+        return self._n
+
+
+def make_pipelines():
+    data = list(range(20))
+    return [
+        Wrapper(data),
+        Wrapper(np.arange(20)),
+        ItemDataset(20),
+        Modifier(Wrapper(data)),
+        Sampler(Wrapper(data), 15),
+        ApplyModifier(Wrapper(data), lambda x: x + 1),
+        RangeSampler(Wrapper(data), 2, 18, 3),
+        RangeSampler(Wrapper(np.arange(20)), 15),
+        RandomSampler(Wrapper(data)),
+        RandomSampler(Wrapper(data), 40),
+        CyclicSampler(Wrapper(data), 45),
+        Filter(Wrapper(data), lambda x: x % 3 == 0),
+        Composer([Wrapper(data), Wrapper(np.arange(20) * 2)]),
+        Concatenator([Wrapper(data[:7]), Wrapper(np.arange(100, 110)), ItemDataset(5)]),
+        RangeSampler(Filter(Concatenator([Wrapper(data), Wrapper(data)]), lambda x: x > 5), 10),
+    ]
+
+
+@pytest.mark.parametrize("ds", make_pipelines())
+def test_same_as_getitem(ds):
+    n = len(ds)
+    for indices in ([], [0], [n - 1, 0, 1], list(range(n)), list(range(n))[::-2], [-1, -n]):
+        batch = list(batch_items(ds.get_batch(indices)))
+        assert batch == [ds[i] for i in indices]
+
+    batch = ds.get_batch(np.array([n - 1, 0]))
+    assert list(batch) == [ds[n - 1], ds[0]]
+
+
+@pytest.mark.parametrize(
+    "ds",
+    [
+        RangeSampler(Wrapper(list(range(10))), 5),
+        RandomSampler(Wrapper(list(range(10)))),
+        Filter(Wrapper(list(range(10))), lambda x: x > 2),
+        Concatenator([Wrapper([0, 1]), Wrapper([2])]),
+    ],
+)
+def test_out_of_range(ds):
+    with pytest.raises(IndexError):
+        ds.get_batch([0, len(ds)])
+    with pytest.raises(IndexError):
+        ds.get_batch([-len(ds) - 1])
+
+
+def test_vectorized():
+    data = np.arange(100).reshape(50, 2)
+    ds = Concatenator([Wrapper(data[:20]), Wrapper(data[20:])])
+    ds = Filter(ds, lambda x: x[0] % 4 == 0)
+    ds = RangeSampler(ds, 0, 20, 2)
+
+    # The pipeline returns an array for arrays
+    batch = ds.get_batch([0, 1, 2])
+    assert isinstance(batch, np.ndarray)
+    assert batch.tolist() == [ds[0].tolist(), ds[1].tolist(), ds[2].tolist()]
+
+
+def test_not_changed_modifier_passes_batch():
+    calls = []
+
+    class CountingWrapper(Wrapper):
+        def __getitem__(self, index):
+            calls.append(index)
+            return super().__getitem__(index)
+
+    ds = Modifier(Modifier(CountingWrapper(np.arange(10))))
+    assert ds.get_batch([1, 2]).tolist() == [1, 2]
+    assert calls == []
+
+
+@pytest.mark.parametrize(
+    "make",
+    [
+        lambda ds: Filter(ds, lambda x: True),
+        lambda ds: RandomSampler(ds),
+        lambda ds: RandomSampler(ds, 20),
+        lambda ds: RangeSampler(ds, 5),
+    ],
+)
+def test_int_index_upstream(make):
+    ds = make(StrictDataset(10))
+    assert isinstance(ds[0], int)
+    assert len(list(ds)) == len(ds)
+    assert ds.get_batch([0, 1]) == [ds[0], ds[1]]
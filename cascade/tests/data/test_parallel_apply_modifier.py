@@ -0,0 +1,156 @@
+"""
+Copyright 2022-2025 Ilia Moiseev
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+import pickle
+import sys
+
+import numpy as np
+import pytest
+
+MODULE_PATH = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.dirname(MODULE_PATH))
+
+from cascade.data import (ApplyModifier, IteratorWrapper,
+                          ParallelApplyModifier, Wrapper)
+
+
+def square(x):
+    return x * x
+
+
+def pid(x):
+    return os.getpid()
+
+
+@pytest.mark.parametrize("backend", ["thread", "process"])
+@pytest.mark.parametrize("chunk_size", [1, 7, 100])
+def test_same_as_apply_modifier(backend, chunk_size):
+    data = list(range(50))
+    ds = ParallelApplyModifier(
+        Wrapper(data), square, workers=3, backend=backend, chunk_size=chunk_size
+    )
+    expected = [x * x for x in data]
+    assert list(ds) == expected
+    assert ds.get_batch(list(range(49, -1, -1))) == expected[::-1]
+    assert ds[3] == 9
+    ds.close()
+
+
+@pytest.mark.parametrize("backend", ["thread", "process"])
+def test_iterator(backend):
+    ds = ParallelApplyModifier(
+        IteratorWrapper(range(100)), square, workers=2, backend=backend, chunk_size=8
+    )
+    assert list(ds) == [x * x for x in range(100)]
+
+    ds = ParallelApplyModifier(
+        IteratorWrapper(range(100)), square, workers=4, backend=backend, chunk_size=3, ordered=False
+    )
+    assert sorted(ds) == [x * x for x in range(100)]
+    ds.close()
+
+
+def test_processes():
+    ds = ParallelApplyModifier(Wrapper(list(range(20))), pid, workers=2, chunk_size=1)
+    pids = set(ds.get_batch(list(range(20))))
+    assert os.getpid() not in pids
+    ds.close()
+
+
+def test_lambda():
+    with pytest.warns(UserWarning):
+        ds = ParallelApplyModifier(Wrapper([1, 2, 3]), lambda x: x + 1, workers=2)
+    assert ds.get_meta()[0]["backend"] == "thread"
+    assert list(ds) == [2, 3, 4]
+    ds.close()
+
+
+@pytest.mark.parametrize("backend", ["thread", "process"])
+def test_p(backend):
+    data = list(range(100))
+    seq = ApplyModifier(Wrapper(data), square, 0.5, seed=3)
+    par = ParallelApplyModifier(
+        Wrapper(data), square, 0.5, seed=3, workers=2, backend=backend, chunk_size=6
+    )
+    # The same items are selected as in ApplyModifier
+    assert par.get_batch(data) == seq.get_batch(data)
+    par.close()
+
+
+@pytest.mark.parametrize("p", [None, 0.5])
+def test_batched(p):
+    data = np.arange(1000, dtype=np.float64).reshape(500, 2)
+    ds = ParallelApplyModifier(
+        Wrapper(data), np.negative, p, seed=0, workers=3, chunk_size=64, batched=True
+    )
+    batch = ds.get_batch(np.arange(500))
+    assert isinstance(batch, np.ndarray)
+    assert np.abs(batch).tolist() == data.tolist()
+    if p is None:
+        assert (batch[1:] < 0).all()
+    else:
+        assert 100 < (batch[:, 1] < 0).sum() < 400
+
+    assert np.stack(list(ds)).shape == (500, 2)
+    ds.close()
+
+
+def double(x):
+    return x * 2
+
+
+@pytest.mark.parametrize("p", [None, 0.5])
+def test_batched_wrong_length(p):
+    ds = ApplyModifier(Wrapper(np.arange(100)), square)
+    ds = ParallelApplyModifier(
+        ds, double, p, seed=0, workers=2, backend="thread", chunk_size=10, batched=True
+    )
+    with pytest.raises(ValueError, match="one result per item"):
+        ds.get_batch(list(range(100)))
+    with pytest.raises(ValueError):
+        list(ds)
+    ds.close()
+
+
+def test_meta():
+    ds = ParallelApplyModifier(Wrapper(list(range(10))), square, workers=2, backend="thread")
+    meta = ds.get_meta()
+    assert meta[0]["workers"] == 2
+    assert meta[0]["throughput"] is None
+
+    list(ds)
+    ds.get_batch([0, 1])
+    meta = ds.get_meta()
+    assert meta[0]["processed"] == 12
+    assert meta[0]["throughput"] > 0
+    ds.close()
+
+
+def test_pickle():
+    ds = ParallelApplyModifier(Wrapper([1, 2]), square, workers=2)
+    ds.get_batch([0])
+    ds = pickle.loads(pickle.dumps(ds))
+    assert list(ds) == [1, 4]
+    ds.close()
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"workers": 0}, {"chunk_size": 0}, {"backend": "gpu"}]
+)
+def test_illegal(kwargs):
+    with pytest.raises(ValueError):
+        ParallelApplyModifier(Wrapper([1]), square, **kwargs)
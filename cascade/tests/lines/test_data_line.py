@@ -139,3 +139,14 @@ def test_load_obj_meta(tmp_path_str, dataset):
 
     meta = line.load_obj_meta(str(version))
     assert meta[0]["test_param"] == 1
+
+
+def test_reload_versions(tmp_path_str):
+    dataline = DataLine(tmp_path_str)
+    other = DataLine(tmp_path_str)
+
+    dataline.save(Wrapper([0, 1, 2]))
+    assert other.get_latest_version() is None
+
+    other.reload()
+    assert str(other.get_latest_version()) == "0.1"
@@ -14,9 +14,57 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import os
+import sys
+
+import pytest
+
+MODULE_PATH = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.dirname(MODULE_PATH))
+
+from cascade.base import MetaHandler, MetaIOError
+
 
 def test_load_obj_meta(any_line):
     meta0 = any_line.load_obj_meta(0)
     meta1 = any_line.load_obj_meta(1)
 
     assert meta0 != meta1
+
+
+@pytest.mark.parametrize("prefetch, workers", [(0, 1), (2, 1), (0, 3), (100, 2)])
+def test_iter_meta(any_line, prefetch, workers):
+    expected = [any_line.load_obj_meta(i) for i in range(len(any_line))]
+
+    assert list(any_line.iter_meta(prefetch=prefetch, workers=workers)) == expected
+    assert list(any_line.iter_meta(start=-2, prefetch=prefetch, workers=workers)) == expected[-2:]
+
+
+def test_iter_meta_errors(any_line):
+    name = any_line.get_item_names()[1]
+    with open(os.path.join(any_line.get_root(), name, "meta.json"), "w") as f:
+        f.write("{")
+
+    with pytest.raises(MetaIOError):
+        list(any_line.iter_meta(prefetch=2))
+
+    metas = list(any_line.iter_meta(prefetch=2, ignore_errors=True))
+    assert len(metas) == 5
+    assert metas[1] == [{}]
+
+
+def test_iter_meta_early_stop(any_line):
+    metas = any_line.iter_meta(prefetch=2, workers=2)
+    assert next(metas) == any_line.load_obj_meta(0)
+    metas.close()
+
+
+def test_meta_path_changed(any_line):
+    root = os.path.join(any_line.get_root(), any_line.get_item_names()[0])
+    meta = any_line.load_obj_meta(0)
+
+    # The remembered meta file disappears when format is changed
+    MetaHandler.write(os.path.join(root, "meta.yml"), meta)
+    os.remove(os.path.join(root, "meta.json"))
+
+    assert any_line.load_obj_meta(0) == meta
@@ -15,6 +15,8 @@ limitations under the License.
 """
 
 import glob
+import json
+import multiprocessing
 import os
 import shutil
 import sys
@@ -228,3 +230,262 @@ def test_line_comment(tmp_path_str):
     line = Repo(tmp_path_str).add_line("line")
     meta = MetaHandler.read_dir(line_dir)
     assert len(meta[0]["comments"]) > 0
+
+
+class InterruptedModel(BasicModel):
+    def save_artifact(self, path, *args, **kwargs):
+        with open(os.path.join(path, "weights"), "w") as f:
+            f.write("partial")
+        raise KeyboardInterrupt()
+
+
+def test_journal_recover(tmp_path_str):
+    line = ModelLine(tmp_path_str, journal=True)
+    line.save(BasicModel(a=0))
+
+    with pytest.raises(KeyboardInterrupt):
+        line.save(InterruptedModel(a=1))
+
+    # Interrupted save left the folder without meta
+    assert len(os.listdir(os.path.join(tmp_path_str, ".journal"))) == 1
+    assert not glob.glob(os.path.join(tmp_path_str, "00001", "meta.*"))
+
+    line = ModelLine(tmp_path_str, journal=True)
+    assert len(line) == 2
+    assert os.listdir(os.path.join(tmp_path_str, ".journal")) == []
+
+    meta = line.load_model_meta(1)
+    assert meta[0]["params"] == {"a": 1}
+    assert "interrupted" in meta[0]["errors"]
+    assert os.path.exists(os.path.join(tmp_path_str, "00001", "artifacts", "weights"))
+
+    line.save(BasicModel(a=2))
+    assert len(line) == 3
+    assert "errors" not in line.load_model_meta(0)[0]
+
+
+def test_journal_skips_finished(tmp_path_str):
+    line = ModelLine(tmp_path_str, journal=True)
+    line.save(BasicModel())
+    assert line.recover() == []
+    assert line.get_model_names() == ["00000"]
+
+
+def test_no_temporary_files(tmp_path_str):
+    line = ModelLine(tmp_path_str)
+    line.save(BasicModel())
+    line.tag("tag")
+
+    assert sorted(os.listdir(tmp_path_str)) == [".lock", ".manifest", "00000", "meta.json"]
+    assert sorted(os.listdir(os.path.join(tmp_path_str, "00000"))) == [
+        "SLUG",
+        "artifacts",
+        "meta.json",
+        "model.pkl",
+    ]
+
+
+def test_manifest_no_listing(tmp_path_str, monkeypatch):
+    line = ModelLine(tmp_path_str)
+    slugs = []
+    for _ in range(3):
+        line.save(BasicModel())
+        slugs.append(line.load_model_meta(len(line) - 1)[0]["slug"])
+
+    def failing(*args, **kwargs):
+        raise AssertionError("Should not list the folder")
+
+    monkeypatch.setattr(os, "listdir", failing)
+    line = ModelLine(tmp_path_str)
+    assert line.get_model_names() == ["00000", "00001", "00002"]
+    assert line.load_model_meta(slugs[1])[0]["slug"] == slugs[1]
+
+    line.save(BasicModel())
+    assert line.get_model_names()[-1] == "00003"
+
+
+@pytest.mark.parametrize("layout", ["flat", "sharded"])
+def test_manifest_service_folders(tmp_path_str, monkeypatch, layout):
+    line = ModelLine(tmp_path_str, layout=layout, journal=True)
+    for _ in range(2):
+        line.save(BasicModel())
+    # Created by the deduplication of artifacts
+    os.mkdir(os.path.join(tmp_path_str, ".blobs"))
+    assert os.path.isdir(os.path.join(tmp_path_str, ".journal"))
+
+    def failing(*args, **kwargs):
+        raise AssertionError("Should not list the folder")
+
+    with monkeypatch.context() as m:
+        m.setattr(ModelLine, "_scan_item_names", failing)
+        assert len(ModelLine(tmp_path_str)) == 2
+
+    # Other hidden folders are not models too
+    os.mkdir(os.path.join(tmp_path_str, ".cache"))
+    assert len(ModelLine(tmp_path_str)) == 2
+
+    # Folders added bypassing the manifest are still found
+    os.makedirs(os.path.join(tmp_path_str, line.get_model_names()[0].replace("00000", "00005")))
+    assert len(ModelLine(tmp_path_str)) == 3
+
+
+def test_manifest_created_for_old_line(tmp_path_str):
+    line = ModelLine(tmp_path_str)
+    for _ in range(2):
+        line.save(BasicModel())
+    slug = line.load_model_meta(0)[0]["slug"]
+    os.remove(os.path.join(tmp_path_str, ".manifest"))
+
+    line = ModelLine(tmp_path_str)
+    line.save(BasicModel())
+
+    with open(os.path.join(tmp_path_str, ".manifest")) as f:
+        records = [json.loads(record) for record in f]
+    assert [r["name"] for r in records] == ["00000", "00001", "00002"]
+    assert [r["num"] for r in records] == [0, 1, 2]
+    assert records[0]["slug"] == slug
+    assert records[2]["saved_at"] is not None
+
+
+def test_manifest_external_changes(tmp_path_str):
+    line = ModelLine(tmp_path_str)
+    for _ in range(3):
+        line.save(BasicModel())
+
+    shutil.copytree(os.path.join(tmp_path_str, "00002"), os.path.join(tmp_path_str, "00003"))
+    line = ModelLine(tmp_path_str)
+    assert line.get_model_names() == ["00000", "00001", "00002", "00003"]
+
+    shutil.rmtree(os.path.join(tmp_path_str, "00000"))
+    line = ModelLine(tmp_path_str)
+    assert line.get_model_names() == ["00001", "00002", "00003"]
+
+    # The number of folders is the same, only reload sees it
+    shutil.copytree(os.path.join(tmp_path_str, "00003"), os.path.join(tmp_path_str, "00004"))
+    shutil.rmtree(os.path.join(tmp_path_str, "00001"))
+    line.reload()
+    assert line.get_model_names() == ["00002", "00003", "00004"]
+
+    # Broken last line of the manifest is skipped
+    with open(os.path.join(tmp_path_str, ".manifest"), "a") as f:
+        f.write('{"name": "000')
+    line = ModelLine(tmp_path_str)
+    assert len(line) == 3
+
+
+def _save_models(root, n):
+    line = ModelLine(root)
+    for _ in range(n):
+        line.save(BasicModel())
+
+
+def test_concurrent_saves(tmp_path_str):
+    ModelLine(tmp_path_str)
+
+    n_procs, n_models = 4, 5
+    procs = [
+        multiprocessing.Process(target=_save_models, args=(tmp_path_str, n_models))
+        for _ in range(n_procs)
+    ]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+        assert p.exitcode == 0
+
+    total = n_procs * n_models
+    line = ModelLine(tmp_path_str)
+    assert len(line) == total
+    assert line.get_model_names() == [f"{i:0>5d}" for i in range(total)]
+    assert line.load_meta()[0]["len"] == total
+
+    slugs = {line.load_model_meta(i)[0]["slug"] for i in range(total)}
+    assert len(slugs) == total
+
+
+def test_sharded_layout(tmp_path_str):
+    repo = Repo(tmp_path_str)
+    line = repo.add_line("line", layout="sharded")
+    for i in range(3):
+        line.save(BasicModel(a=i))
+
+    assert os.path.isdir(os.path.join(tmp_path_str, "line", "0000", "00000002"))
+    assert line.get_model_names() == ["0000/00000000", "0000/00000001", "0000/00000002"]
+
+    line = ModelLine(os.path.join(tmp_path_str, "line"), model_cls=BasicModel)
+    assert line.load_meta()[0]["layout"] == "sharded"
+    assert len(line) == 3
+    assert line.load(2).params["a"] == 2
+
+    slug = line.load_model_meta(1)[0]["slug"]
+    assert line.load_model_meta(slug)[0]["path"] == os.path.join(
+        tmp_path_str, "line", "0000", "00000001"
+    )
+    assert repo.load_obj_meta(slug)[0]["slug"] == slug
+
+    with pytest.raises(ValueError):
+        ModelLine(os.path.join(tmp_path_str, "line"), layout="flat")
+
+
+def test_sharded_external_removal(tmp_path_str):
+    line = ModelLine(tmp_path_str, layout="sharded")
+    for _ in range(3):
+        line.save(BasicModel())
+
+    shutil.rmtree(os.path.join(tmp_path_str, "0000", "00000001"))
+
+    line = ModelLine(tmp_path_str)
+    assert line.get_model_names() == ["0000/00000000", "0000/00000002"]
+
+
+@pytest.mark.parametrize("layout", ["flat", "sharded"])
+def test_set_layout(tmp_path_str, layout):
+    other = "sharded" if layout == "flat" else "flat"
+    line = ModelLine(tmp_path_str, layout=layout)
+    for i in range(3):
+        line.save(BasicModel(a=i))
+    slugs = [line.load_model_meta(i)[0]["slug"] for i in range(3)]
+
+    assert line.set_layout(other) == 3
+    assert line.set_layout(other) == 0
+
+    line = ModelLine(tmp_path_str, model_cls=BasicModel)
+    assert line.load_meta()[0]["layout"] == other
+    assert len(line) == 3
+    for i, slug in enumerate(slugs):
+        meta = line.load_model_meta(slug)
+        assert meta[0]["path"] == os.path.join(tmp_path_str, line.get_model_names()[i])
+        assert line.load(i).params["a"] == i
+
+    line.save(BasicModel())
+    assert len(ModelLine(tmp_path_str)) == 4
+    folders = ["0000"] if other == "sharded" else ["00000", "00001", "00002", "00003"]
+    assert sorted(os.listdir(tmp_path_str)) == sorted([".lock", ".manifest", "meta.json"] + folders)
+
+
+@pytest.mark.parametrize("ext", [".json", ".yml"])
+def test_concurrent_meta_changes(tmp_path_str, ext):
+    a = ModelLine(tmp_path_str, meta_fmt=ext)
+    b = ModelLine(tmp_path_str, meta_fmt=ext)
+
+    a.tag("a")
+    b.tag("b")
+    a.comment("from a")
+    b.comment("from b")
+    a.link(name="a")
+    b.link(name="b")
+
+    meta = ModelLine(tmp_path_str, readonly=True).load_meta()[0]
+    assert sorted(meta["tags"]) == ["a", "b"]
+    assert [c["message"] for c in meta["comments"]] == ["from a", "from b"]
+    assert [c["id"] for c in meta["comments"]] == ["1", "2"]
+    assert [link["name"] for link in meta["links"]] == ["a", "b"]
+
+    # Removals made by one object are not undone by another
+    b.remove_tag("a")
+    b.remove_comment("1")
+    a.tag("c")
+    meta = ModelLine(tmp_path_str, readonly=True).load_meta()[0]
+    assert sorted(meta["tags"]) == ["b", "c"]
+    assert [c["message"] for c in meta["comments"]] == ["from b"]
+    assert sorted(a.tags) == ["b", "c"]
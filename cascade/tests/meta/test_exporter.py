@@ -0,0 +1,167 @@
+"""
+Copyright 2022-2025 Ilia Moiseev
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import glob
+import os
+import shutil
+import sys
+
+import pytest
+
+MODULE_PATH = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.dirname(MODULE_PATH))
+
+pytest.importorskip("pyarrow")
+
+from cascade.base import MetaHandler
+from cascade.meta import MetaExporter
+from cascade.models import BasicModel
+from cascade.repos import Repo
+from cascade.workspaces import Workspace
+
+
+def init_repo(path, n=5):
+    repo = Repo(path)
+    line = repo.add_line()
+    for i in range(n):
+        model = BasicModel(a=i)
+        model.add_metric("acc", i / 10)
+        line.save(model)
+    return repo
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_export(tmp_path_str, fmt):
+    repo = init_repo(os.path.join(tmp_path_str, "repo"))
+    out = os.path.join(tmp_path_str, "out")
+
+    count = repo.export(out, fmt=fmt, batch_size=2)
+    assert count == 5
+    assert len(glob.glob(os.path.join(out, "part-*"))) == 3
+
+    table = MetaExporter.read(out)
+    assert table.num_rows == 5
+    assert table.column("params_a").to_pylist() == [0, 1, 2, 3, 4]
+    assert "metrics_0_value" in table.column_names
+
+
+def test_append(tmp_path_str):
+    repo = init_repo(os.path.join(tmp_path_str, "repo"), n=2)
+    out = os.path.join(tmp_path_str, "out")
+    repo.export(out)
+
+    repo["00000"].save(BasicModel(a=2))
+    assert repo.export(out, append=True) == 1
+    assert repo.export(out, append=True) == 0
+    assert MetaExporter.read(out).num_rows == 3
+
+    assert repo.export(out) == 3
+    assert MetaExporter.read(out).num_rows == 3
+
+
+def test_append_moved_repo(tmp_path_str):
+    repo = init_repo(os.path.join(tmp_path_str, "repo"), n=2)
+    out = os.path.join(tmp_path_str, "out")
+    repo.export(out)
+
+    shutil.move(os.path.join(tmp_path_str, "repo"), os.path.join(tmp_path_str, "moved"))
+    repo = Repo(os.path.join(tmp_path_str, "moved"))
+    assert repo.export(out, append=True) == 0
+
+
+def test_append_changed_meta(tmp_path_str):
+    repo = init_repo(os.path.join(tmp_path_str, "repo"), n=3)
+    out = os.path.join(tmp_path_str, "out")
+    repo.export(out)
+
+    # Meta of a model can change after it was saved
+    path = os.path.join(repo["00000"].get_root(), "00001", "meta.json")
+    meta = MetaHandler.read(path)
+    meta[0]["params"]["a"] = 10
+    meta[0]["params"]["b"] = "changed"
+    MetaHandler.write(path, meta)
+
+    assert repo.export(out, append=True) == 1
+    assert repo.export(out, append=True) == 0
+
+    # Only the last export of the model is read
+    table = MetaExporter.read(out)
+    assert table.num_rows == 3
+    assert sorted(table.column("params_a").to_pylist()) == [0, 2, 10]
+    assert table.column("params_b").to_pylist().count("changed") == 1
+
+
+def test_change_format(tmp_path_str):
+    repo = init_repo(os.path.join(tmp_path_str, "repo"), n=1)
+    out = os.path.join(tmp_path_str, "out")
+    repo.export(out, fmt="parquet")
+    repo.export(out, fmt="arrow")
+    assert [os.path.basename(p) for p in glob.glob(os.path.join(out, "part-*"))] == [
+        "part-00000.arrow"
+    ]
+    assert MetaExporter.read(out).num_rows == 1
+
+    # Appended parts continue the numbering of parts in other formats
+    path = os.path.join(repo["00000"].get_root(), "00000", "meta.json")
+    meta = MetaHandler.read(path)
+    meta[0]["params"]["a"] = 10
+    MetaHandler.write(path, meta)
+    repo["00000"].save(BasicModel(a=1))
+
+    assert repo.export(out, fmt="parquet", append=True) == 2
+    assert sorted(os.path.basename(p) for p in glob.glob(os.path.join(out, "part-*"))) == [
+        "part-00000.arrow",
+        "part-00001.parquet",
+    ]
+    table = MetaExporter.read(out)
+    assert sorted(table.column("params_a").to_pylist()) == [1, 10]
+
+
+def test_mixed_types(tmp_path_str):
+    repo = Repo(os.path.join(tmp_path_str, "repo"))
+    line = repo.add_line()
+    line.save(BasicModel(a=1))
+    line.save(BasicModel(a="one"))
+    line.save(BasicModel(b=True))
+    out = os.path.join(tmp_path_str, "out")
+
+    repo.export(out, batch_size=1)
+    table = MetaExporter.read(out)
+    assert table.num_rows == 3
+    assert table.column("params_a").to_pylist() == ["1", "one", None]
+
+    repo.export(out)
+    table = MetaExporter.read(out)
+    assert table.column("params_a").to_pylist() == ["1", "one", None]
+
+
+def test_workspace(tmp_path_str):
+    ws = Workspace(os.path.join(tmp_path_str, "ws"))
+    for name in ("a", "b"):
+        line = ws.add_repo(name).add_line()
+        line.save(BasicModel())
+    out = os.path.join(tmp_path_str, "out")
+
+    assert ws.export(out) == 2
+    assert MetaExporter.read(out).num_rows == 2
+
+
+def test_does_not_create_index(tmp_path_str):
+    from cascade.base.meta_index import INDEX_FILENAME
+
+    repo = init_repo(os.path.join(tmp_path_str, "repo"), n=2)
+    assert repo.export(os.path.join(tmp_path_str, "out")) == 2
+    assert not os.path.exists(os.path.join(repo.get_root(), INDEX_FILENAME))
@@ -92,3 +92,33 @@ def test_model_artifacts(tmp_path_str):
     # Those should work, but do nothing
     model.save_artifact(tmp_path_str)
     model.load_artifact(tmp_path_str)
+
+
+def test_memory_map(tmp_path_str):
+    def is_mapped(arr):
+        while arr is not None:
+            if isinstance(arr, np.memmap):
+                return True
+            arr = getattr(arr, "base", None)
+        return False
+
+    model = BasicModel(a=10)
+    model.weights = np.arange(1000, dtype=np.float32)
+    model.memory_map = True
+    model.save(tmp_path_str)
+
+    loaded = BasicModel.load(tmp_path_str)
+    assert loaded.params.get("a") == 10
+    assert np.array_equal(loaded.weights, model.weights)
+    assert is_mapped(loaded.weights)
+
+    # Changes are not written to the file
+    loaded.weights[0] = -1
+    assert BasicModel.load(tmp_path_str).weights[0] == 0
+
+    model.memory_map = False
+    model.save(tmp_path_str)
+    loaded = BasicModel.load(tmp_path_str)
+    assert np.array_equal(loaded.weights, model.weights)
+    assert not is_mapped(loaded.weights)
+    assert not os.path.exists(os.path.join(tmp_path_str, "model.pkl.buffers"))
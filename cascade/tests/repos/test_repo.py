@@ -23,6 +23,7 @@ import pytest
 
 MODULE_PATH = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
 sys.path.append(os.path.dirname(MODULE_PATH))
+from cascade.base import MetaHandler, ReadOnlyError
 from cascade.lines import ModelLine
 from cascade.repos import Repo
 from cascade.tests.conftest import DummyModel
@@ -427,3 +428,87 @@ def test_load_model_meta(tmp_path_str, dummy_model, ext):
     assert "metrics" in meta[0]
     assert meta[0]["metrics"][0]["name"] == "acc"
     assert slug == meta[0]["slug"]
+
+
+def test_line_cache(tmp_path_str, dummy_model):
+    repo = Repo(tmp_path_str)
+    repo.add_line("line", model_cls=DummyModel)
+
+    line = repo["line"]
+    assert repo["line"] is line
+    assert repo[0] is line
+
+    line.save(dummy_model)
+
+    # Saving changes the folder, so the line is reopened
+    new_line = repo["line"]
+    assert new_line is not line
+    assert len(new_line) == 1
+    assert repo["line"] is new_line
+
+
+def test_open_does_not_write(tmp_path_str):
+    repo = Repo(tmp_path_str)
+    repo.add_line("line")
+
+    meta_paths = [
+        os.path.join(tmp_path_str, "meta.json"),
+        os.path.join(tmp_path_str, "line", "meta.json"),
+    ]
+    mtimes = [os.stat(path).st_mtime_ns for path in meta_paths]
+
+    repo = Repo(tmp_path_str)
+    repo["line"]
+    ModelLine(os.path.join(tmp_path_str, "line"))
+
+    assert [os.stat(path).st_mtime_ns for path in meta_paths] == mtimes
+
+
+def test_open_syncs_stale_meta(tmp_path_str):
+    line = ModelLine(os.path.join(tmp_path_str, "line"))
+    meta = line.load_meta()
+    meta[0]["len"] = 10
+    MetaHandler.write_dir(line.get_root(), meta)
+
+    line = ModelLine(os.path.join(tmp_path_str, "line"))
+    assert line.load_meta()[0]["len"] == 0
+
+
+def test_readonly(tmp_path_str, dummy_model):
+    repo = Repo(tmp_path_str)
+    line = repo.add_line("line", model_cls=DummyModel)
+    line.save(dummy_model)
+
+    def snapshot():
+        # Walk includes hidden files like the manifest
+        return sorted(
+            (os.path.join(root, name), os.stat(os.path.join(root, name)).st_mtime_ns)
+            for root, dirs, files in os.walk(tmp_path_str)
+            for name in dirs + files
+        )
+
+    before = snapshot()
+
+    repo = Repo(tmp_path_str, readonly=True)
+    line = repo["line"]
+    assert line.is_readonly()
+    assert len(line) == 1
+    assert repo.load_obj_meta(line.load_obj_meta(0)[0]["slug"])[0]["type"] == "model"
+
+    with pytest.raises(ReadOnlyError):
+        repo.add_line("other")
+    with pytest.raises(ReadOnlyError):
+        line.save(dummy_model)
+    with pytest.raises(ReadOnlyError):
+        line.comment("hi")
+
+    assert snapshot() == before
+
+
+def test_readonly_does_not_create(tmp_path_str):
+    with pytest.raises(FileNotFoundError):
+        Repo(os.path.join(tmp_path_str, "repo"), readonly=True)
+    with pytest.raises(FileNotFoundError):
+        ModelLine(os.path.join(tmp_path_str, "line"), readonly=True)
+
+    assert os.listdir(tmp_path_str) == []
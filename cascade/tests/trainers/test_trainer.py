@@ -86,3 +86,24 @@ def test_error_handling(tmp_path_str):
     assert len(repo) == 1
     assert len(repo["00000"]) == 1
     assert len(t.metrics) == 0
+
+
+def test_loader(tmp_path_str):
+    class BatchModel(DummyModel):
+        def fit(self, data, *args, **kwargs):
+            self.batches = [batch.tolist() for batch in data]
+
+    repo = Repo(tmp_path_str)
+    t = BasicTrainer(repo)
+    model = BatchModel()
+
+    t.train(model, Wrapper([0, 1, 2, 3, 4]), loader={"batch_size": 2, "workers": 2})
+    assert model.batches == [[0, 1], [2, 3], [4]]
+
+    line_meta = MetaHandler.read_dir(repo["00000"].get_root())
+    loader_meta = [
+        link["meta"] for link in line_meta[0]["links"] if "batch_size" in link["meta"][0]
+    ]
+    assert len(loader_meta) == 1
+    assert loader_meta[0][0]["batch_size"] == 2
+    assert loader_meta[0][1]["len"] == 5
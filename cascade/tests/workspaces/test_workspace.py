@@ -87,3 +87,15 @@ def test_repo_names(tmp_path_str):
 
     wp = Workspace(tmp_path_str)
     assert wp.get_repo_names() == ["0", "1", "2"]
+
+
+def test_repo_cache(tmp_path_str):
+    wp = Workspace(tmp_path_str)
+    wp.add_repo("repo")
+
+    repo = wp["repo"]
+    assert wp["repo"] is repo
+
+    repo.add_line("line")
+    assert wp["repo"] is not repo
+    assert len(wp["repo"]) == 1
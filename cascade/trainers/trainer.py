@@ -20,7 +20,7 @@ from typing import Any, Dict, Iterable, Optional, Tuple, Union
 import pendulum
 
 from ..base import Meta, Traceable, raise_not_implemented
-from ..data import Dataset
+from ..data import DataLoader, Dataset
 from ..lines.model_line import ModelLine
 from ..models.model import Model
 from ..repos.repo import Repo
@@ -101,6 +101,7 @@ class BasicTrainer(Trainer):
         eval_strategy: Optional[int] = None,
         save_strategy: Optional[int] = None,
         save_meta_callback: bool = True,
+        loader: Optional[Dict[str, Any]] = None,
     ) -> None:
         """
         Trains, evaluates and saves given model. If specified, loads model from checkpoint.
@@ -130,6 +131,10 @@ class BasicTrainer(Trainer):
             save_meta_callback: bool, optional
                 By default True - adds line.save(model, only_meta=True) as a callback
                 when model.log() is called
+            loader: Dict, optional
+                If given, ``train_data`` is passed to fit() as ``DataLoader(train_data, **loader)``
+                for example ``{"batch_size": 32, "shuffle": True, "workers": 4}``.
+                The loader is linked to the line instead of the data and keeps its meta
         """
 
         if train_kwargs is None:
@@ -140,6 +145,11 @@ class BasicTrainer(Trainer):
         if eval_strategy is not None and test_data is None:
             raise ValueError("Eval strategy is specified, but no test data provided")
 
+        if loader is not None:
+            if train_data is None:
+                raise ValueError("Loader is specified, but no train data provided")
+            train_data = DataLoader(train_data, **loader)
+
         if start_from is not None:
             line_name = start_from
         else:
@@ -162,13 +172,14 @@ class BasicTrainer(Trainer):
                 "save_strategy": save_strategy,
             }
         )
-        line.link(self)
+        with line.batch_meta():
+            line.link(self)
 
-        if isinstance(train_data, Traceable):
-            line.link(train_data)
+            if isinstance(train_data, Traceable):
+                line.link(train_data)
 
-        if isinstance(test_data, Traceable):
-            line.link(test_data)
+            if isinstance(test_data, Traceable):
+                line.link(test_data)
 
         if start_from is not None:
             if len(line) == 0:
@@ -21,6 +21,8 @@ from typing import Any, List, Optional
 from sklearn.pipeline import Pipeline
 
 from ...base import Meta
+from ...base.serialization import (BUFFERS_SUFFIX, dump_with_buffers,
+                                   load_with_buffers)
 from ...models import BasicModel
 
 
@@ -80,15 +82,16 @@ class SkModel(BasicModel):
 
         pipeline = self._pipeline
         del self._pipeline
-        with open(model_path, "wb") as f:
-            pickle.dump(self, f)
+        self._dump(self, model_path)
         self._pipeline = pipeline
 
     def save_artifact(self, path: str, *args: Any, **kwargs: Any) -> None:
         """
         Saves sklearn pipeline
 
-        Args and kwargs are passed into pickle.dump
+        Args and kwargs are passed into pickle.dump. If ``memory_map``
+        is True, arrays of the pipeline are saved out-of-band
+        and args and kwargs are ignored
 
         Parameters
         ----------
@@ -99,14 +102,22 @@ class SkModel(BasicModel):
             raise ValueError(f"Error when saving an artifact - {path} is not a folder")
 
         pipeline_path = os.path.join(path, "pipeline.pkl")
+        if self.memory_map:
+            dump_with_buffers(self._pipeline, pipeline_path)
+            return
+
         with open(pipeline_path, "wb") as f:
             pickle.dump(self._pipeline, f, *args, **kwargs)
+        if os.path.exists(pipeline_path + BUFFERS_SUFFIX):
+            os.remove(pipeline_path + BUFFERS_SUFFIX)
 
     def load_artifact(self, path: str, *args: Any, **kwargs: Any) -> None:
         """
         Loads sklearn pipeline
 
-        Args and kwargs are passed into pickle.load
+        Args and kwargs are passed into pickle.load. If the pipeline
+        was saved with ``memory_map=True``, its arrays are mapped into
+        memory and args and kwargs are ignored
 
         Parameters
         ----------
@@ -122,6 +133,10 @@ class SkModel(BasicModel):
             raise ValueError(f"Error when loading an artifact - {path} is not a folder")
 
         pipeline_path = os.path.join(path, "pipeline.pkl")
+        if os.path.exists(pipeline_path + BUFFERS_SUFFIX):
+            self._pipeline = load_with_buffers(pipeline_path)
+            return
+
         with open(pipeline_path, "rb") as f:
             self._pipeline = pickle.load(f, *args, **kwargs)
 
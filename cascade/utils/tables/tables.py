@@ -14,7 +14,7 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-from typing import Any, Callable, List, Tuple, Union
+from typing import Any, Callable, List, Sequence, Tuple, Union
 
 import pandas as pd
 from tqdm import tqdm
@@ -58,6 +58,12 @@ class TableDataset(Dataset[T]):
         """
         return self._table.iloc[index]
 
+    def get_batch(self, indices: Sequence[int]) -> pd.DataFrame:
+        """
+        Returns rows with given indices as a table
+        """
+        return self._table.iloc[indices]
+
     def __repr__(self) -> str:
         return f"{super().__repr__()}\n {repr(self._table)}"
 
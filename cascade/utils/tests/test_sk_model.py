@@ -82,3 +82,16 @@ def test_model_artifacts(tmp_path_str):
     model = SkModel()
     model.load_artifact(tmp_path_str)
     assert model._pipeline[0].n_estimators == 2
+
+
+def test_model_artifacts_memory_map(tmp_path_str):
+    model = SkModel(blocks=[RandomForestClassifier(n_estimators=2)])
+    model.memory_map = True
+    model.fit([[0, 1], [1, 0]], [0, 1])
+    model.save_artifact(tmp_path_str)
+
+    assert os.path.exists(os.path.join(tmp_path_str, "pipeline.pkl.buffers"))
+
+    loaded = SkModel()
+    loaded.load_artifact(tmp_path_str)
+    assert list(loaded.predict([[0, 1], [1, 0]])) == list(model.predict([[0, 1], [1, 0]]))
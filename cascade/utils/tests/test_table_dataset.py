@@ -37,3 +37,11 @@ def test_create(tmp_path):
 
     with pytest.raises(TypeError):
         ds = TableDataset(t="Hello")
+
+
+def test_get_batch():
+    ds = TableDataset(t=pd.DataFrame({"a": [0, 1, 2, 3], "b": ["x", "y", "z", "w"]}))
+    batch = ds.get_batch([3, 0])
+    assert isinstance(batch, pd.DataFrame)
+    assert batch["a"].tolist() == [3, 0]
+    assert batch["b"].tolist() == ["w", "x"]
@@ -50,3 +50,14 @@ def test_model_artifacts(tmp_path_str):
     model.load_artifact(tmp_path_str)
 
     assert str(model._model) == str(torch.nn.Linear(10, 2))
+
+
+def test_model_artifacts_memory_map(tmp_path_str):
+    model = TorchModel(torch.nn.Linear, in_features=10, out_features=2)
+    model.save_artifact(tmp_path_str)
+
+    loaded = TorchModel()
+    loaded.memory_map = True
+    loaded.load_artifact(tmp_path_str)
+
+    assert torch.equal(loaded._model.weight, model._model.weight)
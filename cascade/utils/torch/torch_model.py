@@ -14,8 +14,9 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import inspect
 import os
-import pickle
+import warnings
 from typing import Any, Optional, Type
 
 import torch
@@ -82,8 +83,7 @@ class TorchModel(BasicModel):
         # Save without torch artifact
         model = self._model
         del self._model
-        with open(model_path, "wb") as f:
-            pickle.dump(self, f)
+        self._dump(self, model_path)
         self._model = model
 
     def save_artifact(self, path: str, *args: Any, **kwargs: Any) -> None:
@@ -117,6 +117,10 @@ class TorchModel(BasicModel):
         Here it is set to False by default. Safe load could be implemented later.
         You can override this method to gain control over artifact loading process.
 
+        If ``memory_map`` is True, the checkpoint is loaded with ``mmap=True``
+        so tensors are read lazily and shared between processes. This requires
+        torch>=2.1.0, on older versions the checkpoint is read as usual.
+
         Parameters
         ----------
         path : str
@@ -131,6 +135,18 @@ class TorchModel(BasicModel):
             raise ValueError(f"Error when loading an artifact - {path} is not a folder")
 
         checkpoint_path = os.path.join(path, "checkpoint.pt")
+        if self.memory_map:
+            if "mmap" in inspect.signature(torch.load).parameters:
+                # mmap needs the path and not the file object
+                self._model = torch.load(
+                    checkpoint_path, *args, weights_only=False, mmap=True, **kwargs
+                )
+                return
+            warnings.warn(
+                f"torch {torch.__version__} does not support mmap in torch.load,"
+                " the checkpoint is read into memory"
+            )
+
         with open(checkpoint_path, "rb") as f:
             # TODO: need option to use safe version
             self._model = torch.load(f, *args, weights_only=False, **kwargs)
@@ -15,12 +15,14 @@ limitations under the License.
 """
 
 import os
+import sqlite3
 import warnings
-from typing import Any, Iterator, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from typing_extensions import Literal
 
-from ..base import Meta, MetaHandler, MetaIOError, TraceableOnDisk
+from ..base import Meta, MetaHandler, MetaIOError, SlugIndex, TraceableOnDisk
+from ..base.utils import dir_state
 from ..data import T
 from ..repos.repo import Repo
 
@@ -29,7 +31,7 @@ class Workspace(TraceableOnDisk):
     def __init__(
         self,
         path: str,
-        meta_fmt: Literal[".json", ".yml", ".yaml"] = ".json",
+        meta_fmt: Literal[".json", ".yml", ".yaml", ".msgpack"] = ".json",
         default_repo: Optional[str] = None,
         *args: Any,
         **kwargs: Any,
@@ -37,6 +39,8 @@ class Workspace(TraceableOnDisk):
         super().__init__(path, meta_fmt, *args, **kwargs)
         self._default = default_repo
 
+        if self._readonly and not os.path.isdir(self._root):
+            raise FileNotFoundError(f"Workspace {self._root} does not exist")
         os.makedirs(self._root, exist_ok=True)
 
         abs_root = os.path.abspath(self._root)
@@ -47,6 +51,9 @@ class Workspace(TraceableOnDisk):
                 if os.path.isdir(os.path.join(abs_root, name))
             ]
         )
+        # Repos that were already opened with the state
+        # of their folders at the time of opening
+        self._repo_cache: Dict[str, Tuple[Any, Repo]] = {}
         self._repo_names = []
         for d in dirs:
             try:
@@ -56,14 +63,22 @@ class Workspace(TraceableOnDisk):
             except MetaIOError as e:
                 warnings.warn(str(e))
 
-        self.sync_meta()
+        self._sync_meta_on_open({"root": self._root, "len": len(self), "type": "workspace"})
 
     def __getitem__(self, key: str) -> Repo:
-        if key in self._repo_names:
-            return Repo(os.path.join(self._root, key))
-        else:
+        if key not in self._repo_names:
             raise KeyError(f"{key} repo does not exist in workspace {self._root}")
 
+        path = os.path.join(self._root, key)
+        state = dir_state(path)
+        cached = self._repo_cache.get(key)
+        if state is not None and cached is not None and cached[0] == state:
+            return cached[1]
+
+        repo = Repo(path, readonly=self._readonly)
+        self._repo_cache[key] = (state, repo)
+        return repo
+
     def __len__(self) -> int:
         return len(self._repo_names)
 
@@ -120,10 +135,16 @@ class Workspace(TraceableOnDisk):
         FileNotFoundError
             Raises if failed to find the model with slug specified
         """
+        try:
+            path = SlugIndex.find(self._root, model, create=not self._readonly)
+        except (sqlite3.Error, OSError):
+            path = None
+        if path is not None:
+            return MetaHandler.read_dir(path)
 
         for repo_name in self._repo_names:
             try:
-                repo = Repo(os.path.join(self._root, repo_name))
+                repo = self[repo_name]
                 meta = repo.load_obj_meta(model)
             except FileNotFoundError:
                 continue
@@ -133,6 +154,38 @@ class Workspace(TraceableOnDisk):
             f"Failed to find the model {model} in the workspace at {self._root}"
         )
 
+    def export(
+        self,
+        path: str,
+        fmt: Literal["parquet", "arrow"] = "parquet",
+        append: bool = False,
+        batch_size: int = 1000,
+    ) -> int:
+        """
+        Exports meta of all objects in the workspace into a columnar format.
+        See ``cascade.meta.MetaExporter`` for details.
+
+        Parameters
+        ----------
+        path : str
+            Directory where to write the files
+        fmt : Literal["parquet", "arrow"], optional
+            Format of the files, by default "parquet"
+        append : bool, optional
+            If True, exports only the objects that were not exported
+            into this directory before, by default False
+        batch_size : int, optional
+            The number of objects in one file, by default 1000
+
+        Returns
+        -------
+        int
+            The number of exported objects
+        """
+        from ..meta import MetaExporter
+
+        return MetaExporter(self, batch_size=batch_size).export(path, fmt=fmt, append=append)
+
     def add_repo(self, name: str, *args: Any, **kwargs: Any) -> Repo:
         """
         Creates and adds repo to the Workspace
@@ -151,8 +204,12 @@ class Workspace(TraceableOnDisk):
         ------
         ValueError
             If the repo already exists
+        ReadOnlyError
+            If the workspace was opened with ``readonly=True``
         """
+        self._check_writable()
         repo = Repo(os.path.join(self._root, name), *args, **kwargs)
+        self._repo_cache.pop(name, None)
         if name not in self._repo_names:
             self._repo_names.append(name)
 
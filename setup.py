@@ -7,12 +7,16 @@ sys.path.append(os.path.dirname(__file__))
 from cascade.version import __author__, __author_email__, __version__
 
 _extras_require = {
+    "arrow": ["pyarrow"],
+    "msgpack": ["msgpack"],
     "opencv": ["opencv-python"],
+    "orjson": ["orjson"],
     "pandera": ["pandera[io]>=0.6.5,<1"],
     "pil": ["Pillow>=8.4.0,<11"],
     "pydantic": ["pydantic>=1.9.2,<3"],
     "sklearn": ["scikit-learn>=0.24.2,<2"],
     "torch": ["torch>=1.10.2,<3"],
+    "ujson": ["ujson"],
     "view": ["dash<3", "plotly>=5.7.0", "dash-renderjson==0.0.1"],
 }
 